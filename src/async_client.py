@@ -0,0 +1,534 @@
+import asyncio
+import struct
+import time
+from collections import deque
+from functools import partial
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+from src.connection.async_pool import AsyncConnectionPool
+from src.connection.auto_pipeline import AutoPipelineConnection
+from src.connection.deadline import current_deadline, timeout_for
+from src.connection.hedging import HedgePolicy
+from src.connection.nodes import Node, parse_node
+from src.connection.options import ConnectionOptions
+from src.connection.replica_router import ReplicaRouter, reads_on_primary
+from src.connection.retry import DEFAULT_RETRY, CircuitBreaker, RetryPolicy, is_retryable
+from src.connection.single_flight import AsyncSingleFlight, flight_key
+from src.cache.near_cache import CacheHooks
+from src.protocol.packet import RequestPacket, ResponsePacket
+from src.protocol.stream import aiter_stream
+from src.protocol.types import Status
+from src.operations.async_primitives import AsyncPrimitiveOperations
+from src.operations.async_maps import AsyncMapOperations
+from src.operations.async_arrays import AsyncArrayOperations
+from src.operations.batch import DEFAULT_WINDOW, NOT_FOUND, resolve_not_found
+from src.exceptions.errors import ValkyrieError, ValkyrieConnectionError, ValkyrieTimeoutError, error_for_status
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+    # Losing hedges may fail after nobody is waiting; don't report them as unhandled.
+    if not task.cancelled():
+        task.exception()
+
+
+class AsyncValkyrieClient:
+
+    def __init__(self, host: str = 'localhost', port: int = 8080, password: str = '',
+                 pool_size: int = 1, min_pool_size: Optional[int] = None,
+                 pool_timeout: Optional[float] = None,
+                 auto_pipeline: bool = False,
+                 near_cache: Optional[CacheHooks] = None,
+                 coalesce_reads: bool = False,
+                 replicas: Sequence[Node] = (),
+                 hedging: Optional[HedgePolicy] = None,
+                 options: Optional[ConnectionOptions] = None,
+                 retry: Optional[RetryPolicy] = DEFAULT_RETRY,
+                 breaker_threshold: Optional[int] = 5,
+                 breaker_timeout: float = 5.0):
+        if hedging is not None and not replicas and pool_size < 2:
+            # The hedge would queue for the connection the slow read is holding.
+            raise ValueError("hedging needs pool_size of at least 2 or replicas")
+        self.host = host
+        self.port = port
+        self.password = password
+        self.pool_size = pool_size
+        self.min_pool_size = pool_size if min_pool_size is None else min_pool_size
+        self.pool_timeout = pool_timeout
+        self.auto_pipeline = auto_pipeline
+        self.near_cache = near_cache
+        self.coalesce_reads = coalesce_reads
+        self._single_flight = AsyncSingleFlight() if coalesce_reads else None
+        self.replicas = [parse_node(replica) for replica in replicas]
+        self.hedging = hedging
+        self.options = options or ConnectionOptions()
+        self.retry = retry
+        self.breaker_threshold = breaker_threshold
+        self.breaker_timeout = breaker_timeout
+
+        self.pool: Optional[AsyncConnectionPool] = None
+        self.replica_pools: List[AsyncConnectionPool] = []
+        self.replica_router: Optional[ReplicaRouter] = None
+        self._auto_pipeline: Optional[AutoPipelineConnection] = None
+        self._auto_pipeline_lock: Optional[asyncio.Lock] = None
+
+        self.primitives: Optional[AsyncPrimitiveOperations] = None
+        self.maps: Optional[AsyncMapOperations] = None
+        self.arrays: Optional[AsyncArrayOperations] = None
+
+    async def connect(self) -> None:
+        try:
+            self.pool = AsyncConnectionPool(
+                self.host, self.port, self.password,
+                min_size=self.min_pool_size,
+                max_size=self.pool_size,
+                timeout=self.pool_timeout,
+                options=self.options,
+                breaker=self._new_breaker()
+            )
+            await self.pool.open()
+            if self.replicas:
+                await self._open_replicas()
+            self._auto_pipeline_lock = asyncio.Lock()
+
+            self.primitives = AsyncPrimitiveOperations(self._send_request, self._stream_requests)
+            self.maps = AsyncMapOperations(self._send_request, self._stream_request, self._stream_requests)
+            self.arrays = AsyncArrayOperations(self._send_request, self._stream_request, self._stream_requests)
+
+        except Exception as e:
+            await self.disconnect()
+            raise ValkyrieConnectionError(f"Failed to connect: {e}")
+
+    def _new_breaker(self) -> Optional[CircuitBreaker]:
+        if self.breaker_threshold is None:
+            return None
+        return CircuitBreaker(self.breaker_threshold, self.breaker_timeout)
+
+    async def _open_replicas(self) -> None:
+        self.replica_router = ReplicaRouter(len(self.replicas))
+        self.replica_pools = [
+            AsyncConnectionPool(host, port, self.password, min_size=self.min_pool_size,
+                                max_size=self.pool_size, timeout=self.pool_timeout, options=self.options,
+                                breaker=self._new_breaker())
+            for host, port in self.replicas
+        ]
+        results = await asyncio.gather(*(pool.open() for pool in self.replica_pools), return_exceptions=True)
+        for index, result in enumerate(results):
+            if isinstance(result, Exception):
+                # Reads fall back to the others; the pool connects lazily once the replica is retried.
+                self.replica_router.demote(index)
+
+    async def disconnect(self) -> None:
+        replica_pools = self.replica_pools
+        self.replica_pools = []
+        self.replica_router = None
+        for pool in replica_pools:
+            await pool.close()
+        if self.pool:
+            pool = self.pool
+            self.pool = None
+            self.primitives = None
+            self.maps = None
+            self.arrays = None
+            if self._auto_pipeline is not None:
+                auto_pipeline = self._auto_pipeline
+                self._auto_pipeline = None
+                await auto_pipeline.close()
+                await pool.release(auto_pipeline.connection, discard=True)
+            await pool.close()
+
+    async def _send_request(self, packet: RequestPacket) -> ResponsePacket:
+        cache = self.near_cache
+        if cache is not None:
+            cached = cache.lookup(packet)
+            if cached is not None:
+                return cached
+
+        deadline = current_deadline(self.options.request_timeout)
+        if deadline is None:
+            return await self._send_request_coalesced(packet)
+        # Cancelling on expiry discards the connection, or for auto-pipelined
+        # and coalesced requests just stops waiting for the shared response.
+        try:
+            return await asyncio.wait_for(self._send_request_coalesced(packet), timeout_for(deadline))
+        except asyncio.TimeoutError:
+            raise ValkyrieTimeoutError("Deadline exceeded")
+
+    async def _send_request_coalesced(self, packet: RequestPacket) -> ResponsePacket:
+        # A pinned read must not share a flight that may be answered by a replica.
+        if self._single_flight is not None and not reads_on_primary():
+            key = flight_key(packet)
+            if key is not None:
+                return await self._single_flight.do(key, lambda: self._send_request_tracked(packet))
+        return await self._send_request_tracked(packet)
+
+    async def _send_request_tracked(self, packet: RequestPacket) -> ResponsePacket:
+        cache = self.near_cache
+        if cache is None:
+            return await self._send_request_uncached(packet)
+
+        token = cache.track(packet)
+        try:
+            response = await self._send_request_uncached(packet)
+        except Exception as e:
+            cache.complete(token, e)
+            raise
+        cache.complete(token, response)
+        return response
+
+    async def _send_request_uncached(self, packet: RequestPacket) -> ResponsePacket:
+        attempt = 0
+        while True:
+            try:
+                return await self._dispatch(packet)
+            except ValkyrieConnectionError as e:
+                if not await self._recover(e, packet.is_idempotent, attempt):
+                    raise
+            attempt += 1
+
+    async def _recover(self, error: ValkyrieConnectionError, replayable: bool, attempt: int,
+                       deadline: Optional[float] = None) -> bool:
+        """Asyncio counterpart of ``ValkyrieClient._recover``.
+
+        Single requests are bounded by cancellation rather than ``deadline``.
+        """
+        if not is_retryable(error) or not self.pool or self.pool.closed:
+            return False
+        await self.pool.purge()
+
+        retry = self.retry
+        if retry is None or not replayable or attempt >= retry.retries:
+            return False
+        delay = retry.backoff(attempt)
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            return False
+        if delay:
+            await asyncio.sleep(delay)
+        return True
+
+    async def _dispatch(self, packet: RequestPacket) -> ResponsePacket:
+        if not self.pool or self.pool.closed:
+            raise ValkyrieConnectionError("Not connected to server")
+
+        if packet.is_read_only:
+            if self.hedging is not None:
+                return await self._send_hedged(packet)
+            if self.replica_router is not None:
+                return await self._read(packet, self._choose_replica())
+        return await self._exchange(self.pool, packet, self.auto_pipeline)
+
+    def _choose_replica(self, exclude: Optional[int] = None) -> Optional[int]:
+        router = self.replica_router
+        if router is None or reads_on_primary():
+            return None
+        return router.choose(exclude)
+
+    async def _read(self, packet: RequestPacket, index: Optional[int], hedge: bool = False) -> ResponsePacket:
+        """Read from replica ``index``, or from the primary if it is None or unreachable."""
+        router = self.replica_router
+        if index is not None and router is not None:
+            start = time.perf_counter()
+            try:
+                # Replica reads use their own pools; auto-pipelining only covers the primary.
+                response = await self._exchange(self.replica_pools[index], packet)
+            except asyncio.CancelledError:
+                # A hedge or deadline gave up on it; the time so far is a lower
+                # bound on its latency and keeps a slow replica from scoring as new.
+                router.record(index, time.perf_counter() - start)
+                raise
+            except ValkyrieConnectionError:
+                # The read is safe to repeat, so the primary answers it instead.
+                router.failed(index)
+            except ValkyrieError:
+                router.record(index, time.perf_counter() - start)
+                raise
+            else:
+                router.record(index, time.perf_counter() - start)
+                return response
+
+        # A hedge queued behind the slow request on the shared connection could never win.
+        return await self._exchange(self.pool, packet, self.auto_pipeline and not hedge)
+
+    async def _send_hedged(self, packet: RequestPacket) -> ResponsePacket:
+        """Read ``packet``, sending a second copy elsewhere if the first is slow.
+
+        The first answer wins and the other copy is cancelled, which discards
+        its connection.
+        """
+        hedging = self.hedging
+        delay = hedging.next_delay()
+        index = self._choose_replica()
+        start = time.perf_counter()
+
+        def timed(task: asyncio.Task) -> None:
+            if not task.cancelled() and task.exception() is None:
+                hedging.record(time.perf_counter() - start)
+
+        first = asyncio.ensure_future(self._read(packet, index))
+        first.add_done_callback(timed)
+        tasks = [first]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return await first
+            second_index = self._choose_replica(exclude=index)
+            if not self._can_hedge(second_index) or not hedging.try_hedge():
+                if second_index is not None:
+                    self.replica_router.release(second_index)
+                return await first
+
+            second = asyncio.ensure_future(self._read(packet, second_index, hedge=True))
+            second.add_done_callback(_consume_exception)
+            tasks.append(second)
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            winner = first if first in done else second
+            if isinstance(winner.exception(), ValkyrieConnectionError):
+                # An unreachable node is not an answer; wait for the other copy.
+                winner = second if winner is first else first
+                await asyncio.wait([winner])
+            if winner is second:
+                hedging.hedge_won()
+            return winner.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def _can_hedge(self, index: Optional[int]) -> bool:
+        # A hedge that has to wait for a connection starts too late to win.
+        pool = self.pool if index is None else self.replica_pools[index]
+        return pool.has_capacity
+
+    async def _exchange(self, pool: AsyncConnectionPool, packet: RequestPacket,
+                        pipelined: bool = False) -> ResponsePacket:
+        try:
+            request_buffers = packet.to_buffers()
+            if pipelined:
+                auto_pipeline = await self._get_auto_pipeline()
+                response_bytes = await auto_pipeline.request(request_buffers)
+            else:
+                async with pool.connection() as connection:
+                    await connection.send_buffers(request_buffers)
+                    response_bytes = await connection.receive_response()
+            response = ResponsePacket.from_bytes(response_bytes, packet.response_schema)
+
+            if response.status != Status.OK:
+                raise error_for_status(response.status)
+
+            return response
+
+        except ValkyrieError:
+            raise
+        except Exception as e:
+            raise ValkyrieConnectionError(f"Communication error: {e}")
+
+    async def _stream_request(self, packet: RequestPacket) -> AsyncIterator[Any]:
+        # Streams need the connection to themselves, so they bypass auto-pipelining.
+        if not self.pool or self.pool.closed:
+            raise ValkyrieConnectionError("Not connected to server")
+
+        deadline = current_deadline(self.options.request_timeout)
+        try:
+            async with self.pool.connection(timeout_for(deadline, self.pool.timeout)) as connection:
+                receive = connection.receive if deadline is None else partial(connection.receive, deadline=deadline)
+                await connection.send_buffers(packet.to_buffers(), deadline)
+                length = struct.unpack('<I', await receive(4))[0]
+                if length < 1:
+                    raise ValueError("Response too short")
+
+                status = Status((await receive(1))[0])
+                if status != Status.OK:
+                    await receive(length - 1)
+                    raise error_for_status(status)
+
+                if length > 1:
+                    async for element in aiter_stream(receive, length - 1):
+                        yield element
+
+        except ValkyrieError:
+            raise
+        except Exception as e:
+            raise ValkyrieConnectionError(f"Communication error: {e}")
+
+    def _stream_requests(self, packets: Iterable[RequestPacket],
+                         window: int) -> AsyncIterator[Union[ResponsePacket, ValkyrieError]]:
+        cache = self.near_cache
+        if cache is None:
+            return self._stream_requests_uncached(packets, window)
+        return self._stream_requests_cached(cache, packets, window)
+
+    async def _stream_requests_cached(self, cache: CacheHooks, packets: Iterable[RequestPacket],
+                                      window: int) -> AsyncIterator[Union[ResponsePacket, ValkyrieError]]:
+        tokens = deque()
+
+        def tracked():
+            for packet in packets:
+                tokens.append(cache.track(packet))
+                yield packet
+
+        results = self._stream_requests_uncached(tracked(), window)
+        try:
+            async for result in results:
+                cache.complete(tokens.popleft(), result)
+                yield result
+        finally:
+            await results.aclose()
+            for token in tokens:
+                cache.complete(token, None)
+
+    async def _stream_requests_uncached(self, packets: Iterable[RequestPacket],
+                                        window: int) -> AsyncIterator[Union[ResponsePacket, ValkyrieError]]:
+        # Asyncio counterpart of ValkyrieClient._stream_requests.
+        if not self.pool or self.pool.closed:
+            raise ValkyrieConnectionError("Not connected to server")
+        if window < 1:
+            raise ValueError("window must be at least 1")
+
+        packets = iter(packets)
+        in_flight: Deque[RequestPacket] = deque()
+        exhausted = False
+        error: Optional[Exception] = None
+        deadline = current_deadline(self.options.request_timeout)
+        attempt = 0
+
+        while True:
+            try:
+                async with self.pool.connection(timeout_for(deadline, self.pool.timeout)) as connection:
+                    if in_flight:
+                        # Replay what the broken connection left unanswered.
+                        await connection.send_buffers(
+                            [buffer for packet in in_flight for buffer in packet.to_buffers()], deadline
+                        )
+                    while True:
+                        batch = []
+                        while not exhausted and len(in_flight) + len(batch) < window:
+                            try:
+                                packet = next(packets, None)
+                            except Exception as e:
+                                # A value that cannot be encoded is the caller's error, not the
+                                # connection's: send none of this batch, answer what is already
+                                # in flight so the connection stays in sync, then raise it.
+                                error = e
+                                exhausted = True
+                                batch = []
+                                break
+                            if packet is None:
+                                exhausted = True
+                            else:
+                                batch.append(packet)
+                        if batch:
+                            # Queued first, so a failed send is replayed too.
+                            in_flight.extend(batch)
+                            await connection.send_buffers(
+                                [buffer for packet in batch for buffer in packet.to_buffers()], deadline
+                            )
+                        if not in_flight:
+                            break
+
+                        packet = in_flight[0]
+                        response = ResponsePacket.from_bytes(await connection.receive_response(deadline),
+                                                             packet.response_schema)
+                        in_flight.popleft()
+                        if response.status != Status.OK:
+                            yield error_for_status(response.status)
+                        else:
+                            yield response
+                break
+
+            except ValkyrieConnectionError as e:
+                if not await self._recover(e, all(packet.is_idempotent for packet in in_flight), attempt, deadline):
+                    raise
+            except ValkyrieError:
+                raise
+            except Exception as e:
+                raise ValkyrieConnectionError(f"Communication error: {e}")
+            attempt += 1
+
+        if error is not None:
+            raise error
+
+    async def _get_auto_pipeline(self) -> AutoPipelineConnection:
+        if self._auto_pipeline is not None and not self._auto_pipeline.closed:
+            return self._auto_pipeline
+
+        async with self._auto_pipeline_lock:
+            if self._auto_pipeline is not None and not self._auto_pipeline.closed:
+                return self._auto_pipeline
+
+            if self._auto_pipeline is not None:
+                broken = self._auto_pipeline
+                self._auto_pipeline = None
+                await broken.close()
+                await self.pool.release(broken.connection, discard=True)
+
+            auto_pipeline = AutoPipelineConnection(await self.pool.acquire())
+            auto_pipeline.start()
+            self._auto_pipeline = auto_pipeline
+            return auto_pipeline
+
+    @property
+    def is_connected(self) -> bool:
+        return (self.pool is not None and
+                not self.pool.closed and
+                self.primitives is not None)
+
+    async def get(self, key: str):
+        if not self.primitives:
+            raise ValkyrieConnectionError("Not connected")
+        return await self.primitives.get(key)
+
+    async def set(self, key: str, value):
+        if not self.primitives:
+            raise ValkyrieConnectionError("Not connected")
+        return await self.primitives.set(key, value)
+
+    async def remove(self, key: str):
+        if not self.primitives:
+            raise ValkyrieConnectionError("Not connected")
+        return await self.primitives.remove(key)
+
+    async def length(self, key: str):
+        if not self.primitives:
+            raise ValkyrieConnectionError("Not connected")
+        return await self.primitives.length(key)
+
+    async def append(self, key: str, value: str):
+        if not self.primitives:
+            raise ValkyrieConnectionError("Not connected")
+        return await self.primitives.append(key, value)
+
+    async def increment(self, key: str):
+        if not self.primitives:
+            raise ValkyrieConnectionError("Not connected")
+        return await self.primitives.increment(key)
+
+    async def decrement(self, key: str):
+        if not self.primitives:
+            raise ValkyrieConnectionError("Not connected")
+        return await self.primitives.decrement(key)
+
+    async def mget(self, keys: Iterable[str], window: int = DEFAULT_WINDOW) -> Dict[str, Any]:
+        """Get many keys in one pipelined batch, keyed by input.
+
+        Missing keys map to ``NOT_FOUND``; any other error is raised once the
+        batch is complete. At most ``window`` requests are in flight at a time.
+        """
+        if not self.primitives:
+            raise ValkyrieConnectionError("Not connected")
+        return resolve_not_found(await self.primitives.get_many(keys, window=window))
+
+    async def mset(self, mapping: Mapping[str, Any], window: int = DEFAULT_WINDOW) -> None:
+        if not self.primitives:
+            raise ValkyrieConnectionError("Not connected")
+        await self.primitives.set_many(mapping, raise_on_error=True, window=window)
+
+    async def mremove(self, keys: Iterable[str], window: int = DEFAULT_WINDOW) -> Dict[str, Any]:
+        """Remove many keys; each maps to ``None``, or ``NOT_FOUND`` if it did not exist."""
+        if not self.primitives:
+            raise ValkyrieConnectionError("Not connected")
+        return resolve_not_found(await self.primitives.remove_many(keys, window=window))
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.disconnect()
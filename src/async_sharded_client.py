@@ -0,0 +1,170 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Sequence, Tuple, TypeVar
+
+from src.async_client import AsyncValkyrieClient
+from src.connection.hash_ring import DEFAULT_VNODES, HashRing
+from src.connection.nodes import Node, parse_node
+from src.operations.batch import DEFAULT_WINDOW
+from src.sharded_client import ShardedOperations, group_by_node, merge_in_order
+
+
+T = TypeVar('T')
+
+
+class AsyncShardedPrimitives(ShardedOperations):
+    """Asyncio counterpart of ``ShardedPrimitives``; per-node batches run concurrently."""
+
+    def __init__(self, client):
+        super().__init__(client, 'primitives')
+
+    async def _split(self, keys: List[str],
+                     call: Callable[[Any, List[str]], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        groups = group_by_node(self._client.ring, keys)
+        # Look up every node's operations before creating any coroutine.
+        operations = {name: self._operations(self._client.clients[name]) for name in groups}
+        results = await self._client._run({
+            name: call(operations[name], group) for name, group in groups.items()
+        })
+        return merge_in_order(keys, results)
+
+    async def get_many(self, keys: Iterable[str], raise_on_error: bool = False,
+                       window: int = DEFAULT_WINDOW) -> Dict[str, Any]:
+        return await self._split(list(keys), lambda operations, group:
+                                 operations.get_many(group, raise_on_error=raise_on_error, window=window))
+
+    async def set_many(self, mapping: Mapping[str, Any], raise_on_error: bool = False,
+                       window: int = DEFAULT_WINDOW) -> Dict[str, Any]:
+        return await self._split(list(mapping), lambda operations, group: operations.set_many(
+            {key: mapping[key] for key in group}, raise_on_error=raise_on_error, window=window))
+
+    async def remove_many(self, keys: Iterable[str], raise_on_error: bool = False,
+                          window: int = DEFAULT_WINDOW) -> Dict[str, Any]:
+        return await self._split(list(keys), lambda operations, group:
+                                 operations.remove_many(group, raise_on_error=raise_on_error, window=window))
+
+
+class AsyncShardedValkyrieClient:
+    """Asyncio counterpart of ``ShardedValkyrieClient``; per-node batches run concurrently."""
+
+    def __init__(self, nodes: Sequence[Node], password: str = '', vnodes: int = DEFAULT_VNODES,
+                 **client_kwargs):
+        if not nodes:
+            raise ValueError("At least one node is required")
+
+        self.password = password
+        self.client_kwargs = client_kwargs
+        self.ring = HashRing(vnodes=vnodes)
+        self.clients: Dict[str, AsyncValkyrieClient] = {}
+        for node in nodes:
+            name, _ = self._add(node)
+            self.ring.add(name)
+
+        self.primitives = AsyncShardedPrimitives(self)
+        self.maps = ShardedOperations(self, 'maps')
+        self.arrays = ShardedOperations(self, 'arrays')
+
+    def _add(self, node: Node) -> Tuple[str, AsyncValkyrieClient]:
+        host, port = parse_node(node)
+        name = f"{host}:{port}"
+        if name in self.clients:
+            raise ValueError(f"Node {name!r} is already configured")
+        client = AsyncValkyrieClient(host, port, self.password, **self.client_kwargs)
+        self.clients[name] = client
+        return name, client
+
+    async def connect(self) -> None:
+        try:
+            await self._run({name: client.connect() for name, client in self.clients.items()})
+        except Exception:
+            await self.disconnect()
+            raise
+
+    async def disconnect(self) -> None:
+        await asyncio.gather(*(client.disconnect() for client in self.clients.values()))
+
+    async def add_node(self, node: Node) -> str:
+        """Add a node, connecting to it first if the client is connected."""
+        connected = self.is_connected
+        name, client = self._add(node)
+        if connected:
+            try:
+                await client.connect()
+            except Exception:
+                del self.clients[name]
+                raise
+        self.ring.add(name)
+        return name
+
+    async def remove_node(self, node: Node) -> None:
+        host, port = parse_node(node)
+        name = f"{host}:{port}"
+        if len(self.clients) == 1 and name in self.clients:
+            raise ValueError("Cannot remove the last node")
+        self.ring.remove(name)
+        await self.clients.pop(name).disconnect()
+
+    def client_for(self, key: str) -> AsyncValkyrieClient:
+        return self.clients[self.ring.node_for(key)]
+
+    @staticmethod
+    async def _run(calls: Dict[str, Awaitable[T]]) -> Dict[str, T]:
+        results = await asyncio.gather(*calls.values(), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return dict(zip(calls, results))
+
+    @property
+    def is_connected(self) -> bool:
+        return bool(self.clients) and all(client.is_connected for client in self.clients.values())
+
+    async def get(self, key: str):
+        return await self.client_for(key).get(key)
+
+    async def set(self, key: str, value):
+        return await self.client_for(key).set(key, value)
+
+    async def remove(self, key: str):
+        return await self.client_for(key).remove(key)
+
+    async def length(self, key: str):
+        return await self.client_for(key).length(key)
+
+    async def append(self, key: str, value: str):
+        return await self.client_for(key).append(key, value)
+
+    async def increment(self, key: str):
+        return await self.client_for(key).increment(key)
+
+    async def decrement(self, key: str):
+        return await self.client_for(key).decrement(key)
+
+    async def mget(self, keys: Iterable[str], window: int = DEFAULT_WINDOW) -> Dict[str, Any]:
+        keys = list(keys)
+        groups = group_by_node(self.ring, keys)
+        results = await self._run({
+            name: self.clients[name].mget(group, window) for name, group in groups.items()
+        })
+        return merge_in_order(keys, results)
+
+    async def mset(self, mapping: Mapping[str, Any], window: int = DEFAULT_WINDOW) -> None:
+        groups = group_by_node(self.ring, mapping)
+        await self._run({
+            name: self.clients[name].mset({key: mapping[key] for key in group}, window)
+            for name, group in groups.items()
+        })
+
+    async def mremove(self, keys: Iterable[str], window: int = DEFAULT_WINDOW) -> Dict[str, Any]:
+        keys = list(keys)
+        groups = group_by_node(self.ring, keys)
+        results = await self._run({
+            name: self.clients[name].mremove(group, window) for name, group in groups.items()
+        })
+        return merge_in_order(keys, results)
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.disconnect()
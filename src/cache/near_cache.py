@@ -0,0 +1,227 @@
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, NamedTuple, Optional, Set, Tuple, Union
+
+from ..protocol.decoder import ProtocolDecoder
+from ..protocol.packet import RequestPacket, ResponsePacket
+from ..protocol.types import CompositeType, Operation, Status
+
+
+MISS = object()
+
+_READS = {
+    (CompositeType.PRIMITIVE, Operation.GET),
+    (CompositeType.MAP, Operation.MAP_GET),
+}
+_WRITES = {
+    (CompositeType.PRIMITIVE, Operation.SET),
+    (CompositeType.PRIMITIVE, Operation.REMOVE),
+    (CompositeType.PRIMITIVE, Operation.APPEND),
+    (CompositeType.PRIMITIVE, Operation.INCREMENT),
+    (CompositeType.PRIMITIVE, Operation.DECREMENT),
+    (CompositeType.MAP, Operation.MAP_SET),
+    (CompositeType.MAP, Operation.MAP_REMOVE),
+}
+
+# Writes bump one of these counters and reads only store a value if their
+# counter is unchanged, so a read racing a write never caches the old value.
+# Unrelated keys sharing a stripe only cost a skipped store.
+_VERSION_STRIPES = 1024
+
+
+class _Entry(NamedTuple):
+    value: Any
+    size: int
+    expires: Optional[float]
+
+
+class _Token(NamedTuple):
+    is_write: bool
+    key: str
+    field: Optional[str]
+    version: int
+
+
+def _target(packet: RequestPacket) -> Tuple[str, Optional[str]]:
+    if packet.composite != CompositeType.MAP:
+        return packet.key, None
+    params = packet.params
+    if isinstance(params, (list, tuple)):
+        params = params[0]
+    map_key, _ = ProtocolDecoder.decode_string(params)
+    return packet.key, map_key
+
+
+class CacheHooks(ABC):
+    """Request hooks a client calls around every request it sends.
+
+    Subclasses implement ``get``, ``put``, ``invalidate`` and ``version``.
+    """
+
+    def lookup(self, packet: RequestPacket) -> Optional[ResponsePacket]:
+        """Answer a cacheable read from the cache, or return None."""
+        if (packet.composite, packet.operation) not in _READS:
+            return None
+        value = self.get(*_target(packet))
+        return None if value is MISS else ResponsePacket(Status.OK, value)
+
+    def track(self, packet: RequestPacket) -> Optional[_Token]:
+        """Call before sending ``packet``; pass the result to ``complete``."""
+        kind = (packet.composite, packet.operation)
+        if kind in _READS:
+            key, field = _target(packet)
+            return _Token(False, key, field, self.version(key))
+        if kind in _WRITES:
+            key, field = _target(packet)
+            self.invalidate(key, field)
+            return _Token(True, key, field, 0)
+        return None
+
+    def complete(self, token: Optional[_Token], response: Union[ResponsePacket, Exception, None]) -> None:
+        """Call with the outcome of a tracked request (an exception if it failed)."""
+        if token is None:
+            return
+        if token.is_write:
+            # Again after the write, in case a concurrent read cached the old value meanwhile.
+            self.invalidate(token.key, token.field)
+        elif isinstance(response, ResponsePacket) and response.status == Status.OK:
+            self.put(token.key, token.field, response.data, token.version)
+
+    @abstractmethod
+    def get(self, key: str, field: Optional[str] = None) -> Any:
+        """Return the cached value, or ``MISS``."""
+
+    @abstractmethod
+    def put(self, key: str, field: Optional[str], value: Any, version: Optional[int] = None) -> None:
+        """Store a value unless ``version`` shows a write has happened since the read began."""
+
+    @abstractmethod
+    def invalidate(self, key: str, field: Optional[str] = None) -> None:
+        """Drop the field, or with no field the key and all of its fields."""
+
+    @abstractmethod
+    def version(self, key: str) -> int:
+        """Return the write counter that ``put`` compares against for ``key``."""
+
+
+class NearCache(CacheHooks):
+    """In-process cache of decoded values for primitive and map-field reads.
+
+    Bounded by entry count (least recently used first out), an optional
+    approximate byte budget and an optional per-entry TTL in seconds. A client
+    given a cache serves ``GET`` and ``MAP_GET`` from it and invalidates
+    entries on its own writes; writes made by other clients are only noticed
+    when entries expire.
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: Optional[int] = None,
+                 ttl: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self._entries: 'OrderedDict[Tuple[str, Optional[str]], _Entry]' = OrderedDict()
+        self._fields: Dict[str, Set[Optional[str]]] = {}
+        self._versions = [0] * _VERSION_STRIPES
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str, field: Optional[str] = None) -> Any:
+        """Return the cached value, or ``MISS``."""
+        with self._lock:
+            entry = self._entries.get((key, field))
+            if entry is None:
+                self.misses += 1
+                return MISS
+            if entry.expires is not None and entry.expires <= self._clock():
+                self._remove((key, field))
+                self.expirations += 1
+                self.misses += 1
+                return MISS
+            self._entries.move_to_end((key, field))
+            self.hits += 1
+            return entry.value
+
+    def put(self, key: str, field: Optional[str], value: Any, version: Optional[int] = None) -> None:
+        """Cache ``value``; skipped if ``version`` is given and ``key`` was written since."""
+        size = sys.getsizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        with self._lock:
+            if version is not None and version != self._versions[hash(key) % _VERSION_STRIPES]:
+                return
+
+            cache_key = (key, field)
+            if cache_key in self._entries:
+                self._remove(cache_key)
+            expires = None if self.ttl is None else self._clock() + self.ttl
+            self._entries[cache_key] = _Entry(value, size, expires)
+            self._fields.setdefault(key, set()).add(field)
+            self._nbytes += size
+
+            while len(self._entries) > self.max_entries or \
+                    (self.max_bytes is not None and self._nbytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, key: str, field: Optional[str] = None) -> None:
+        """Drop one map field, or every entry under ``key`` when ``field`` is None."""
+        with self._lock:
+            self._versions[hash(key) % _VERSION_STRIPES] += 1
+            if field is not None:
+                if (key, field) in self._entries:
+                    self._remove((key, field))
+                return
+            for cached_field in list(self._fields.get(key, ())):
+                self._remove((key, cached_field))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._fields.clear()
+            self._nbytes = 0
+            self._versions = [version + 1 for version in self._versions]
+
+    def version(self, key: str) -> int:
+        with self._lock:
+            return self._versions[hash(key) % _VERSION_STRIPES]
+
+    def _remove(self, cache_key: Tuple[str, Optional[str]]) -> None:
+        entry = self._entries.pop(cache_key)
+        self._nbytes -= entry.size
+        key, field = cache_key
+        fields = self._fields[key]
+        fields.discard(field)
+        if not fields:
+            del self._fields[key]
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'entries': len(self._entries),
+            'bytes': self._nbytes,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
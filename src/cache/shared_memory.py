@@ -0,0 +1,366 @@
+import fcntl
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from .near_cache import MISS, CacheHooks
+from ..protocol.decoder import ProtocolDecoder
+from ..protocol.encoder import ProtocolEncoder
+
+
+# Segment layout: a header, then one (generation, version) pair per stripe,
+# then ``buckets * ways`` fixed-size slots. Every value is zero when the
+# segment is created, which is also the empty state.
+_MAGIC = b'VKNC0001'
+_HEADER = struct.Struct('<8sIII')  # magic, buckets, ways, slot size
+_HEADER_SIZE = 64
+_STRIPES = 1024
+_STRIPE = struct.Struct('<QQ')
+_STRIPES_SIZE = _STRIPES * _STRIPE.size
+
+# seq, ident length, value length, key length, hash, generation, expires, accessed
+_SLOT = struct.Struct('<IIIIQQdd')
+_SEQ = struct.Struct('<I')
+_ACCESSED = struct.Struct('<d')
+_ACCESSED_OFFSET = 40
+
+_ATTACH_TIMEOUT = 1.0
+
+# The resource tracker would unlink a segment when the process that opened
+# it exits, taking it away from every other process still using it. From
+# 3.13 it can be skipped per segment; before that, it is unregistered after.
+_UNTRACKED = {'track': False} if sys.version_info >= (3, 13) else {}
+
+
+# Python's own str hash is salted per process, so it can't be shared. Slots
+# also store the full key, so a crc32 collision only costs a comparison.
+_hash = zlib.crc32
+
+
+def _ident(key: str, field: Optional[str]) -> Tuple[bytes, bytes]:
+    key_bytes = key.encode('utf-8')
+    if field is None:
+        return key_bytes, key_bytes + b'\x00'
+    return key_bytes, key_bytes + b'\x01' + field.encode('utf-8')
+
+
+class SharedMemoryCache(CacheHooks):
+    """Near cache shared by every process on a host through ``multiprocessing.shared_memory``.
+
+    Processes opening the same ``name`` attach to one segment, so each value
+    is held once per host. Values are stored in the protocol's composite
+    encoding and decoded straight out of the segment. Slots are grouped into
+    buckets of ``ways``; a full bucket evicts its least recently read entry.
+
+    Reads take no locks: each slot carries a sequence number that writers make
+    odd while they rewrite it, and a read that sees it change is a miss.
+    Writers lock their bucket with ``fcntl`` byte-range locks on a lock file
+    next to the segment, so this backend needs a POSIX system. Values whose
+    encoding does not fit in ``slot_size`` are not cached.
+
+    The segment outlives the processes using it; call ``unlink`` once it is
+    no longer needed. Counters are per process, while ``len`` and ``nbytes``
+    cover the whole segment.
+    """
+
+    def __init__(self, name: str = 'valkyrie-near-cache', size: int = 64 * 1024 * 1024,
+                 slot_size: int = 1024, ways: int = 8, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.time):
+        if slot_size <= _SLOT.size:
+            raise ValueError(f"slot_size must be larger than {_SLOT.size}")
+        if ways < 1:
+            raise ValueError("ways must be at least 1")
+        buckets = (size - _HEADER_SIZE - _STRIPES_SIZE) // (slot_size * ways)
+        if buckets < 1:
+            raise ValueError("size is too small for a single bucket")
+
+        self.name = name
+        self.ttl = ttl
+        self._clock = clock
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self._shm = self._open(name, _HEADER_SIZE + _STRIPES_SIZE + buckets * ways * slot_size,
+                               buckets, ways, slot_size)
+        self._buf = self._shm.buf
+        _, self.buckets, self.ways, self.slot_size = _HEADER.unpack_from(self._buf, 0)
+
+        self._lock = threading.Lock()
+        self._lock_path = os.path.join(tempfile.gettempdir(), f"{name}.lock")
+        self._lock_fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+
+    @staticmethod
+    def _open(name: str, size: int, buckets: int, ways: int, slot_size: int) -> SharedMemory:
+        try:
+            shm = SharedMemory(name, create=True, size=size, **_UNTRACKED)
+            created = True
+        except FileExistsError:
+            shm = None
+            created = False
+
+        deadline = time.monotonic() + _ATTACH_TIMEOUT
+        while shm is None:
+            try:
+                shm = SharedMemory(name, **_UNTRACKED)
+            except ValueError:
+                # The creating process has not sized the segment yet.
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.001)
+
+        if not _UNTRACKED:
+            resource_tracker.unregister(shm._name, 'shared_memory')
+
+        if created:
+            # Magic goes last so attaching processes never see a partial header.
+            _HEADER.pack_into(shm.buf, 0, b'\x00' * 8, buckets, ways, slot_size)
+            shm.buf[:8] = _MAGIC
+            return shm
+
+        while bytes(shm.buf[:8]) != _MAGIC:
+            if time.monotonic() > deadline:
+                shm.close()
+                raise ValueError(f"Shared memory segment {name!r} is not a cache")
+            time.sleep(0.001)
+        return shm
+
+    def close(self) -> None:
+        """Detach this process from the segment; other processes keep using it."""
+        if self._buf is None:
+            return
+        self._buf.release()
+        self._buf = None
+        self._shm.close()
+        os.close(self._lock_fd)
+
+    def unlink(self) -> None:
+        """Destroy the segment for every process on the host."""
+        if not _UNTRACKED:
+            # Here unlink() always unregisters the segment, which must be registered
+            # first; an untracked segment's unlink() leaves the tracker alone.
+            resource_tracker.register(self._shm._name, 'shared_memory')
+        self._shm.unlink()
+        try:
+            os.unlink(self._lock_path)
+        except FileNotFoundError:
+            pass
+
+    @contextmanager
+    def _locked(self, *positions: int) -> Iterator[None]:
+        # fcntl locks belong to the process, so threads also need the local lock.
+        with self._lock:
+            locked = []
+            try:
+                for position in sorted(set(positions)):
+                    fcntl.lockf(self._lock_fd, fcntl.LOCK_EX, 1, position)
+                    locked.append(position)
+                yield
+            finally:
+                for position in reversed(locked):
+                    fcntl.lockf(self._lock_fd, fcntl.LOCK_UN, 1, position)
+
+    def _stripe(self, key_bytes: bytes) -> Tuple[int, int]:
+        # Stripe index and the lock position guarding it (after the bucket locks).
+        stripe = _hash(key_bytes) % _STRIPES
+        return _HEADER_SIZE + stripe * _STRIPE.size, self.buckets + stripe
+
+    def _slots(self, hash_value: int) -> Tuple[int, range]:
+        bucket = hash_value % self.buckets
+        start = _HEADER_SIZE + _STRIPES_SIZE + bucket * self.ways * self.slot_size
+        return bucket, range(start, start + self.ways * self.slot_size, self.slot_size)
+
+    def _find(self, offsets: range, hash_value: int, ident: bytes) -> Optional[int]:
+        buf = self._buf
+        for offset in offsets:
+            _, ident_len, _, _, slot_hash, _, _, _ = _SLOT.unpack_from(buf, offset)
+            start = offset + _SLOT.size
+            if slot_hash == hash_value and ident_len == len(ident) and \
+                    buf[start:start + ident_len] == ident:
+                return offset
+        return None
+
+    def _begin_write(self, offset: int) -> int:
+        seq = (_SEQ.unpack_from(self._buf, offset)[0] + 1) & 0xFFFFFFFF
+        _SEQ.pack_into(self._buf, offset, seq)
+        return seq
+
+    def _end_write(self, offset: int, seq: int) -> None:
+        _SEQ.pack_into(self._buf, offset, (seq + 1) & 0xFFFFFFFF)
+
+    def _clear_slot(self, offset: int) -> None:
+        seq = self._begin_write(offset)
+        _SLOT.pack_into(self._buf, offset, seq, 0, 0, 0, 0, 0, 0.0, 0.0)
+        self._end_write(offset, seq)
+
+    def get(self, key: str, field: Optional[str] = None) -> Any:
+        """Return the cached value, or ``MISS``."""
+        key_bytes, ident = _ident(key, field)
+        hash_value = _hash(ident)
+        _, offsets = self._slots(hash_value)
+        buf = self._buf
+
+        for offset in offsets:
+            seq, ident_len, value_len, _, slot_hash, slot_generation, expires, _ = \
+                _SLOT.unpack_from(buf, offset)
+            if slot_hash != hash_value or ident_len != len(ident) or seq & 1:
+                continue
+            start = offset + _SLOT.size
+            if buf[start:start + ident_len] != ident:
+                continue
+            stripe_offset, _ = self._stripe(key_bytes)
+            if slot_generation != _STRIPE.unpack_from(buf, stripe_offset)[0]:
+                break
+
+            now = self._clock()
+            if expires and expires <= now:
+                self.expirations += 1
+                break
+
+            value_start = start + ident_len
+            try:
+                value, end = ProtocolDecoder.decode_composite_value(buf, value_start)
+            except (ValueError, IndexError, UnicodeDecodeError, struct.error):
+                break
+            # A writer got in while we were reading; the value may be torn.
+            if end != value_start + value_len or _SEQ.unpack_from(buf, offset)[0] != seq:
+                break
+
+            _ACCESSED.pack_into(buf, offset + _ACCESSED_OFFSET, now)
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        return MISS
+
+    def put(self, key: str, field: Optional[str], value: Any, version: Optional[int] = None) -> None:
+        """Cache ``value``; skipped if ``version`` is given and ``key`` was written since."""
+        try:
+            data = ProtocolEncoder.encode_composite_value(value)
+        except ValueError:
+            return
+        key_bytes, ident = _ident(key, field)
+        if _SLOT.size + len(ident) + len(data) > self.slot_size:
+            return
+
+        hash_value = _hash(ident)
+        stripe_offset, stripe_lock = self._stripe(key_bytes)
+        bucket, offsets = self._slots(hash_value)
+        buf = self._buf
+
+        with self._locked(bucket, stripe_lock):
+            generation, current = _STRIPE.unpack_from(buf, stripe_offset)
+            if version is not None and version != current:
+                return
+
+            offset = self._find(offsets, hash_value, ident)
+            if offset is None:
+                offset = self._victim(offsets)
+
+            seq = self._begin_write(offset)
+            now = self._clock()
+            expires = 0.0 if self.ttl is None else now + self.ttl
+            _SLOT.pack_into(buf, offset, seq, len(ident), len(data), len(key_bytes),
+                            hash_value, generation, expires, now)
+            start = offset + _SLOT.size
+            buf[start:start + len(ident)] = ident
+            buf[start + len(ident):start + len(ident) + len(data)] = data
+            self._end_write(offset, seq)
+
+    def _victim(self, offsets: range) -> int:
+        # A free, expired or invalidated slot if the bucket has one, else the least recently read.
+        now = self._clock()
+        oldest, oldest_accessed = offsets[0], None
+        for offset in offsets:
+            if not self._live(offset, now):
+                return offset
+            accessed = _ACCESSED.unpack_from(self._buf, offset + _ACCESSED_OFFSET)[0]
+            if oldest_accessed is None or accessed < oldest_accessed:
+                oldest, oldest_accessed = offset, accessed
+        self.evictions += 1
+        return oldest
+
+    def _live(self, offset: int, now: float) -> bool:
+        _, ident_len, _, key_len, _, generation, expires, _ = _SLOT.unpack_from(self._buf, offset)
+        if not ident_len or (expires and expires <= now):
+            return False
+        start = offset + _SLOT.size
+        stripe_offset, _ = self._stripe(bytes(self._buf[start:start + key_len]))
+        return generation == _STRIPE.unpack_from(self._buf, stripe_offset)[0]
+
+    def invalidate(self, key: str, field: Optional[str] = None) -> None:
+        """Drop one map field, or every entry under ``key`` when ``field`` is None."""
+        key_bytes, ident = _ident(key, field)
+        stripe_offset, stripe_lock = self._stripe(key_bytes)
+
+        if field is None:
+            with self._locked(stripe_lock):
+                generation, version = _STRIPE.unpack_from(self._buf, stripe_offset)
+                _STRIPE.pack_into(self._buf, stripe_offset, generation + 1, version + 1)
+            return
+
+        hash_value = _hash(ident)
+        bucket, offsets = self._slots(hash_value)
+        with self._locked(bucket, stripe_lock):
+            generation, version = _STRIPE.unpack_from(self._buf, stripe_offset)
+            _STRIPE.pack_into(self._buf, stripe_offset, generation, version + 1)
+            offset = self._find(offsets, hash_value, ident)
+            if offset is not None:
+                self._clear_slot(offset)
+
+    def clear(self) -> None:
+        with self._lock:
+            fcntl.lockf(self._lock_fd, fcntl.LOCK_EX, 0, 0)
+            try:
+                for stripe in range(_STRIPES):
+                    offset = _HEADER_SIZE + stripe * _STRIPE.size
+                    generation, version = _STRIPE.unpack_from(self._buf, offset)
+                    _STRIPE.pack_into(self._buf, offset, generation + 1, version + 1)
+            finally:
+                fcntl.lockf(self._lock_fd, fcntl.LOCK_UN, 0, 0)
+
+    def version(self, key: str) -> int:
+        stripe_offset, _ = self._stripe(key.encode('utf-8'))
+        return _STRIPE.unpack_from(self._buf, stripe_offset)[1]
+
+    def _live_slots(self) -> Iterator[int]:
+        now = self._clock()
+        start = _HEADER_SIZE + _STRIPES_SIZE
+        for offset in range(start, start + self.buckets * self.ways * self.slot_size, self.slot_size):
+            if self._live(offset, now):
+                yield offset
+
+    @property
+    def nbytes(self) -> int:
+        """Encoded bytes held by live entries across all processes."""
+        return sum(_SLOT.unpack_from(self._buf, offset)[2] for offset in self._live_slots())
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'entries': len(self),
+            'bytes': self.nbytes,
+        }
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._live_slots())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
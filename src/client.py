@@ -1,26 +1,70 @@
-from typing import Optional
-from src.connection.connection import TCPConnection
-from src.connection.auth import AuthHandler
+import struct
+import time
+from collections import deque
+from functools import partial
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Union
+from src.connection.deadline import current_deadline, timeout_for
+from src.connection.hedging import HedgePolicy
+from src.connection.nodes import Node, parse_node
+from src.connection.options import ConnectionOptions
+from src.connection.pool import ConnectionPool
+from src.connection.replica_router import ReplicaRouter, reads_on_primary
+from src.connection.retry import DEFAULT_RETRY, CircuitBreaker, RetryPolicy, is_retryable
+from src.connection.single_flight import SingleFlight, flight_key
+from src.pipeline import Pipeline
+from src.cache.near_cache import CacheHooks
 from src.protocol.packet import RequestPacket, ResponsePacket
+from src.protocol.stream import iter_stream
 from src.protocol.types import Status
 from src.operations.primitives import PrimitiveOperations
 from src.operations.maps import MapOperations
 from src.operations.arrays import ArrayOperations
-from src.exceptions.errors import (
-    ValkyrieError, ValkyrieConnectionError, ValkyrieRequestError,
-    ValkyrieServerError, ValkyrieAuthError
-)
+from src.operations.batch import DEFAULT_WINDOW, NOT_FOUND, resolve_not_found
+from src.exceptions.errors import ValkyrieError, ValkyrieConnectionError, error_for_status
 
 
 class ValkyrieClient:
 
-    def __init__(self, host: str = 'localhost', port: int = 8080, password: str = ''):
+    def __init__(self, host: str = 'localhost', port: int = 8080, password: str = '',
+                 pool_size: int = 1, min_pool_size: Optional[int] = None,
+                 pool_timeout: Optional[float] = None,
+                 idle_timeout: Optional[float] = None,
+                 health_check_interval: Optional[float] = 30.0,
+                 near_cache: Optional[CacheHooks] = None,
+                 coalesce_reads: bool = False,
+                 replicas: Sequence[Node] = (),
+                 hedging: Optional[HedgePolicy] = None,
+                 options: Optional[ConnectionOptions] = None,
+                 retry: Optional[RetryPolicy] = DEFAULT_RETRY,
+                 breaker_threshold: Optional[int] = 5,
+                 breaker_timeout: float = 5.0):
+        if hedging is not None and not replicas and pool_size < 2:
+            # The hedge would queue for the connection the slow read is holding.
+            raise ValueError("hedging needs pool_size of at least 2 or replicas")
         self.host = host
         self.port = port
         self.password = password
-
-        self.connection: Optional[TCPConnection] = None
-        self.auth_handler: Optional[AuthHandler] = None
+        self.pool_size = pool_size
+        self.min_pool_size = pool_size if min_pool_size is None else min_pool_size
+        self.pool_timeout = pool_timeout
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.near_cache = near_cache
+        self.coalesce_reads = coalesce_reads
+        self._single_flight = SingleFlight() if coalesce_reads else None
+        self.replicas = [parse_node(replica) for replica in replicas]
+        self.hedging = hedging
+        self.options = options or ConnectionOptions()
+        self.retry = retry
+        self.breaker_threshold = breaker_threshold
+        self.breaker_timeout = breaker_timeout
+
+        self.pool: Optional[ConnectionPool] = None
+        self.replica_pools: List[ConnectionPool] = []
+        self.replica_router: Optional[ReplicaRouter] = None
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
 
         self.primitives: Optional[PrimitiveOperations] = None
         self.maps: Optional[MapOperations] = None
@@ -29,40 +73,222 @@ class ValkyrieClient:
 
     def connect(self) -> None:
         try:
-            self.connection = TCPConnection(self.host, self.port)
-            self.connection.connect()
-
-            self.auth_handler = AuthHandler(self.connection)
-            self.auth_handler.authenticate(self.password)
-
-            self.primitives = PrimitiveOperations(self._send_request)
-            self.maps = MapOperations(self._send_request)
-            self.arrays = ArrayOperations(self._send_request)
+            self.pool = ConnectionPool(
+                self.host, self.port, self.password,
+                min_size=self.min_pool_size,
+                max_size=self.pool_size,
+                timeout=self.pool_timeout,
+                idle_timeout=self.idle_timeout,
+                health_check_interval=self.health_check_interval,
+                options=self.options,
+                breaker=self._new_breaker()
+            )
+            self.pool.open()
+            if self.replicas:
+                self._open_replicas()
+            if self.hedging is not None:
+                # Enough workers for a request on every connection; more would only queue on the pools.
+                self._hedge_executor = ThreadPoolExecutor(
+                    max(2, self.pool_size * (1 + len(self.replicas))), thread_name_prefix='ValkyrieHedge'
+                )
+
+            self.primitives = PrimitiveOperations(self._send_request, self._stream_requests)
+            self.maps = MapOperations(self._send_request, self._stream_request, self._stream_requests)
+            self.arrays = ArrayOperations(self._send_request, self._stream_request, self._stream_requests)
 
 
         except Exception as e:
             self.disconnect()
             raise ValkyrieConnectionError(f"Failed to connect: {e}")
 
+    def _new_breaker(self) -> Optional[CircuitBreaker]:
+        if self.breaker_threshold is None:
+            return None
+        return CircuitBreaker(self.breaker_threshold, self.breaker_timeout)
+
+    def _open_replicas(self) -> None:
+        self.replica_router = ReplicaRouter(len(self.replicas))
+        for index, (host, port) in enumerate(self.replicas):
+            pool = ConnectionPool(
+                host, port, self.password,
+                min_size=self.min_pool_size,
+                max_size=self.pool_size,
+                timeout=self.pool_timeout,
+                idle_timeout=self.idle_timeout,
+                health_check_interval=self.health_check_interval,
+                options=self.options,
+                breaker=self._new_breaker()
+            )
+            self.replica_pools.append(pool)
+            try:
+                pool.open()
+            except Exception:
+                # Reads fall back to the others; the pool connects lazily once the replica is retried.
+                self.replica_router.demote(index)
+
     def disconnect(self) -> None:
-        if self.connection:
-            self.connection.disconnect()
-            self.connection = None
-            self.auth_handler = None
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+            self._hedge_executor = None
+        for pool in self.replica_pools:
+            pool.close()
+        self.replica_pools = []
+        self.replica_router = None
+        if self.pool:
+            self.pool.close()
+            self.pool = None
             self.primitives = None
             self.maps = None
             self.arrays = None
 
     def _send_request(self, packet: RequestPacket) -> ResponsePacket:
-        if not self.connection or not self.connection.is_connected:
+        cache = self.near_cache
+        if cache is not None:
+            cached = cache.lookup(packet)
+            if cached is not None:
+                return cached
+
+        deadline = current_deadline(self.options.request_timeout)
+        # A pinned read must not share a flight that may be answered by a replica.
+        if self._single_flight is not None and not reads_on_primary():
+            key = flight_key(packet)
+            if key is not None:
+                return self._single_flight.do(key, lambda: self._send_request_tracked(packet, deadline),
+                                              timeout_for(deadline))
+        return self._send_request_tracked(packet, deadline)
+
+    def _send_request_tracked(self, packet: RequestPacket, deadline: Optional[float]) -> ResponsePacket:
+        cache = self.near_cache
+        if cache is None:
+            return self._send_request_uncached(packet, deadline)
+
+        token = cache.track(packet)
+        try:
+            response = self._send_request_uncached(packet, deadline)
+        except Exception as e:
+            cache.complete(token, e)
+            raise
+        cache.complete(token, response)
+        return response
+
+    def _send_request_uncached(self, packet: RequestPacket, deadline: Optional[float] = None) -> ResponsePacket:
+        attempt = 0
+        while True:
+            try:
+                return self._dispatch(packet, deadline)
+            except ValkyrieConnectionError as e:
+                if not self._recover(e, packet.is_idempotent, attempt, deadline):
+                    raise
+            attempt += 1
+
+    def _recover(self, error: ValkyrieConnectionError, replayable: bool, attempt: int,
+                 deadline: Optional[float]) -> bool:
+        """Clean up after a broken connection; return True once it is time to replay.
+
+        The server may have restarted, so the idle connections are dropped and
+        the next request reconnects and authenticates afresh.
+        """
+        if not is_retryable(error) or not self.pool or self.pool.closed:
+            return False
+        self.pool.purge()
+
+        retry = self.retry
+        if retry is None or not replayable or attempt >= retry.retries:
+            return False
+        delay = retry.backoff(attempt)
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            return False
+        if delay:
+            time.sleep(delay)
+        return True
+
+    def _dispatch(self, packet: RequestPacket, deadline: Optional[float]) -> ResponsePacket:
+        if not self.pool or self.pool.closed:
             raise ValkyrieConnectionError("Not connected to server")
 
-        try:
-            request_bytes = packet.to_bytes()
-            self.connection.send(request_bytes)
+        if packet.is_read_only:
+            if self._hedge_executor is not None:
+                return self._send_hedged(packet, deadline)
+            if self.replica_router is not None:
+                return self._read(packet, self._choose_replica(), deadline)
+        return self._exchange(self.pool, packet, deadline)
+
+    def _choose_replica(self, exclude: Optional[int] = None) -> Optional[int]:
+        router = self.replica_router
+        if router is None or reads_on_primary():
+            return None
+        return router.choose(exclude)
+
+    def _read(self, packet: RequestPacket, index: Optional[int],
+              deadline: Optional[float] = None) -> ResponsePacket:
+        """Read from replica ``index``, or from the primary if it is None or unreachable."""
+        router = self.replica_router
+        if index is not None and router is not None:
+            start = time.perf_counter()
+            try:
+                response = self._exchange(self.replica_pools[index], packet, deadline)
+            except ValkyrieConnectionError:
+                # The read is safe to repeat, so the primary answers it instead.
+                router.failed(index)
+            except ValkyrieError:
+                router.record(index, time.perf_counter() - start)
+                raise
+            else:
+                router.record(index, time.perf_counter() - start)
+                return response
+
+        return self._exchange(self.pool, packet, deadline)
+
+    def _send_hedged(self, packet: RequestPacket, deadline: Optional[float] = None) -> ResponsePacket:
+        """Read ``packet``, sending a second copy elsewhere if the first is slow.
+
+        The first answer wins. The loser runs to completion in the background
+        so its connection goes back to the pool in sync.
+        """
+        hedging = self.hedging
+        delay = hedging.next_delay()
+        index = self._choose_replica()
+
+        def timed_read() -> ResponsePacket:
+            start = time.perf_counter()
+            response = self._read(packet, index, deadline)
+            hedging.record(time.perf_counter() - start)
+            return response
 
-            response_bytes = self.connection.receive_response()
-            response = ResponsePacket.from_bytes(response_bytes)
+        first = self._hedge_executor.submit(timed_read)
+        try:
+            return first.result(timeout=delay)
+        except FutureTimeoutError:
+            pass
+        second_index = self._choose_replica(exclude=index)
+        if not self._can_hedge(second_index) or not hedging.try_hedge():
+            if second_index is not None:
+                self.replica_router.release(second_index)
+            return first.result()
+
+        second = self._hedge_executor.submit(self._read, packet, second_index, deadline)
+        done, _ = wait((first, second), return_when=FIRST_COMPLETED)
+        winner = first if first in done else second
+        if isinstance(winner.exception(), ValkyrieConnectionError):
+            # An unreachable node is not an answer; wait for the other copy.
+            winner = second if winner is first else first
+        if winner is second:
+            hedging.hedge_won()
+        return winner.result()
+
+    def _can_hedge(self, index: Optional[int]) -> bool:
+        # A hedge that has to wait for a connection starts too late to win.
+        pool = self.pool if index is None else self.replica_pools[index]
+        return pool.has_capacity
+
+    def _exchange(self, pool: ConnectionPool, packet: RequestPacket,
+                  deadline: Optional[float] = None) -> ResponsePacket:
+        try:
+            request_buffers = packet.to_buffers()
+            with pool.connection(timeout_for(deadline, pool.timeout)) as connection:
+                connection.send_buffers(request_buffers, deadline)
+                response_bytes = connection.receive_response(deadline)
+            response = ResponsePacket.from_bytes(response_bytes, packet.response_schema)
 
             if response.status != Status.OK:
                 self._handle_error_status(response.status)
@@ -74,31 +300,205 @@ class ValkyrieClient:
         except Exception as e:
             raise ValkyrieConnectionError(f"Communication error: {e}")
 
+    def _stream_request(self, packet: RequestPacket) -> Iterator[Any]:
+        """Send ``packet`` and yield the elements of its response as they are read.
+
+        The connection stays checked out until the generator is exhausted; one
+        that is closed early discards it, since the rest of the frame is unread.
+        """
+        if not self.pool or self.pool.closed:
+            raise ValkyrieConnectionError("Not connected to server")
+
+        # The deadline covers the whole stream, including time the caller spends between elements.
+        deadline = current_deadline(self.options.request_timeout)
+        try:
+            with self.pool.connection(timeout_for(deadline, self.pool.timeout)) as connection:
+                receive = connection.receive if deadline is None else partial(connection.receive, deadline=deadline)
+                connection.send_buffers(packet.to_buffers(), deadline)
+                length = struct.unpack('<I', receive(4))[0]
+                if length < 1:
+                    raise ValueError("Response too short")
+
+                status = Status(receive(1)[0])
+                if status != Status.OK:
+                    receive(length - 1)
+                    self._handle_error_status(status)
+
+                if length > 1:
+                    yield from iter_stream(receive, length - 1)
+
+        except ValkyrieError:
+            raise
+        except Exception as e:
+            raise ValkyrieConnectionError(f"Communication error: {e}")
+
+    def _send_requests(self, packets: List[RequestPacket]) -> List[Union[ResponsePacket, ValkyrieError]]:
+        cache = self.near_cache
+        if cache is None:
+            return self._send_requests_uncached(packets)
+
+        tokens = [cache.track(packet) for packet in packets]
+        try:
+            results = self._send_requests_uncached(packets)
+        except Exception as e:
+            for token in tokens:
+                cache.complete(token, e)
+            raise
+        for token, result in zip(tokens, results):
+            cache.complete(token, result)
+        return results
+
+    def _send_requests_uncached(self, packets: List[RequestPacket]) -> List[Union[ResponsePacket, ValkyrieError]]:
+        deadline = current_deadline(self.options.request_timeout)
+        replayable = all(packet.is_idempotent for packet in packets)
+        attempt = 0
+        while True:
+            try:
+                return self._send_requests_once(packets, deadline)
+            except ValkyrieConnectionError as e:
+                if not self._recover(e, replayable, attempt, deadline):
+                    raise
+            attempt += 1
+
+    def _send_requests_once(self, packets: List[RequestPacket],
+                            deadline: Optional[float]) -> List[Union[ResponsePacket, ValkyrieError]]:
+        if not self.pool or self.pool.closed:
+            raise ValkyrieConnectionError("Not connected to server")
+
+        try:
+            request_buffers = [buffer for packet in packets for buffer in packet.to_buffers()]
+            with self.pool.connection(timeout_for(deadline, self.pool.timeout)) as connection:
+                connection.send_buffers(request_buffers, deadline)
+                responses_bytes = [connection.receive_response(deadline) for _ in packets]
+
+            results: List[Union[ResponsePacket, ValkyrieError]] = []
+            for packet, response_bytes in zip(packets, responses_bytes):
+                response = ResponsePacket.from_bytes(response_bytes, packet.response_schema)
+                if response.status != Status.OK:
+                    results.append(error_for_status(response.status))
+                else:
+                    results.append(response)
+            return results
+
+        except ValkyrieError:
+            raise
+        except Exception as e:
+            raise ValkyrieConnectionError(f"Communication error: {e}")
+
+    def _stream_requests(self, packets: Iterable[RequestPacket],
+                         window: int) -> Iterator[Union[ResponsePacket, ValkyrieError]]:
+        cache = self.near_cache
+        if cache is None:
+            return self._stream_requests_uncached(packets, window)
+        return self._stream_requests_cached(cache, packets, window)
+
+    def _stream_requests_cached(self, cache: CacheHooks, packets: Iterable[RequestPacket],
+                                window: int) -> Iterator[Union[ResponsePacket, ValkyrieError]]:
+        tokens = deque()
+
+        def tracked():
+            # Pulled just before each packet is sent.
+            for packet in packets:
+                tokens.append(cache.track(packet))
+                yield packet
+
+        results = self._stream_requests_uncached(tracked(), window)
+        try:
+            for result in results:
+                cache.complete(tokens.popleft(), result)
+                yield result
+        finally:
+            results.close()
+            for token in tokens:
+                cache.complete(token, None)
+
+    def _stream_requests_uncached(self, packets: Iterable[RequestPacket],
+                                  window: int) -> Iterator[Union[ResponsePacket, ValkyrieError]]:
+        """Pipeline ``packets`` on one connection with at most ``window`` in flight.
+
+        Packets are pulled lazily and results are yielded in order, with error
+        statuses yielded as exceptions like ``_send_requests``. Requests are
+        topped up before each response is read, so the server is working on the
+        next ones while the caller handles the current result. If the
+        connection breaks while only idempotent requests are unanswered, they
+        are replayed on a new one and the stream carries on. An exception from
+        building a packet (such as an unencodable value) is raised unchanged
+        once the requests already sent are answered; nothing after them is sent.
+        """
+        if not self.pool or self.pool.closed:
+            raise ValkyrieConnectionError("Not connected to server")
+        if window < 1:
+            raise ValueError("window must be at least 1")
+
+        packets = iter(packets)
+        in_flight: Deque[RequestPacket] = deque()
+        exhausted = False
+        error: Optional[Exception] = None
+        deadline = current_deadline(self.options.request_timeout)
+        attempt = 0
+
+        while True:
+            try:
+                with self.pool.connection(timeout_for(deadline, self.pool.timeout)) as connection:
+                    if in_flight:
+                        # Replay what the broken connection left unanswered.
+                        connection.send_buffers([buffer for packet in in_flight for buffer in packet.to_buffers()],
+                                                deadline)
+                    while True:
+                        batch = []
+                        while not exhausted and len(in_flight) + len(batch) < window:
+                            try:
+                                packet = next(packets, None)
+                            except Exception as e:
+                                # A value that cannot be encoded is the caller's error, not the
+                                # connection's: send none of this batch, answer what is already
+                                # in flight so the connection stays in sync, then raise it.
+                                error = e
+                                exhausted = True
+                                batch = []
+                                break
+                            if packet is None:
+                                exhausted = True
+                            else:
+                                batch.append(packet)
+                        if batch:
+                            # Queued first, so a failed send is replayed too.
+                            in_flight.extend(batch)
+                            connection.send_buffers([buffer for packet in batch for buffer in packet.to_buffers()],
+                                                    deadline)
+                        if not in_flight:
+                            break
+
+                        packet = in_flight[0]
+                        response = ResponsePacket.from_bytes(connection.receive_response(deadline),
+                                                             packet.response_schema)
+                        in_flight.popleft()
+                        if response.status != Status.OK:
+                            yield error_for_status(response.status)
+                        else:
+                            yield response
+                break
+
+            except ValkyrieConnectionError as e:
+                if not self._recover(e, all(packet.is_idempotent for packet in in_flight), attempt, deadline):
+                    raise
+            except ValkyrieError:
+                raise
+            except Exception as e:
+                raise ValkyrieConnectionError(f"Communication error: {e}")
+            attempt += 1
+
+        if error is not None:
+            raise error
+
     @staticmethod
     def _handle_error_status(status: Status) -> None:
-        error_messages = {
-            Status.INVALID_REQUEST: "Invalid request",
-            Status.UNAVAILABLE_OPERATION: "Unavailable operation",
-            Status.UNAUTHORIZED: "Unauthorized access",
-            Status.NOT_FOUND: "Key not found",
-            Status.WRONG_TYPE: "Wrong data type",
-            Status.OUT_OF_RANGE: "Index out of range",
-            Status.INTERNAL_ERROR: "Internal server error"
-        }
-
-        message = error_messages.get(status, f"Unknown error (status: {status})")
-
-        if status in (Status.INVALID_REQUEST, Status.UNAVAILABLE_OPERATION):
-            raise ValkyrieRequestError(message)
-        elif status == Status.UNAUTHORIZED:
-            raise ValkyrieAuthError(message)
-        else:
-            raise ValkyrieServerError(message)
+        raise error_for_status(status)
 
     @property
     def is_connected(self) -> bool:
-        return (self.connection is not None and
-                self.connection.is_connected and
+        return (self.pool is not None and
+                not self.pool.closed and
                 self.primitives is not None)
 
     def get(self, key: str):
@@ -136,6 +536,31 @@ class ValkyrieClient:
             raise ValkyrieConnectionError("Not connected")
         return self.primitives.decrement(key)
 
+    def pipeline(self) -> Pipeline:
+        if not self.primitives:
+            raise ValkyrieConnectionError("Not connected")
+        return Pipeline(self._send_requests)
+
+    def mget(self, keys: Iterable[str], window: int = DEFAULT_WINDOW) -> Dict[str, Any]:
+        """Get many keys in one pipelined batch, keyed by input.
+
+        Missing keys map to ``NOT_FOUND``; any other error is raised once the
+        batch is complete. At most ``window`` requests are in flight at a time.
+        """
+        if not self.primitives:
+            raise ValkyrieConnectionError("Not connected")
+        return resolve_not_found(self.primitives.get_many(keys, window=window))
+
+    def mset(self, mapping: Mapping[str, Any], window: int = DEFAULT_WINDOW) -> None:
+        if not self.primitives:
+            raise ValkyrieConnectionError("Not connected")
+        self.primitives.set_many(mapping, raise_on_error=True, window=window)
+
+    def mremove(self, keys: Iterable[str], window: int = DEFAULT_WINDOW) -> Dict[str, Any]:
+        """Remove many keys; each maps to ``None``, or ``NOT_FOUND`` if it did not exist."""
+        if not self.primitives:
+            raise ValkyrieConnectionError("Not connected")
+        return resolve_not_found(self.primitives.remove_many(keys, window=window))
 
     def __enter__(self):
         self.connect()
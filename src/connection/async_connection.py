@@ -0,0 +1,144 @@
+import asyncio
+import socket
+import struct
+from typing import Awaitable, Optional, Sequence, TypeVar, Union
+
+from .deadline import timeout_for
+from .options import ConnectionOptions
+from ..exceptions.errors import ValkyrieConnectionError, ValkyrieTimeoutError
+
+
+T = TypeVar('T')
+
+
+class AsyncTCPConnection:
+    """Asyncio counterpart of ``TCPConnection``, with the same timeouts and deadlines."""
+
+    def __init__(self, host: str, port: int, options: Optional[ConnectionOptions] = None):
+        self.host = host
+        self.port = port
+        self.options = options or ConnectionOptions()
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def connect(self) -> None:
+        options = self.options
+        sock = None
+        try:
+            # The socket is made here so buffer sizes are set before the handshake.
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            options.configure(sock)
+            sock.setblocking(False)
+            connecting = asyncio.get_running_loop().sock_connect(sock, (self.host, self.port))
+            await asyncio.wait_for(connecting, options.connect_timeout)
+            self.reader, self.writer = await asyncio.open_connection(sock=sock)
+            if not options.tcp_nodelay:
+                # Asyncio turns TCP_NODELAY on for every transport.
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 0)
+        except Exception as e:
+            self.reader = None
+            self.writer = None
+            if sock is not None:
+                sock.close()
+            if isinstance(e, asyncio.TimeoutError):
+                raise ValkyrieTimeoutError(f"Timed out connecting to {self.host}:{self.port}")
+            raise ValkyrieConnectionError(f"Failed to connect to {self.host}:{self.port}")
+
+    async def _bounded(self, awaitable: Awaitable[T], deadline: Optional[float], action: str) -> T:
+        timeout = timeout_for(deadline, self.options.read_timeout)
+        if timeout is None:
+            return await awaitable
+        try:
+            return await asyncio.wait_for(awaitable, timeout)
+        except asyncio.TimeoutError:
+            raise ValkyrieTimeoutError(f"Timed out {action}")
+
+    async def send(self, data: bytes, deadline: Optional[float] = None) -> None:
+        if not self.writer:
+            raise ValkyrieConnectionError("Not connected")
+
+        try:
+            self.writer.write(data)
+            await self._bounded(self.writer.drain(), deadline, "sending data")
+        except ValkyrieTimeoutError:
+            raise
+        except Exception as e:
+            raise ValkyrieConnectionError(f"Failed to send data: {e}")
+
+    async def send_buffers(self, buffers: Sequence[Union[bytes, bytearray, memoryview]],
+                           deadline: Optional[float] = None) -> None:
+        self.write_buffers(buffers)
+        await self.drain(deadline)
+
+    def write_buffers(self, buffers: Sequence[Union[bytes, bytearray, memoryview]]) -> None:
+        if not self.writer:
+            raise ValkyrieConnectionError("Not connected")
+
+        try:
+            self.writer.writelines(buffers)
+        except Exception as e:
+            raise ValkyrieConnectionError(f"Failed to send data: {e}")
+
+    async def drain(self, deadline: Optional[float] = None) -> None:
+        if not self.writer:
+            raise ValkyrieConnectionError("Not connected")
+
+        try:
+            await self._bounded(self.writer.drain(), deadline, "sending data")
+        except ValkyrieTimeoutError:
+            raise
+        except Exception as e:
+            raise ValkyrieConnectionError(f"Failed to send data: {e}")
+
+    async def receive(self, length: int, deadline: Optional[float] = None) -> bytes:
+        if not self.reader:
+            raise ValkyrieConnectionError("Not connected")
+
+        try:
+            return await self._bounded(self.reader.readexactly(length), deadline, "receiving data")
+        except ValkyrieTimeoutError:
+            raise
+        except asyncio.IncompleteReadError:
+            raise ValkyrieConnectionError("Connection closed by server")
+        except Exception as e:
+            raise ValkyrieConnectionError(f"Failed to receive data: {e}")
+
+    async def receive_response(self, deadline: Optional[float] = None, idle: bool = False) -> bytes:
+        """Read one frame; with ``idle``, wait for it to start without the read timeout."""
+        if idle:
+            if not self.reader:
+                raise ValkyrieConnectionError("Not connected")
+            try:
+                length_data = await self.reader.readexactly(4)
+            except asyncio.IncompleteReadError:
+                raise ValkyrieConnectionError("Connection closed by server")
+            except Exception as e:
+                raise ValkyrieConnectionError(f"Failed to receive data: {e}")
+        else:
+            length_data = await self.receive(4, deadline)
+
+        response_length = struct.unpack('<I', length_data)[0]
+
+        return await self.receive(response_length, deadline)
+
+    @property
+    def is_connected(self) -> bool:
+        return self.writer is not None and not self.writer.is_closing()
+
+    async def disconnect(self) -> None:
+        if self.writer:
+            writer = self.writer
+            self.reader = None
+            self.writer = None
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.disconnect()
@@ -0,0 +1,189 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Optional
+
+from .async_connection import AsyncTCPConnection
+from .auth import AsyncAuthHandler
+from .options import ConnectionOptions
+from .retry import CircuitBreaker
+from ..exceptions.errors import (
+    ValkyrieAuthError, ValkyrieConnectionError, ValkyrieRequestError, ValkyrieServerError, ValkyrieTimeoutError
+)
+
+
+class AsyncConnectionPool:
+    """Pool of authenticated connections shared by coroutines on one event loop."""
+
+    def __init__(self, host: str, port: int, password: str = '',
+                 min_size: int = 1, max_size: int = 1,
+                 timeout: Optional[float] = None,
+                 options: Optional[ConnectionOptions] = None,
+                 breaker: Optional[CircuitBreaker] = None):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if not 0 <= min_size <= max_size:
+            raise ValueError("min_size must be between 0 and max_size")
+
+        self.host = host
+        self.port = port
+        self.password = password
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.options = options
+        self.breaker = breaker
+
+        self._idle: Deque[AsyncTCPConnection] = deque()
+        self._size = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._closed = True
+
+    async def open(self) -> None:
+        # Created here rather than in __init__ so the pool binds to the running loop.
+        self._condition = asyncio.Condition()
+        self._closed = False
+
+        count = self.min_size - self._size
+        if count <= 0:
+            return
+
+        self._size += count
+        results = await asyncio.gather(
+            *(self._create_connection() for _ in range(count)), return_exceptions=True
+        )
+
+        errors = [result for result in results if isinstance(result, BaseException)]
+        connections = [result for result in results if not isinstance(result, BaseException)]
+        if errors:
+            for connection in connections:
+                await connection.disconnect()
+            self._size -= count
+            raise errors[0]
+
+        self._idle.extend(connections)
+
+    async def close(self) -> None:
+        self._closed = True
+        while self._idle:
+            await self._discard(self._idle.popleft())
+        if self._condition is not None:
+            async with self._condition:
+                self._condition.notify_all()
+
+    async def purge(self) -> None:
+        """Close the idle connections, which a failure on one suggests are broken too."""
+        while self._idle:
+            await self._discard(self._idle.popleft())
+        if self._condition is not None:
+            async with self._condition:
+                self._condition.notify_all()
+
+    async def acquire(self, timeout: Optional[float] = None) -> AsyncTCPConnection:
+        if self._closed or self._condition is None:
+            raise ValkyrieConnectionError("Connection pool is closed")
+        if timeout is None:
+            timeout = self.timeout
+
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+
+        async with self._condition:
+            while True:
+                if self._closed:
+                    raise ValkyrieConnectionError("Connection pool is closed")
+
+                while self._idle:
+                    connection = self._idle.pop()
+                    if connection.is_connected:
+                        return connection
+                    await self._discard(connection)
+
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+
+                remaining = None if deadline is None else deadline - loop.time()
+                if remaining is not None and remaining <= 0:
+                    raise ValkyrieTimeoutError("Timed out waiting for a pooled connection")
+                try:
+                    await asyncio.wait_for(self._condition.wait(), remaining)
+                except asyncio.TimeoutError:
+                    raise ValkyrieTimeoutError("Timed out waiting for a pooled connection")
+
+        try:
+            return await self._create_connection()
+        except BaseException:
+            self._size -= 1
+            async with self._condition:
+                self._condition.notify()
+            raise
+
+    async def release(self, connection: AsyncTCPConnection, discard: bool = False) -> None:
+        if discard or self._closed or not connection.is_connected:
+            await self._discard(connection)
+        else:
+            self._idle.append(connection)
+
+        async with self._condition:
+            self._condition.notify()
+
+    @asynccontextmanager
+    async def connection(self, timeout: Optional[float] = None) -> AsyncIterator[AsyncTCPConnection]:
+        connection = await self.acquire(timeout)
+        try:
+            yield connection
+        except (ValkyrieRequestError, ValkyrieServerError):
+            await self.release(connection)
+            raise
+        except BaseException:
+            # Includes cancellation: a half-read frame leaves the stream unusable.
+            await self.release(connection, discard=True)
+            raise
+        else:
+            await self.release(connection)
+
+    async def _discard(self, connection: AsyncTCPConnection) -> None:
+        self._size -= 1
+        await connection.disconnect()
+
+    async def _create_connection(self) -> AsyncTCPConnection:
+        breaker = self.breaker
+        if breaker is not None:
+            breaker.allow()
+        connection = AsyncTCPConnection(self.host, self.port, options=self.options)
+        try:
+            await connection.connect()
+            await AsyncAuthHandler(connection).authenticate(self.password)
+        except BaseException as e:
+            await connection.disconnect()
+            if breaker is not None:
+                # A refused password still means the server is up.
+                if isinstance(e, ValkyrieAuthError):
+                    breaker.record_success()
+                elif isinstance(e, Exception):
+                    breaker.record_failure()
+                else:
+                    # Cancelled or interrupted: nothing was learned about the server.
+                    breaker.abandon()
+            raise
+        if breaker is not None:
+            breaker.record_success()
+        return connection
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+    @property
+    def has_capacity(self) -> bool:
+        """Whether a connection can be checked out now without waiting for one to be released."""
+        return bool(self._idle) or self._size < self.max_size
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
@@ -1,42 +1,73 @@
 import struct
 from .connection import TCPConnection
+from .async_connection import AsyncTCPConnection
 from ..protocol.types import Status
 from ..exceptions.errors import ValkyrieAuthError
 
 
+MAX_AUTH_ATTEMPTS = 3
+
+
+def _auth_packet(password: str) -> bytes:
+    password_bytes = password.encode('utf-8')
+    return struct.pack('<I', len(password_bytes)) + password_bytes
+
+
+def _auth_status(response_data: bytes) -> Status:
+    if len(response_data) < 5:
+        raise ValkyrieAuthError("Invalid auth response")
+
+    return Status(response_data[4])
+
+
+def _check_auth_status(status: Status, attempt: int) -> bool:
+    if status == Status.OK:
+        return True
+    elif status == Status.UNAUTHORIZED:
+        if attempt == MAX_AUTH_ATTEMPTS - 1:
+            raise ValkyrieAuthError("Authentication failed: Invalid password")
+        return False
+    else:
+        raise ValkyrieAuthError(f"Authentication failed: Unexpected status {status}")
+
+
 class AuthHandler:
     def __init__(self, connection: TCPConnection):
         self.connection = connection
 
     def authenticate(self, password: str) -> None:
-        max_attempts = 3
-
-        for attempt in range(max_attempts):
+        for attempt in range(MAX_AUTH_ATTEMPTS):
             try:
-                password_bytes = password.encode('utf-8')
-                auth_packet = struct.pack('<I', len(password_bytes)) + password_bytes
-                self.connection.send(auth_packet)
+                self.connection.send(_auth_packet(password))
                 response_data = self.connection.receive(5)
 
-                if len(response_data) < 5:
-                    raise ValkyrieAuthError("Invalid auth response")
+                if _check_auth_status(_auth_status(response_data), attempt):
+                    return
+
+            except ValkyrieAuthError:
+                raise
+            except Exception as e:
+                raise ValkyrieAuthError(f"Authentication error: {e}")
+
+        raise ValkyrieAuthError("Authentication failed after maximum attempts")
 
-                response_length = struct.unpack('<I', response_data[:4])[0]
-                status = Status(response_data[4])
 
+class AsyncAuthHandler:
+    def __init__(self, connection: AsyncTCPConnection):
+        self.connection = connection
+
+    async def authenticate(self, password: str) -> None:
+        for attempt in range(MAX_AUTH_ATTEMPTS):
+            try:
+                await self.connection.send(_auth_packet(password))
+                response_data = await self.connection.receive(5)
 
-                if status == Status.OK:
+                if _check_auth_status(_auth_status(response_data), attempt):
                     return
-                elif status == Status.UNAUTHORIZED:
-                    if attempt == max_attempts - 1:
-                        raise ValkyrieAuthError("Authentication failed: Invalid password")
-                    continue
-                else:
-                    raise ValkyrieAuthError(f"Authentication failed: Unexpected status {status}")
 
             except ValkyrieAuthError:
                 raise
             except Exception as e:
                 raise ValkyrieAuthError(f"Authentication error: {e}")
 
-        raise ValkyrieAuthError("Authentication failed after maximum attempts")
\ No newline at end of file
+        raise ValkyrieAuthError("Authentication failed after maximum attempts")
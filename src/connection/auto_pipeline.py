@@ -0,0 +1,135 @@
+import asyncio
+from collections import deque
+from typing import Deque, List, Optional, Sequence, Union
+
+from .async_connection import AsyncTCPConnection
+from ..exceptions.errors import ValkyrieConnectionError, ValkyrieError, ValkyrieTimeoutError
+
+
+class AutoPipelineConnection:
+    """Shares one connection between coroutines, coalescing their requests.
+
+    Requests submitted during the same event-loop iteration are written to the
+    socket in a single call. The server answers in order, so a background
+    reader resolves the waiting futures first-in, first-out.
+    """
+
+    def __init__(self, connection: AsyncTCPConnection):
+        self.connection = connection
+        self.flush_count = 0
+
+        self._buffers: List[Union[bytes, bytearray, memoryview]] = []
+        self._queued: List[asyncio.Future] = []
+        self._in_flight: Deque[asyncio.Future] = deque()
+        self._sent: Optional[asyncio.Event] = None
+        self._flush_scheduled = False
+        self._reader_task: Optional[asyncio.Task] = None
+        self._error: Optional[ValkyrieError] = None
+
+    def start(self) -> None:
+        self._sent = asyncio.Event()
+        self._reader_task = asyncio.get_running_loop().create_task(self._read_loop())
+
+    async def request(self, request_buffers: Sequence[Union[bytes, bytearray, memoryview]]) -> bytes:
+        if self._error is not None:
+            raise self._error
+
+        # Honour transport back-pressure before queueing more data.
+        await self.connection.drain()
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._buffers.extend(request_buffers)
+        self._queued.append(future)
+
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            loop.call_soon(self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        if not self._buffers or self._error is not None:
+            return
+
+        buffers = self._buffers
+        # A cancelled caller keeps its slot: its response still arrives and is dropped.
+        self._in_flight.extend(self._queued)
+        self._buffers = []
+        self._queued = []
+        if self._sent is not None:
+            self._sent.set()
+
+        try:
+            self.connection.write_buffers(buffers)
+            self.flush_count += 1
+        except ValkyrieError as e:
+            self._fail(e)
+
+    async def _read_loop(self) -> None:
+        try:
+            while True:
+                if self._in_flight:
+                    response_bytes = await self.connection.receive_response()
+                else:
+                    response_bytes = await self._receive_idle()
+                if not self._in_flight:
+                    raise ValkyrieConnectionError("Unexpected response from server")
+                future = self._in_flight.popleft()
+                if not future.done():
+                    future.set_result(response_bytes)
+        except asyncio.CancelledError:
+            self._fail(ValkyrieConnectionError("Connection closed"))
+            raise
+        except ValkyrieError as e:
+            self._fail(e)
+        except Exception as e:
+            self._fail(ValkyrieConnectionError(f"Communication error: {e}"))
+
+    async def _receive_idle(self) -> bytes:
+        """Read the next frame, applying the read timeout only once a flush puts requests in flight.
+
+        The read starts straight away so a connection the server closes while
+        idle is noticed before the next request is written to it.
+        """
+        self._sent.clear()
+        frame = asyncio.ensure_future(self.connection.receive_response(idle=True))
+        sent = asyncio.ensure_future(self._sent.wait())
+        try:
+            await asyncio.wait((frame, sent), return_when=asyncio.FIRST_COMPLETED)
+            if frame.done():
+                return frame.result()
+            try:
+                return await asyncio.wait_for(frame, self.connection.options.read_timeout)
+            except asyncio.TimeoutError:
+                raise ValkyrieTimeoutError("Timed out receiving data")
+        finally:
+            sent.cancel()
+            frame.cancel()
+
+    def _fail(self, error: ValkyrieError) -> None:
+        if self._error is None:
+            self._error = error
+
+        futures = list(self._in_flight) + self._queued
+        self._in_flight.clear()
+        self._buffers = []
+        self._queued = []
+        for future in futures:
+            if not future.done():
+                future.set_exception(error)
+
+    async def close(self) -> None:
+        if self._reader_task is not None and not self._reader_task.done():
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+        self._fail(ValkyrieConnectionError("Connection closed"))
+        await self.connection.disconnect()
+
+    @property
+    def closed(self) -> bool:
+        return self._error is not None
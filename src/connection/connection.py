@@ -1,66 +1,218 @@
+import select
 import socket
 import struct
+from typing import List, Optional, Sequence, Union
 
-from ..exceptions.errors import ValkyrieConnectionError
+from .deadline import timeout_for
+from .options import ConnectionOptions
+from ..exceptions.errors import ValkyrieConnectionError, ValkyrieTimeoutError
+
+
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+# Buffers smaller than this are coalesced before sending; larger ones go out
+# as their own iovec so they are never copied.
+SCATTER_MIN_SIZE = 16 * 1024
+MAX_IOVECS = 1024
 
 
 class TCPConnection:
-    def __init__(self, host: str, port: int):
+    """Blocking connection to one server.
+
+    Sends and receives are bounded by the options' ``read_timeout`` and by the
+    ``deadline`` (a ``time.monotonic()`` value) passed to each call, whichever
+    comes first, and raise ``ValkyrieTimeoutError`` when it runs out. A timeout
+    can leave a frame half-sent or half-read, so the connection must then be
+    discarded.
+    """
+
+    def __init__(self, host: str, port: int, buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 options: Optional[ConnectionOptions] = None):
         self.host = host
         self.port = port
+        self.options = options or ConnectionOptions()
         self.socket = None
         self.connected = False
+        self._timeout: Optional[float] = None
+
+        # Read-ahead buffer: bytes in [_start, _end) have been received but not consumed.
+        self._buffer = bytearray(buffer_size)
+        self._view = memoryview(self._buffer)
+        self._start = 0
+        self._end = 0
 
     def connect(self) -> None:
+        options = self.options
         try:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            options.configure(self.socket)
+            if options.connect_timeout is not None:
+                self.socket.settimeout(options.connect_timeout)
             self.socket.connect((self.host, self.port))
+            if options.connect_timeout != options.read_timeout:
+                self.socket.settimeout(options.read_timeout)
+            self._timeout = options.read_timeout
         except Exception as e:
             if self.socket:
                 self.socket.close()
                 self.socket = None
+            if isinstance(e, socket.timeout):
+                raise ValkyrieTimeoutError(f"Timed out connecting to {self.host}:{self.port}")
             raise ValkyrieConnectionError(f"Failed to connect to {self.host}:{self.port}")
 
-    def send(self, data: bytes) -> None:
+    def _set_timeout(self, deadline: Optional[float]) -> None:
+        timeout = timeout_for(deadline, self.options.read_timeout)
+        if timeout != self._timeout:
+            self.socket.settimeout(timeout)
+            self._timeout = timeout
+
+    def send(self, data: bytes, deadline: Optional[float] = None) -> None:
         if not self.socket:
             raise ValkyrieConnectionError("Not connected")
 
+        self._set_timeout(deadline)
         try:
             self.socket.sendall(data)
+        except socket.timeout:
+            raise ValkyrieTimeoutError("Timed out sending data")
+        except Exception as e:
+            raise ValkyrieConnectionError(f"Failed to send data: {e}")
+
+    def send_buffers(self, buffers: Sequence[Union[bytes, bytearray, memoryview]],
+                     deadline: Optional[float] = None) -> None:
+        if not self.socket:
+            raise ValkyrieConnectionError("Not connected")
+
+        views = self._coalesce(buffers)
+        self._set_timeout(deadline)
+        try:
+            if len(views) == 1 or not hasattr(socket.socket, 'sendmsg'):
+                for view in views:
+                    self.socket.sendall(view)
+                return
+
+            index = 0
+            while index < len(views):
+                sent = self.socket.sendmsg(views[index:index + MAX_IOVECS])
+                while sent:
+                    size = views[index].nbytes
+                    if sent >= size:
+                        sent -= size
+                        index += 1
+                    else:
+                        views[index] = views[index][sent:]
+                        sent = 0
+        except socket.timeout:
+            raise ValkyrieTimeoutError("Timed out sending data")
         except Exception as e:
             raise ValkyrieConnectionError(f"Failed to send data: {e}")
 
-    def receive(self, length: int) -> bytes:
+    @staticmethod
+    def _coalesce(buffers: Sequence[Union[bytes, bytearray, memoryview]]) -> List[memoryview]:
+        views: List[memoryview] = []
+        small: List[Union[bytes, bytearray, memoryview]] = []
+
+        for buffer in buffers:
+            view = memoryview(buffer).cast('B')
+            if view.nbytes >= SCATTER_MIN_SIZE:
+                if small:
+                    views.append(memoryview(b''.join(small)))
+                    small = []
+                views.append(view)
+            elif view.nbytes:
+                small.append(view)
+
+        if small:
+            views.append(memoryview(b''.join(small)))
+        return views
+
+    def receive(self, length: int, deadline: Optional[float] = None) -> Union[bytes, bytearray]:
         if not self.socket:
             raise ValkyrieConnectionError("Not connected")
 
-        data = b''
-        while len(data) < length:
-            try:
-                chunk = self.socket.recv(length - len(data))
-                if not chunk:
-                    raise ValkyrieConnectionError("Connection closed by server")
-                data += chunk
-            except Exception as e:
-                raise ValkyrieConnectionError(f"Failed to receive data: {e}")
+        if length > len(self._buffer):
+            return self._receive_large(length, deadline)
 
+        if self._end - self._start < length:
+            self._fill(length, deadline)
+
+        data = bytes(self._view[self._start:self._start + length])
+        self._consume(length)
         return data
 
-    def receive_response(self) -> bytes:
-        length_data = self.receive(4)
+    def receive_response(self, deadline: Optional[float] = None) -> Union[bytes, bytearray]:
+        length_data = self.receive(4, deadline)
 
         response_length = struct.unpack('<I', length_data)[0]
 
-        return self.receive(response_length)
+        return self.receive(response_length, deadline)
+
+    def _fill(self, minimum: int, deadline: Optional[float]) -> None:
+        if self._start and len(self._buffer) - self._start < minimum:
+            pending = self._end - self._start
+            self._buffer[:pending] = self._view[self._start:self._end]
+            self._start = 0
+            self._end = pending
+
+        # Read as much as the kernel has, so a small frame usually costs one syscall.
+        while self._end - self._start < minimum:
+            self._end += self._recv_into(self._view[self._end:], deadline)
+
+    def _receive_large(self, length: int, deadline: Optional[float]) -> bytearray:
+        # Frames larger than the read-ahead buffer are received straight into
+        # their own exact-size buffer instead of being copied through ours.
+        data = bytearray(length)
+        view = memoryview(data)
+        received = min(self._end - self._start, length)
+        view[:received] = self._view[self._start:self._start + received]
+        self._consume(received)
+
+        while received < length:
+            received += self._recv_into(view[received:], deadline)
+
+        return data
+
+    def _recv_into(self, view: memoryview, deadline: Optional[float]) -> int:
+        self._set_timeout(deadline)
+        try:
+            count = self.socket.recv_into(view, len(view))
+        except socket.timeout:
+            raise ValkyrieTimeoutError("Timed out receiving data")
+        except Exception as e:
+            raise ValkyrieConnectionError(f"Failed to receive data: {e}")
+        if not count:
+            raise ValkyrieConnectionError("Connection closed by server")
+        return count
+
+    def _consume(self, length: int) -> None:
+        self._start += length
+        if self._start == self._end:
+            self._start = 0
+            self._end = 0
 
     @property
     def is_connected(self) -> bool:
         return self.socket is not None
 
+    def is_alive(self) -> bool:
+        if not self.socket or self._end > self._start:
+            return False
+
+        # An idle connection must have nothing to read: readable means either
+        # the peer closed it or stray bytes would desynchronise the next frame.
+        try:
+            readable, _, _ = select.select([self.socket], [], [], 0)
+        except Exception:
+            return False
+        return not readable
+
     def disconnect(self) -> None:
         if self.socket:
             self.socket.close()
             self.socket = None
+        self._timeout = None
+        self._start = 0
+        self._end = 0
 
     def __enter__(self):
         self.connect()
@@ -0,0 +1,51 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from ..exceptions.errors import ValkyrieTimeoutError
+
+
+_deadline: ContextVar[Optional[float]] = ContextVar('valkyrie_deadline', default=None)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[float]:
+    """Require every request made inside the block to finish within ``seconds``.
+
+    Works in threads and asyncio tasks alike. A nested block can shorten the
+    deadline but never extend it. Requests that run out of time raise
+    ``ValkyrieTimeoutError``.
+    """
+    at = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        at = min(at, outer)
+    token = _deadline.set(at)
+    try:
+        yield at
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline(timeout: Optional[float] = None) -> Optional[float]:
+    """The ``time.monotonic()`` deadline for a request starting now, if any.
+
+    ``timeout`` is a default allowance that applies alongside any deadline set
+    with ``deadline()``; the earlier of the two wins.
+    """
+    at = _deadline.get()
+    if timeout is not None:
+        default = time.monotonic() + timeout
+        at = default if at is None else min(at, default)
+    return at
+
+
+def timeout_for(deadline: Optional[float], timeout: Optional[float] = None) -> Optional[float]:
+    """``timeout`` capped at the seconds left until ``deadline``; raises once it has passed."""
+    if deadline is None:
+        return timeout
+    left = deadline - time.monotonic()
+    if left <= 0:
+        raise ValkyrieTimeoutError("Deadline exceeded")
+    return left if timeout is None else min(timeout, left)
@@ -0,0 +1,79 @@
+import hashlib
+import zlib
+from bisect import bisect
+from typing import Iterable, List
+
+from ..exceptions.errors import ValkyrieConnectionError
+
+
+DEFAULT_VNODES = 160
+
+
+def hash_key(key: str) -> str:
+    """Return the part of ``key`` that decides its shard.
+
+    A non-empty ``{tag}`` (the first ``{`` and the first ``}`` after it) is
+    hashed instead of the whole key, so ``user:{42}:name`` and
+    ``user:{42}:email`` always land on the same node.
+    """
+    start = key.find('{')
+    if start != -1:
+        end = key.find('}', start + 1)
+        if end > start + 1:
+            return key[start + 1:end]
+    return key
+
+
+def _point(label: str) -> int:
+    # Ring points are placed once, so they can afford md5's better spread.
+    return int.from_bytes(hashlib.md5(label.encode('utf-8')).digest()[:4], 'big')
+
+
+class HashRing:
+    """Consistent-hash ring mapping keys to node names.
+
+    Each node owns ``vnodes`` points on a 32-bit ring and a key belongs to the
+    first point at or after its hash, so adding or removing one of N nodes
+    only moves about 1/N of the keys.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = DEFAULT_VNODES):
+        if vnodes < 1:
+            raise ValueError("vnodes must be at least 1")
+        self.vnodes = vnodes
+        self._nodes: List[str] = []
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node: str) -> None:
+        if node in self._nodes:
+            raise ValueError(f"Node {node!r} is already on the ring")
+        self._nodes.append(node)
+        self._rebuild()
+
+    def remove(self, node: str) -> None:
+        self._nodes.remove(node)
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        points = sorted((_point(f"{node}#{i}"), node) for node in self._nodes for i in range(self.vnodes))
+        self._points = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def node_for(self, key: str) -> str:
+        if not self._points:
+            raise ValkyrieConnectionError("No nodes on the hash ring")
+        index = bisect(self._points, zlib.crc32(hash_key(key).encode('utf-8')))
+        return self._owners[index % len(self._owners)]
+
+    @property
+    def nodes(self) -> List[str]:
+        return list(self._nodes)
+
+    def __contains__(self, node: str) -> bool:
+        return node in self._nodes
+
+    def __len__(self) -> int:
+        return len(self._nodes)
@@ -0,0 +1,91 @@
+import threading
+from collections import deque
+from typing import Deque, Dict
+
+
+class HedgePolicy:
+    """Decides when a slow read gets a second, hedged copy.
+
+    A read is hedged once it has waited longer than the ``percentile`` of
+    recently observed read latencies (clamped to ``min_delay``..``max_delay``
+    seconds; ``max_delay`` until ``min_samples`` reads have completed),
+    recomputed from the last ``window`` reads every ``window // 10``. The
+    hedge rate is capped by a token bucket: every read earns ``budget`` tokens
+    up to ``burst`` and every hedge spends one, so at most about ``budget`` of
+    reads are hedged even while a node is struggling.
+    """
+
+    def __init__(self, percentile: float = 95.0, min_delay: float = 0.001, max_delay: float = 0.1,
+                 budget: float = 0.05, burst: float = 10.0, window: int = 1000, min_samples: int = 20):
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100")
+        if not 0 <= min_delay <= max_delay:
+            raise ValueError("min_delay must be between 0 and max_delay")
+        if not 0 <= budget <= 1:
+            raise ValueError("budget must be between 0 and 1")
+
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.burst = burst
+        self.min_samples = min_samples
+
+        self.reads = 0
+        self.hedges_fired = 0
+        self.hedges_won = 0
+        self.hedges_denied = 0
+
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._stale = 0
+        self._refresh = max(1, window // 10)
+        self._delay = max_delay
+        self._tokens = burst
+        self._lock = threading.Lock()
+
+    def next_delay(self) -> float:
+        """Count a read and return how long it may take before it is hedged."""
+        with self._lock:
+            self.reads += 1
+            self._tokens = min(self._tokens + self.budget, self.burst)
+            return self._delay
+
+    def record(self, latency: float) -> None:
+        """Report how long a completed read took."""
+        with self._lock:
+            self._samples.append(latency)
+            self._stale += 1
+            # Sorting the window on every read would cost more than the read.
+            count = len(self._samples)
+            if count == self.min_samples or (self._stale >= self._refresh and count >= self.min_samples):
+                self._stale = 0
+                ordered = sorted(self._samples)
+                value = ordered[min(int(count * self.percentile / 100), count - 1)]
+                self._delay = min(max(value, self.min_delay), self.max_delay)
+
+    def try_hedge(self) -> bool:
+        """Spend a token for a hedge, or return False if the budget is used up."""
+        with self._lock:
+            if self._tokens < 1:
+                self.hedges_denied += 1
+                return False
+            self._tokens -= 1
+            self.hedges_fired += 1
+            return True
+
+    def hedge_won(self) -> None:
+        with self._lock:
+            self.hedges_won += 1
+
+    @property
+    def delay(self) -> float:
+        return self._delay
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            'reads': self.reads,
+            'hedges_fired': self.hedges_fired,
+            'hedges_won': self.hedges_won,
+            'hedges_denied': self.hedges_denied,
+        }
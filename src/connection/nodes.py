@@ -0,0 +1,15 @@
+from typing import Tuple, Union
+
+
+Node = Union[str, Tuple[str, int]]
+
+
+def parse_node(node: Node) -> Tuple[str, int]:
+    """Accept ``"host:port"`` or ``(host, port)``."""
+    if isinstance(node, str):
+        host, _, port = node.rpartition(':')
+        if not host:
+            raise ValueError(f"Node {node!r} must be 'host:port'")
+        return host, int(port)
+    host, port = node
+    return host, int(port)
@@ -0,0 +1,60 @@
+import socket
+from typing import Optional
+
+
+class ConnectionOptions:
+    """Timeouts and socket options for every connection a client opens.
+
+    ``connect_timeout`` bounds the TCP handshake and ``read_timeout`` each send
+    and receive on an established connection, in seconds (None waits forever).
+    ``request_timeout`` gives every request a deadline unless a tighter one is
+    set with ``deadline()``. ``TCP_NODELAY`` is on by default: requests are
+    written whole, so Nagle's algorithm only delays them. Keepalive probes find
+    peers that vanished without closing; the ``keepalive_*`` settings are
+    applied where the platform supports them. Buffer sizes of None keep the
+    kernel's defaults.
+    """
+
+    def __init__(self, connect_timeout: Optional[float] = None, read_timeout: Optional[float] = None,
+                 request_timeout: Optional[float] = None, tcp_nodelay: bool = True,
+                 keepalive: bool = False, keepalive_idle: Optional[int] = None,
+                 keepalive_interval: Optional[int] = None, keepalive_count: Optional[int] = None,
+                 send_buffer_size: Optional[int] = None, receive_buffer_size: Optional[int] = None):
+        for name, value in (('connect_timeout', connect_timeout), ('read_timeout', read_timeout),
+                            ('request_timeout', request_timeout)):
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive")
+        for name, value in (('keepalive_idle', keepalive_idle), ('keepalive_interval', keepalive_interval),
+                            ('keepalive_count', keepalive_count), ('send_buffer_size', send_buffer_size),
+                            ('receive_buffer_size', receive_buffer_size)):
+            if value is not None and value < 1:
+                raise ValueError(f"{name} must be at least 1")
+
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.request_timeout = request_timeout
+        self.tcp_nodelay = tcp_nodelay
+        self.keepalive = keepalive
+        self.keepalive_idle = keepalive_idle
+        self.keepalive_interval = keepalive_interval
+        self.keepalive_count = keepalive_count
+        self.send_buffer_size = send_buffer_size
+        self.receive_buffer_size = receive_buffer_size
+
+    def configure(self, sock: socket.socket) -> None:
+        """Apply the socket options; call before connecting so the buffer sizes shape the TCP window."""
+        if self.send_buffer_size is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer_size)
+        if self.receive_buffer_size is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.receive_buffer_size)
+        if self.tcp_nodelay:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self.keepalive:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            # macOS names the idle time TCP_KEEPALIVE.
+            idle = getattr(socket, 'TCP_KEEPIDLE', getattr(socket, 'TCP_KEEPALIVE', None))
+            for option, value in ((idle, self.keepalive_idle),
+                                  (getattr(socket, 'TCP_KEEPINTVL', None), self.keepalive_interval),
+                                  (getattr(socket, 'TCP_KEEPCNT', None), self.keepalive_count)):
+                if option is not None and value is not None:
+                    sock.setsockopt(socket.IPPROTO_TCP, option, value)
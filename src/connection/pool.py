@@ -0,0 +1,222 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Deque, Iterator, List, Optional, Tuple
+
+from .auth import AuthHandler
+from .connection import TCPConnection
+from .options import ConnectionOptions
+from .retry import CircuitBreaker
+from ..exceptions.errors import (
+    ValkyrieAuthError, ValkyrieConnectionError, ValkyrieRequestError, ValkyrieServerError, ValkyrieTimeoutError
+)
+
+
+class ConnectionPool:
+    """Thread-safe pool of authenticated connections to a single server."""
+
+    def __init__(self, host: str, port: int, password: str = '',
+                 min_size: int = 1, max_size: int = 1,
+                 timeout: Optional[float] = None,
+                 idle_timeout: Optional[float] = None,
+                 health_check_interval: Optional[float] = 30.0,
+                 options: Optional[ConnectionOptions] = None,
+                 breaker: Optional[CircuitBreaker] = None):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if not 0 <= min_size <= max_size:
+            raise ValueError("min_size must be between 0 and max_size")
+
+        self.host = host
+        self.port = port
+        self.password = password
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.options = options
+        self.breaker = breaker
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+
+        self._idle: Deque[Tuple[TCPConnection, float]] = deque()
+        self._size = 0
+        self._condition = threading.Condition()
+        self._closed = True
+
+    def open(self) -> None:
+        with self._condition:
+            self._closed = False
+            count = self.min_size - self._size
+            self._size += max(count, 0)
+
+        if count <= 0:
+            return
+
+        # Warm up in parallel so startup costs one handshake, not min_size of them.
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            futures = [executor.submit(self._create_connection) for _ in range(count)]
+
+        connections: List[TCPConnection] = []
+        error = None
+        for future in futures:
+            try:
+                connections.append(future.result())
+            except Exception as e:
+                error = e
+
+        if error is not None:
+            for connection in connections:
+                connection.disconnect()
+            with self._condition:
+                self._size -= count
+                self._condition.notify_all()
+            raise error
+
+        now = time.monotonic()
+        with self._condition:
+            self._idle.extend((connection, now) for connection in connections)
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            while self._idle:
+                connection, _ = self._idle.popleft()
+                connection.disconnect()
+                self._size -= 1
+            self._condition.notify_all()
+
+    def purge(self) -> None:
+        """Close the idle connections, which a failure on one suggests are broken too."""
+        with self._condition:
+            while self._idle:
+                connection, _ = self._idle.popleft()
+                self._discard(connection)
+            self._condition.notify_all()
+
+    def acquire(self, timeout: Optional[float] = None) -> TCPConnection:
+        if timeout is None:
+            timeout = self.timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise ValkyrieConnectionError("Connection pool is closed")
+
+                while self._idle:
+                    # LIFO keeps a hot working set and lets surplus connections age out.
+                    connection, last_used = self._idle.pop()
+                    if self._is_healthy(connection, last_used):
+                        return connection
+                    self._discard(connection)
+
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise ValkyrieTimeoutError("Timed out waiting for a pooled connection")
+                self._condition.wait(remaining)
+
+        try:
+            return self._create_connection()
+        except BaseException:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, connection: TCPConnection, discard: bool = False) -> None:
+        with self._condition:
+            if discard or self._closed or not connection.is_connected:
+                self._discard(connection)
+            else:
+                self._idle.append((connection, time.monotonic()))
+                self._evict_idle()
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[TCPConnection]:
+        connection = self.acquire(timeout)
+        try:
+            yield connection
+        except (ValkyrieRequestError, ValkyrieServerError):
+            # Error statuses arrive in complete frames, so the stream is still in sync.
+            self.release(connection)
+            raise
+        except BaseException:
+            self.release(connection, discard=True)
+            raise
+        else:
+            self.release(connection)
+
+    def evict_idle(self) -> None:
+        with self._condition:
+            self._evict_idle()
+
+    def _evict_idle(self) -> None:
+        if self.idle_timeout is None:
+            return
+
+        cutoff = time.monotonic() - self.idle_timeout
+        while self._idle and self._size > self.min_size and self._idle[0][1] < cutoff:
+            connection, _ = self._idle.popleft()
+            self._discard(connection)
+
+    def _discard(self, connection: TCPConnection) -> None:
+        connection.disconnect()
+        self._size -= 1
+
+    def _is_healthy(self, connection: TCPConnection, last_used: float) -> bool:
+        if not connection.is_connected:
+            return False
+        if self.health_check_interval is None:
+            return True
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        return connection.is_alive()
+
+    def _create_connection(self) -> TCPConnection:
+        breaker = self.breaker
+        if breaker is not None:
+            breaker.allow()
+        connection = TCPConnection(self.host, self.port, options=self.options)
+        try:
+            connection.connect()
+            AuthHandler(connection).authenticate(self.password)
+        except BaseException as e:
+            connection.disconnect()
+            if breaker is not None:
+                # A refused password still means the server is up.
+                if isinstance(e, ValkyrieAuthError):
+                    breaker.record_success()
+                elif isinstance(e, Exception):
+                    breaker.record_failure()
+                else:
+                    # Cancelled or interrupted: nothing was learned about the server.
+                    breaker.abandon()
+            raise
+        if breaker is not None:
+            breaker.record_success()
+        return connection
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+    @property
+    def has_capacity(self) -> bool:
+        """Whether a connection can be checked out now without waiting for one to be released."""
+        return bool(self._idle) or self._size < self.max_size
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
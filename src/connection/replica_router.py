@@ -0,0 +1,139 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, List, Optional
+
+
+_primary_reads: ContextVar[bool] = ContextVar('valkyrie_primary_reads', default=False)
+
+
+@contextmanager
+def primary_reads() -> Iterator[None]:
+    """Send every read made inside the block to the primary instead of a replica.
+
+    Replicas apply writes after the primary does, so a replica read can be
+    stale. Use this where a read must see earlier writes, or where a write
+    depends on what was read. Works in threads and asyncio tasks alike.
+    """
+    token = _primary_reads.set(True)
+    try:
+        yield
+    finally:
+        _primary_reads.reset(token)
+
+
+def reads_on_primary() -> bool:
+    """Whether the current thread or task is inside ``primary_reads()``."""
+    return _primary_reads.get()
+
+
+class ReplicaRouter:
+    """Chooses a replica for each read by observed latency.
+
+    Every replica keeps an exponentially weighted moving average of its
+    response times. A read samples two healthy replicas at random and takes
+    the one with the lower average scaled by its reads in flight (the "power
+    of two choices"), which avoids herding onto a single fastest replica.
+
+    A replica is demoted for ``demote_seconds`` when its average exceeds
+    ``demote_ratio`` times the fastest healthy replica's (and is at least
+    ``demote_margin`` seconds slower), or straight away when it fails. It comes
+    back with no latency history, so its first reads probe it again. ``choose``
+    returns None when every replica is demoted.
+
+    Replicas may lag behind the primary, so routed reads can be stale; reads
+    that must not be go to the primary through ``primary_reads()``.
+    """
+
+    def __init__(self, count: int, alpha: float = 0.2, demote_ratio: float = 3.0,
+                 demote_margin: float = 0.001, demote_seconds: float = 5.0,
+                 clock: Callable[[], float] = time.monotonic, rng: Optional[random.Random] = None):
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+
+        self.count = count
+        self.alpha = alpha
+        self.demote_ratio = demote_ratio
+        self.demote_margin = demote_margin
+        self.demote_seconds = demote_seconds
+        self.demotions = 0
+        self._clock = clock
+        self._random = rng or random.Random()
+
+        self._latency: List[Optional[float]] = [None] * count
+        self._pending = [0] * count
+        self._demoted_until = [0.0] * count
+        self._lock = threading.Lock()
+
+    def choose(self, exclude: Optional[int] = None) -> Optional[int]:
+        """Pick a replica other than ``exclude`` and count a read against it.
+
+        Report the outcome through ``record`` or ``failed``.
+        """
+        now = self._clock()
+        with self._lock:
+            healthy = [i for i in range(self.count) if self._demoted_until[i] <= now and i != exclude]
+            if not healthy:
+                return None
+            if len(healthy) == 1:
+                index = healthy[0]
+            else:
+                first, second = self._random.sample(healthy, 2)
+                index = first if self._score(first) <= self._score(second) else second
+            self._pending[index] += 1
+            return index
+
+    def _score(self, index: int) -> float:
+        latency = self._latency[index]
+        # Replicas without history score zero, so they are tried first.
+        return 0.0 if latency is None else latency * (self._pending[index] + 1)
+
+    def record(self, index: int, latency: float) -> None:
+        """Report a completed read that took ``latency`` seconds."""
+        now = self._clock()
+        with self._lock:
+            self._pending[index] = max(self._pending[index] - 1, 0)
+            average = self._latency[index]
+            average = latency if average is None else average + self.alpha * (latency - average)
+            self._latency[index] = average
+
+            fastest = min(
+                (self._latency[i] for i in range(self.count)
+                 if i != index and self._latency[i] is not None and self._demoted_until[i] <= now),
+                default=None
+            )
+            if fastest is not None and average > self.demote_ratio * fastest and \
+                    average - fastest > self.demote_margin:
+                self._demote(index, now)
+
+    def release(self, index: int) -> None:
+        """Give back a replica chosen for a read that was never sent."""
+        with self._lock:
+            self._pending[index] = max(self._pending[index] - 1, 0)
+
+    def failed(self, index: int) -> None:
+        """Report a read that could not be completed; the replica is demoted."""
+        now = self._clock()
+        with self._lock:
+            self._pending[index] = max(self._pending[index] - 1, 0)
+            self._demote(index, now)
+
+    def demote(self, index: int) -> None:
+        now = self._clock()
+        with self._lock:
+            self._demote(index, now)
+
+    def _demote(self, index: int, now: float) -> None:
+        self._demoted_until[index] = now + self.demote_seconds
+        self._latency[index] = None
+        self.demotions += 1
+
+    def latency(self, index: int) -> Optional[float]:
+        return self._latency[index]
+
+    def is_demoted(self, index: int) -> bool:
+        return self._demoted_until[index] > self._clock()
@@ -0,0 +1,114 @@
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+from ..exceptions.errors import ValkyrieCircuitOpenError, ValkyrieConnectionError, ValkyrieTimeoutError
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether ``error`` means the connection broke, so a replay could succeed.
+
+    Timeouts are final: the server may still be working on the request, and
+    the deadline or read timeout is the caller's bound on latency. An open
+    circuit exists to fail fast.
+    """
+    return (isinstance(error, ValkyrieConnectionError) and
+            not isinstance(error, (ValkyrieTimeoutError, ValkyrieCircuitOpenError)))
+
+
+class RetryPolicy:
+    """How idempotent requests are replayed after their connection fails.
+
+    A request is replayed up to ``retries`` times. The first replay goes out
+    straight away on a fresh connection, because the usual cause is a
+    connection the server closed while it sat idle. Later replays wait a
+    random delay between zero and ``base_delay * 2 ** (n - 1)``, capped at
+    ``max_delay`` ("full jitter"), so clients reconnecting to a restarted
+    server do not all arrive at once.
+    """
+
+    def __init__(self, retries: int = 3, base_delay: float = 0.05, max_delay: float = 2.0,
+                 rng: Optional[random.Random] = None):
+        if retries < 0:
+            raise ValueError("retries must not be negative")
+        if not 0 <= base_delay <= max_delay:
+            raise ValueError("base_delay must be between 0 and max_delay")
+
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._random = rng or random.Random()
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to wait before replay number ``attempt``, counting from 0."""
+        if attempt == 0:
+            return 0.0
+        return self._random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+DEFAULT_RETRY = RetryPolicy()
+
+
+class CircuitBreaker:
+    """Fails connection attempts fast while a server is down.
+
+    After ``threshold`` consecutive failed connection attempts the circuit
+    opens. While it is open, ``allow`` raises ``ValkyrieCircuitOpenError``
+    instead of letting callers queue up on connect timeouts. After
+    ``reset_timeout`` seconds one trial attempt is let through ("half-open").
+    If it succeeds the circuit closes; if it fails the circuit opens again.
+    """
+
+    def __init__(self, threshold: int = 5, reset_timeout: float = 5.0,
+                 clock: Callable[[], float] = time.monotonic):
+        if threshold < 1:
+            raise ValueError("threshold must be at least 1")
+
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.trips = 0
+        self._clock = clock
+
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> None:
+        """Raise if a connection attempt may not be made now."""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if self._probing or self._clock() - self._opened_at < self.reset_timeout:
+                raise ValkyrieCircuitOpenError("Circuit open: server is unavailable")
+            self._probing = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or (self._opened_at is None and self._failures >= self.threshold):
+                if self._opened_at is None:
+                    self.trips += 1
+                self._opened_at = self._clock()
+            self._probing = False
+
+    def abandon(self) -> None:
+        """Forget an attempt that was cancelled, so it counts neither way."""
+        with self._lock:
+            self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if self._probing or self._clock() - self._opened_at >= self.reset_timeout:
+                return 'half-open'
+            return 'open'
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from ..protocol.packet import RequestPacket
+from ..exceptions.errors import ValkyrieConnectionError, ValkyrieTimeoutError
+
+
+def flight_key(packet: RequestPacket) -> Optional[Tuple[Hashable, ...]]:
+    """Identify ``packet`` for coalescing, or return None if it must always be sent."""
+    if not packet.is_read_only:
+        return None
+    params = packet.params
+    if isinstance(params, (bytes, bytearray, memoryview)):
+        params = bytes(params)
+    else:
+        params = b''.join(params)
+    return (packet.composite, packet.primitive, packet.operation, packet.key, params,
+            packet.response_schema)
+
+
+class SingleFlight:
+    """Lets concurrent identical calls share one execution.
+
+    The first caller for a key runs the call; callers arriving while it is in
+    flight block and receive the same result or exception. Callers share the
+    returned object, so it must not be mutated.
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        """Run ``func`` or join the call in flight for ``key``.
+
+        ``timeout`` bounds how long a joining caller waits; the first caller's
+        ``func`` is expected to bound itself.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            try:
+                return future.result(timeout)
+            except FutureTimeoutError:
+                raise ValkyrieTimeoutError("Timed out waiting for a coalesced request")
+
+        try:
+            result = func()
+        except BaseException as e:
+            self._finish(key)
+            if isinstance(e, Exception):
+                future.set_exception(e)
+            else:
+                future.set_exception(ValkyrieConnectionError("Coalesced request was interrupted"))
+            raise
+        self._finish(key)
+        future.set_result(result)
+        return result
+
+    def _finish(self, key: Hashable) -> None:
+        # Forget the call before publishing its result so later callers send afresh.
+        with self._lock:
+            del self._calls[key]
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """Asyncio counterpart of ``SingleFlight``.
+
+    The call runs in its own task, so cancelling any one caller (including the
+    first) leaves the request running for the others.
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception retrieved in case every caller was cancelled.
+        if not task.cancelled():
+            task.exception()
+
+    def __len__(self) -> int:
+        return len(self._calls)
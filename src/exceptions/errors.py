@@ -1,5 +1,10 @@
+from typing import Optional
+
+from ..protocol.types import Status
+
+
 class ValkyrieError(Exception):
-    pass
+    status: Optional[Status] = None
 
 class ValkyrieConnectionError(ValkyrieError):
     pass
@@ -11,4 +16,34 @@ class ValkyrieServerError(ValkyrieError):
     pass
 
 class ValkyrieAuthError(ValkyrieError):
-    pass
\ No newline at end of file
+    pass
+
+class ValkyrieTimeoutError(ValkyrieConnectionError):
+    pass
+
+class ValkyrieCircuitOpenError(ValkyrieConnectionError):
+    pass
+
+
+
+def error_for_status(status: Status) -> ValkyrieError:
+    error_messages = {
+        Status.INVALID_REQUEST: "Invalid request",
+        Status.UNAVAILABLE_OPERATION: "Unavailable operation",
+        Status.UNAUTHORIZED: "Unauthorized access",
+        Status.NOT_FOUND: "Key not found",
+        Status.WRONG_TYPE: "Wrong data type",
+        Status.OUT_OF_RANGE: "Index out of range",
+        Status.INTERNAL_ERROR: "Internal server error"
+    }
+
+    message = error_messages.get(status, f"Unknown error (status: {status})")
+
+    if status in (Status.INVALID_REQUEST, Status.UNAVAILABLE_OPERATION):
+        error: ValkyrieError = ValkyrieRequestError(message)
+    elif status == Status.UNAUTHORIZED:
+        error = ValkyrieAuthError(message)
+    else:
+        error = ValkyrieServerError(message)
+    error.status = status
+    return error
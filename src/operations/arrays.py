@@ -1,34 +1,32 @@
 import struct
-from typing import Any, List
-from ..protocol.types import CompositeType, DataType, Operation
+from collections import deque
+from itertools import islice
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Optional, Sequence
+from ..protocol.types import CompositeType, DataType, Operation, ResponseSchema, Status
 from ..protocol.encoder import ProtocolEncoder
+from ..protocol.numpy_codec import decode_numeric_array, encode_numeric_array
 from ..protocol.packet import RequestPacket
+from ..exceptions.errors import ValkyrieError
+from .batch import send_sequentially
 
 
 class ArrayOperations:
-    def __init__(self, send_request_func):
+    def __init__(self, send_request_func, stream_request_func=None, stream_requests_func=None):
         self._send_request = send_request_func
+        self._stream_request = stream_request_func
+        self._stream_requests = stream_requests_func or (
+            lambda packets, window: send_sequentially(send_request_func, packets))
 
-    def slice(self, key: str, start: int, end: int) -> List[Any]:
+    def slice(self, key: str, start: int, end: int, lazy: bool = False) -> Sequence[Any]:
         params = struct.pack('<II', start, end)
-        packet = RequestPacket(CompositeType.ARRAY, DataType.STRING, Operation.SLICE, key, params)
+        schema = ResponseSchema.LAZY if lazy else None
+        packet = RequestPacket(CompositeType.ARRAY, DataType.STRING, Operation.SLICE, key, params,
+                               schema=schema)
         response = self._send_request(packet)
         return response.data if response.data else []
 
     def insert(self, key: str, index: int, values: List[Any]) -> None:
-        params = struct.pack('<I', index)
-
-        if values:
-            first_value_data_type = ProtocolEncoder.get_data_type(values[0])
-        else:
-            first_value_data_type = DataType.STRING  # Default fallback
-
-        for value in values:
-            value_bytes = ProtocolEncoder.encode_value(value)  # Only one return value
-            params += value_bytes
-
-        packet = RequestPacket(CompositeType.ARRAY, first_value_data_type, Operation.INSERT, key, params)
-        self._send_request(packet)
+        self._send_request(self._insert_packet(key, index, values))
 
     def remove(self, key: str, start: int, end: int) -> None:
         params = struct.pack('<II', start, end)
@@ -38,4 +36,125 @@ class ArrayOperations:
     def length(self, key: str) -> int:
         packet = RequestPacket(CompositeType.ARRAY, DataType.STRING, Operation.LEN, key)
         response = self._send_request(packet)
-        return response.data
\ No newline at end of file
+        return response.data
+
+    def insert_numpy(self, key: str, index: int, array: Any) -> None:
+        data_type, records = encode_numeric_array(array)
+        params = [struct.pack('<I', index), records]
+        packet = RequestPacket(CompositeType.ARRAY, data_type, Operation.INSERT, key, params)
+        self._send_request(packet)
+
+    def slice_numpy(self, key: str, start: int, end: int, dtype: Any = None) -> Any:
+        params = struct.pack('<II', start, end)
+        packet = RequestPacket(CompositeType.ARRAY, DataType.STRING, Operation.SLICE, key, params,
+                               schema=ResponseSchema.RAW)
+        response = self._send_request(packet)
+        return decode_numeric_array(response.data, dtype)
+
+    def iter_slice(self, key: str, start: int, end: int) -> Iterator[Any]:
+        """Yield the elements of a slice as they arrive instead of buffering the response."""
+        if self._stream_request is None:
+            return iter(self.slice(key, start, end))
+        params = struct.pack('<II', start, end)
+        packet = RequestPacket(CompositeType.ARRAY, DataType.STRING, Operation.SLICE, key, params)
+        return self._stream_request(packet)
+
+    def scan(self, key: str, page_size: int = 1000, prefetch: int = 1) -> Iterator[Any]:
+        """Iterate over the whole array a page at a time.
+
+        ``prefetch`` further pages are kept in flight while the caller works
+        through the current one. The length is read once up front; if the array
+        shrinks during the scan, iteration stops at the first short page.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        if prefetch < 0:
+            raise ValueError("prefetch must not be negative")
+        return self._scan(key, page_size, prefetch)
+
+    def _scan(self, key: str, page_size: int, prefetch: int) -> Iterator[Any]:
+        total = self.length(key)
+        done = False
+
+        def pages():
+            for start in range(0, total, page_size):
+                if done:
+                    return
+                params = struct.pack('<II', start, min(start + page_size, total))
+                yield RequestPacket(CompositeType.ARRAY, DataType.STRING, Operation.SLICE, key, params)
+
+        responses = self._stream_requests(pages(), prefetch + 1)
+        start = 0
+        try:
+            for response in responses:
+                end = min(start + page_size, total)
+                requested, start = end - start, end
+                if done:
+                    # Pages already in flight when the array shrank are read and dropped.
+                    continue
+                if isinstance(response, ValkyrieError):
+                    if response.status != Status.OUT_OF_RANGE:
+                        raise response
+                    done = True
+                    continue
+
+                page = response.data or []
+                if len(page) < requested:
+                    done = True
+                yield from page
+        finally:
+            responses.close()
+
+    def insert_bulk(self, key: str, index: int, values: Iterable[Any], chunk_size: int = 10000,
+                    window: int = 4, progress: Optional[Callable[[int], None]] = None) -> int:
+        """Insert any iterable in ``chunk_size`` pieces, pipelining up to ``window`` chunks.
+
+        Values are pulled lazily, so memory stays bounded by ``window`` encoded
+        chunks. Chunks are inserted at advancing indexes from ``index``;
+        ``progress`` is called with the running total as each one is
+        acknowledged. On the first failed chunk no further chunks are sent and
+        the error is raised once those already in flight are answered.
+        Returns the number of values inserted.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        sizes: Deque[int] = deque()
+        failed = False
+
+        def chunks():
+            iterator = iter(values)
+            offset = index
+            while not failed:
+                chunk = list(islice(iterator, chunk_size))
+                if not chunk:
+                    return
+                sizes.append(len(chunk))
+                yield self._insert_packet(key, offset, chunk)
+                offset += len(chunk)
+
+        inserted = 0
+        error = None
+        for response in self._stream_requests(chunks(), window):
+            size = sizes.popleft()
+            if isinstance(response, ValkyrieError):
+                error = error or response
+                failed = True
+                continue
+            inserted += size
+            if progress is not None:
+                progress(inserted)
+
+        if error is not None:
+            raise error
+        return inserted
+
+    @staticmethod
+    def _insert_packet(key: str, index: int, values: List[Any]) -> RequestPacket:
+        if values:
+            first_value_data_type = ProtocolEncoder.get_data_type(values[0])
+        else:
+            first_value_data_type = DataType.STRING  # Default fallback
+
+        params = ProtocolEncoder.encode_values(values, prefix=struct.pack('<I', index))
+        return RequestPacket(CompositeType.ARRAY, first_value_data_type, Operation.INSERT, key, params)
@@ -0,0 +1,108 @@
+from typing import Any, AsyncIterator, Awaitable, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+from ..protocol.encoder import ProtocolEncoder
+from ..protocol.packet import RequestPacket
+from ..protocol.types import CompositeType, DataType, Operation, ResponseSchema
+from .batch import DEFAULT_WINDOW, collect_results_async, send_sequentially_async
+
+
+class AsyncMapOperations:
+    def __init__(self, send_request_func, stream_request_func=None, stream_requests_func=None):
+        self._send_request = send_request_func
+        self._stream_request = stream_request_func
+        self._stream_requests = stream_requests_func or (
+            lambda packets, window: send_sequentially_async(send_request_func, packets))
+
+    async def get(self, key: str, map_key: str) -> Any:
+        response = await self._send_request(self._get_packet(key, map_key))
+        return response.data
+
+    async def set(self, key: str, map_key: str, value: Any) -> None:
+        await self._send_request(self._set_packet(key, map_key, value))
+
+    async def remove(self, key: str, map_key: str) -> None:
+        await self._send_request(self._remove_packet(key, map_key))
+
+    async def contains(self, key: str, map_key: str) -> bool:
+        map_key_bytes = ProtocolEncoder.encode_string(map_key)
+        packet = RequestPacket(CompositeType.MAP, DataType.STRING, Operation.MAP_CONTAINS, key, map_key_bytes)
+        response = await self._send_request(packet)
+        return bool(response.data)
+
+
+    async def keys(self, key: str, lazy: bool = False) -> Sequence[str]:
+        schema = ResponseSchema.LAZY if lazy else None
+        packet = RequestPacket(CompositeType.MAP, DataType.STRING, Operation.MAP_KEYS, key, schema=schema)
+        response = await self._send_request(packet)
+        return response.data if response.data else []
+
+
+    async def values(self, key: str, lazy: bool = False) -> Sequence[Any]:
+        schema = ResponseSchema.LAZY if lazy else None
+        packet = RequestPacket(CompositeType.MAP, DataType.STRING, Operation.MAP_VALUES, key, schema=schema)
+        response = await self._send_request(packet)
+        return response.data if response.data else []
+
+    def iter_values(self, key: str) -> AsyncIterator[Any]:
+        """Yield the map's values as they arrive instead of buffering the response."""
+        if self._stream_request is None:
+            return self._iter_buffered(self.values(key))
+        packet = RequestPacket(CompositeType.MAP, DataType.STRING, Operation.MAP_VALUES, key)
+        return self._stream_request(packet)
+
+    @staticmethod
+    async def _iter_buffered(values: Awaitable[Sequence[Any]]) -> AsyncIterator[Any]:
+        for value in await values:
+            yield value
+
+    async def get_many(self, key: str, map_keys: Iterable[str], raise_on_error: bool = False,
+                 window: int = DEFAULT_WINDOW) -> Dict[str, Any]:
+        """Fetch several fields in one pipelined flight.
+
+        Returns each field's value in request order, with a ``ValkyrieError`` in
+        place of any field the server rejected.
+        """
+        map_keys = list(map_keys)
+        packets = (self._get_packet(key, map_key) for map_key in map_keys)
+        return await collect_results_async(map_keys, self._stream_requests(packets, window), raise_on_error)
+
+    async def set_many(self, key: str, mapping: Mapping[str, Any], raise_on_error: bool = False,
+                 window: int = DEFAULT_WINDOW) -> Dict[str, Any]:
+        """Set several fields in one pipelined flight; per-field results as ``get_many``."""
+        items = list(mapping.items())
+        packets = (self._set_packet(key, map_key, value) for map_key, value in items)
+        return await collect_results_async([map_key for map_key, _ in items], self._stream_requests(packets, window),
+                               raise_on_error)
+
+    async def remove_many(self, key: str, map_keys: Iterable[str], raise_on_error: bool = False,
+                    window: int = DEFAULT_WINDOW) -> Dict[str, Any]:
+        """Remove several fields in one pipelined flight; per-field results as ``get_many``."""
+        map_keys = list(map_keys)
+        packets = (self._remove_packet(key, map_key) for map_key in map_keys)
+        return await collect_results_async(map_keys, self._stream_requests(packets, window), raise_on_error)
+
+    async def items(self, key: str) -> List[Tuple[str, Any]]:
+        """Fetch keys and values together, pipelined on one connection."""
+        packets = [
+            RequestPacket(CompositeType.MAP, DataType.STRING, Operation.MAP_KEYS, key),
+            RequestPacket(CompositeType.MAP, DataType.STRING, Operation.MAP_VALUES, key),
+        ]
+        results = await collect_results_async(['keys', 'values'], self._stream_requests(packets, 2), raise_on_error=True)
+        return list(zip(results['keys'] or [], results['values'] or []))
+
+    @staticmethod
+    def _get_packet(key: str, map_key: str) -> RequestPacket:
+        map_key_bytes = ProtocolEncoder.encode_string(map_key)
+        return RequestPacket(CompositeType.MAP, DataType.STRING, Operation.MAP_GET, key, map_key_bytes)
+
+    @staticmethod
+    def _set_packet(key: str, map_key: str, value: Any) -> RequestPacket:
+        map_key_bytes = ProtocolEncoder.encode_string(map_key)
+        data_type = ProtocolEncoder.get_data_type(value)
+        params = ProtocolEncoder.encode_values([value], prefix=map_key_bytes)
+        return RequestPacket(CompositeType.MAP, data_type, Operation.MAP_SET, key, params)
+
+    @staticmethod
+    def _remove_packet(key: str, map_key: str) -> RequestPacket:
+        map_key_bytes = ProtocolEncoder.encode_string(map_key)
+        return RequestPacket(CompositeType.MAP, DataType.STRING, Operation.MAP_REMOVE, key, map_key_bytes)
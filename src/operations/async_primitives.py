@@ -0,0 +1,79 @@
+from typing import Any, Dict, Iterable, Mapping
+from src.protocol.types import CompositeType, DataType, Operation
+from src.protocol.encoder import ProtocolEncoder
+from src.protocol.packet import RequestPacket
+from src.operations.batch import DEFAULT_WINDOW, collect_results_async, send_sequentially_async
+
+
+class AsyncPrimitiveOperations:
+    def __init__(self, send_request_func, stream_requests_func=None):
+        self._send_request = send_request_func
+        self._stream_requests = stream_requests_func or (
+            lambda packets, window: send_sequentially_async(send_request_func, packets))
+
+    async def get(self, key: str) -> Any:
+        response = await self._send_request(self._get_packet(key))
+        return response.data
+
+    async def set(self, key: str, value: Any) -> None:
+        await self._send_request(self._set_packet(key, value))
+
+    async def remove(self, key: str) -> None:
+        await self._send_request(self._remove_packet(key))
+
+    async def length(self, key: str) -> int:
+        packet = RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.LEN, key)
+        response = await self._send_request(packet)
+        return response.data
+
+    async def append(self, key: str, value: str) -> None:
+        value_bytes = ProtocolEncoder.encode_string(value)
+        packet = RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.APPEND, key, value_bytes)
+        await self._send_request(packet)
+
+    async def increment(self, key: str) -> int:
+        packet = RequestPacket(CompositeType.PRIMITIVE, DataType.INT, Operation.INCREMENT, key)
+        response = await self._send_request(packet)
+        return response.data
+
+    async def decrement(self, key: str) -> int:
+        packet = RequestPacket(CompositeType.PRIMITIVE, DataType.INT, Operation.DECREMENT, key)
+        response = await self._send_request(packet)
+        return response.data
+
+    async def get_many(self, keys: Iterable[str], raise_on_error: bool = False,
+                 window: int = DEFAULT_WINDOW) -> Dict[str, Any]:
+        """Fetch several keys in one pipelined flight.
+
+        Returns each key's value in request order, with a ``ValkyrieError`` in
+        place of any key the server rejected.
+        """
+        keys = list(keys)
+        packets = (self._get_packet(key) for key in keys)
+        return await collect_results_async(keys, self._stream_requests(packets, window), raise_on_error)
+
+    async def set_many(self, mapping: Mapping[str, Any], raise_on_error: bool = False,
+                 window: int = DEFAULT_WINDOW) -> Dict[str, Any]:
+        items = list(mapping.items())
+        packets = (self._set_packet(key, value) for key, value in items)
+        return await collect_results_async([key for key, _ in items], self._stream_requests(packets, window), raise_on_error)
+
+    async def remove_many(self, keys: Iterable[str], raise_on_error: bool = False,
+                    window: int = DEFAULT_WINDOW) -> Dict[str, Any]:
+        keys = list(keys)
+        packets = (self._remove_packet(key) for key in keys)
+        return await collect_results_async(keys, self._stream_requests(packets, window), raise_on_error)
+
+    @staticmethod
+    def _get_packet(key: str) -> RequestPacket:
+        return RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.GET, key)
+
+    @staticmethod
+    def _set_packet(key: str, value: Any) -> RequestPacket:
+        data_type = ProtocolEncoder.get_data_type(value)
+        params = ProtocolEncoder.encode_values([value])
+        return RequestPacket(CompositeType.PRIMITIVE, data_type, Operation.SET, key, params)
+
+    @staticmethod
+    def _remove_packet(key: str) -> RequestPacket:
+        return RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.REMOVE, key)
@@ -0,0 +1,95 @@
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Iterable, Iterator, Sequence, Union
+
+from ..protocol.packet import RequestPacket, ResponsePacket
+from ..protocol.types import Status
+from ..exceptions.errors import ValkyrieConnectionError, ValkyrieError
+
+
+Result = Union[ResponsePacket, ValkyrieError]
+
+# Requests kept in flight by the bulk helpers unless the caller says otherwise.
+DEFAULT_WINDOW = 256
+
+
+class _NotFound:
+    """Type of ``NOT_FOUND``, the placeholder multi-key calls use for missing keys."""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __repr__(self) -> str:
+        return 'NOT_FOUND'
+
+    def __reduce__(self):
+        return (_NotFound, ())
+
+
+NOT_FOUND = _NotFound()
+
+
+def send_sequentially(send_request_func: Callable[[RequestPacket], ResponsePacket],
+                      packets: Iterable[RequestPacket]) -> Iterator[Result]:
+    """Fallback for ``stream_requests``: one round trip per packet, same result shape."""
+    for packet in packets:
+        try:
+            yield send_request_func(packet)
+        except ValkyrieConnectionError:
+            raise
+        except ValkyrieError as e:
+            yield e
+
+
+async def send_sequentially_async(send_request_func: Callable[[RequestPacket], Awaitable[ResponsePacket]],
+                                  packets: Iterable[RequestPacket]) -> AsyncIterator[Result]:
+    for packet in packets:
+        try:
+            yield await send_request_func(packet)
+        except ValkyrieConnectionError:
+            raise
+        except ValkyrieError as e:
+            yield e
+
+
+def _finish(results: Dict[Hashable, Any], raise_on_error: bool) -> Dict[Hashable, Any]:
+    if raise_on_error:
+        for result in results.values():
+            if isinstance(result, ValkyrieError):
+                raise result
+    return results
+
+
+def collect_results(keys: Sequence[Hashable], results: Iterable[Result],
+                    raise_on_error: bool = False) -> Dict[Hashable, Any]:
+    """Pair ``keys`` with their response data, keeping errors in place like ``Pipeline.execute``."""
+    # Iterate ``results`` to the end (not zip) so a streaming source releases its connection.
+    collected = {}
+    keys = iter(keys)
+    for result in results:
+        collected[next(keys)] = result if isinstance(result, ValkyrieError) else result.data
+    return _finish(collected, raise_on_error)
+
+
+async def collect_results_async(keys: Sequence[Hashable], results: AsyncIterator[Result],
+                                raise_on_error: bool = False) -> Dict[Hashable, Any]:
+    collected = {}
+    keys = iter(keys)
+    async for result in results:
+        collected[next(keys)] = result if isinstance(result, ValkyrieError) else result.data
+    return _finish(collected, raise_on_error)
+
+
+def resolve_not_found(results: Dict[Hashable, Any]) -> Dict[Hashable, Any]:
+    """Replace NOT_FOUND errors with the ``NOT_FOUND`` sentinel and raise any other error."""
+    for key, result in results.items():
+        if isinstance(result, ValkyrieError):
+            if result.status != Status.NOT_FOUND:
+                raise result
+            results[key] = NOT_FOUND
+    return results
@@ -1,26 +1,25 @@
-from typing import Any
+from typing import Any, Dict, Iterable, Mapping
 from src.protocol.types import CompositeType, DataType, Operation
 from src.protocol.encoder import ProtocolEncoder
 from src.protocol.packet import RequestPacket
+from src.operations.batch import DEFAULT_WINDOW, collect_results, send_sequentially
 
 
 class PrimitiveOperations:
-    def __init__(self, send_request_func):
+    def __init__(self, send_request_func, stream_requests_func=None):
         self._send_request = send_request_func
+        self._stream_requests = stream_requests_func or (
+            lambda packets, window: send_sequentially(send_request_func, packets))
 
     def get(self, key: str) -> Any:
-        packet = RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.GET, key)
-        response = self._send_request(packet)
+        response = self._send_request(self._get_packet(key))
         return response.data
 
     def set(self, key: str, value: Any) -> None:
-        value_bytes, data_type = ProtocolEncoder.encode_value(value)
-        packet = RequestPacket(CompositeType.PRIMITIVE, data_type, Operation.SET, key, value_bytes)
-        self._send_request(packet)
+        self._send_request(self._set_packet(key, value))
 
     def remove(self, key: str) -> None:
-        packet = RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.REMOVE, key)
-        self._send_request(packet)
+        self._send_request(self._remove_packet(key))
 
     def length(self, key: str) -> int:
         packet = RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.LEN, key)
@@ -41,3 +40,40 @@ class PrimitiveOperations:
         packet = RequestPacket(CompositeType.PRIMITIVE, DataType.INT, Operation.DECREMENT, key)
         response = self._send_request(packet)
         return response.data
+
+    def get_many(self, keys: Iterable[str], raise_on_error: bool = False,
+                 window: int = DEFAULT_WINDOW) -> Dict[str, Any]:
+        """Fetch several keys in one pipelined flight.
+
+        Returns each key's value in request order, with a ``ValkyrieError`` in
+        place of any key the server rejected.
+        """
+        keys = list(keys)
+        packets = (self._get_packet(key) for key in keys)
+        return collect_results(keys, self._stream_requests(packets, window), raise_on_error)
+
+    def set_many(self, mapping: Mapping[str, Any], raise_on_error: bool = False,
+                 window: int = DEFAULT_WINDOW) -> Dict[str, Any]:
+        items = list(mapping.items())
+        packets = (self._set_packet(key, value) for key, value in items)
+        return collect_results([key for key, _ in items], self._stream_requests(packets, window), raise_on_error)
+
+    def remove_many(self, keys: Iterable[str], raise_on_error: bool = False,
+                    window: int = DEFAULT_WINDOW) -> Dict[str, Any]:
+        keys = list(keys)
+        packets = (self._remove_packet(key) for key in keys)
+        return collect_results(keys, self._stream_requests(packets, window), raise_on_error)
+
+    @staticmethod
+    def _get_packet(key: str) -> RequestPacket:
+        return RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.GET, key)
+
+    @staticmethod
+    def _set_packet(key: str, value: Any) -> RequestPacket:
+        data_type = ProtocolEncoder.get_data_type(value)
+        params = ProtocolEncoder.encode_values([value])
+        return RequestPacket(CompositeType.PRIMITIVE, data_type, Operation.SET, key, params)
+
+    @staticmethod
+    def _remove_packet(key: str) -> RequestPacket:
+        return RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.REMOVE, key)
@@ -0,0 +1,90 @@
+from typing import Any, Callable, List, Union
+
+from src.protocol.packet import RequestPacket, ResponsePacket
+from src.protocol.types import Status
+from src.operations.primitives import PrimitiveOperations
+from src.operations.maps import MapOperations
+from src.operations.arrays import ArrayOperations
+from src.exceptions.errors import ValkyrieError
+
+
+SendRequestsFunc = Callable[[List[RequestPacket]], List[Union[ResponsePacket, ValkyrieError]]]
+
+
+class Pipeline:
+    """Queues operations and sends them to the server in a single write.
+
+    Operations called on a pipeline (directly or through ``primitives``,
+    ``maps`` and ``arrays``) return nothing useful; ``execute()`` returns the
+    decoded response data of each queued command in order, with a
+    ``ValkyrieError`` in place of any command the server rejected.
+    """
+
+    def __init__(self, send_requests_func: SendRequestsFunc):
+        self._send_requests = send_requests_func
+        self._packets: List[RequestPacket] = []
+
+        self.primitives = PrimitiveOperations(self._queue)
+        self.maps = MapOperations(self._queue)
+        self.arrays = ArrayOperations(self._queue)
+
+    def _queue(self, packet: RequestPacket) -> ResponsePacket:
+        self._packets.append(packet)
+        return ResponsePacket(Status.OK)
+
+    def execute(self, raise_on_error: bool = False) -> List[Any]:
+        packets, self._packets = self._packets, []
+        if not packets:
+            return []
+
+        results = [
+            response if isinstance(response, ValkyrieError) else response.data
+            for response in self._send_requests(packets)
+        ]
+
+        if raise_on_error:
+            for result in results:
+                if isinstance(result, ValkyrieError):
+                    raise result
+
+        return results
+
+    def reset(self) -> None:
+        self._packets = []
+
+    def get(self, key: str) -> 'Pipeline':
+        self.primitives.get(key)
+        return self
+
+    def set(self, key: str, value) -> 'Pipeline':
+        self.primitives.set(key, value)
+        return self
+
+    def remove(self, key: str) -> 'Pipeline':
+        self.primitives.remove(key)
+        return self
+
+    def length(self, key: str) -> 'Pipeline':
+        self.primitives.length(key)
+        return self
+
+    def append(self, key: str, value: str) -> 'Pipeline':
+        self.primitives.append(key, value)
+        return self
+
+    def increment(self, key: str) -> 'Pipeline':
+        self.primitives.increment(key)
+        return self
+
+    def decrement(self, key: str) -> 'Pipeline':
+        self.primitives.decrement(key)
+        return self
+
+    def __len__(self) -> int:
+        return len(self._packets)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.reset()
@@ -1,120 +1,161 @@
 import struct
-from typing import Any, Tuple
+from typing import Any, Callable, List, Optional, Tuple, Union
 
 from .types import DataType, CompositeType
 
 
-class ProtocolDecoder:
-    @staticmethod
-    def decode_value(data: bytes, offset: int = 0) -> Tuple[Any, int]:
-        if offset >= len(data):
-            raise ValueError("Not enough data to decode value")
-
-        type_byte = data[offset]
-        offset += 1
-
-        try:
-            data_type = DataType(type_byte)
-        except ValueError:
-            raise ValueError(f"Unknown data type: {type_byte}")
-
-        if data_type == DataType.BOOL:
-            if offset + 1 > len(data):
-                raise ValueError("Not enough data for bool")
-            bool_val = bool(data[offset])
-            return bool_val, offset + 1
-
-        elif data_type == DataType.INT:
-            if offset + 8 > len(data):
-                raise ValueError("Not enough data for int")
-            int_val = struct.unpack('<q', data[offset:offset + 8])[0]
-            return int_val, offset + 8
-
-        elif data_type == DataType.FLOAT:
-            if offset + 8 > len(data):
-                raise ValueError("Not enough data for float")
-            float_val = struct.unpack('<d', data[offset:offset + 8])[0]
-            return float_val, offset + 8
-
-        elif data_type == DataType.STRING:
-            length, new_offset = ProtocolDecoder.decode_length(data, offset)
-            if new_offset + length > len(data):
-                raise ValueError("Not enough data for string")
-            string_data = data[new_offset:new_offset + length]
-            return string_data.decode('utf-8'), new_offset + length
-
-        elif data_type == DataType.BLOB:
-            length, new_offset = ProtocolDecoder.decode_length(data, offset)
-            if new_offset + length > len(data):
-                raise ValueError("Not enough data for blob")
-            blob_data = data[new_offset:new_offset + length]
-            return blob_data, new_offset + length
-
-        else:
-            raise ValueError(f"Unsupported data type: {data_type}")
+Buffer = Union[bytes, bytearray, memoryview]
+Decoder = Callable[[memoryview, int], Tuple[Any, int]]
 
+_LENGTH = struct.Struct('<I')
+_INT = struct.Struct('<q')
+_FLOAT = struct.Struct('<d')
 
-    @staticmethod
-    def decode_composite_value(data: bytes, offset: int = 0) -> Tuple[Any, int]:
-        if offset >= len(data):
-            raise ValueError("Not enough data to decode composite value")
+_PRIMITIVE = CompositeType.PRIMITIVE.value
 
-        composite_type_byte = data[offset]
-        offset += 1
 
-        try:
-            composite_type = CompositeType(composite_type_byte)
-        except ValueError:
-            raise ValueError(f"Unknown composite type: {composite_type_byte}")
+def _as_view(data: Buffer) -> memoryview:
+    if isinstance(data, memoryview):
+        return data.cast('B') if data.format != 'B' else data
+    return memoryview(data)
 
-        if composite_type == CompositeType.PRIMITIVE:
-            return ProtocolDecoder.decode_value(data, offset)
 
-        elif composite_type == CompositeType.ARRAY:
-            return ProtocolDecoder.decode_array(data, offset)
+def _decode_bool(data: memoryview, offset: int) -> Tuple[bool, int]:
+    if offset + 1 > len(data):
+        raise ValueError("Not enough data for bool")
+    return bool(data[offset]), offset + 1
 
-        elif composite_type == CompositeType.MAP:
-            return ProtocolDecoder.decode_map(data, offset)
 
-        else:
-            raise ValueError(f"Unsupported composite type: {composite_type}")
+def _decode_int(data: memoryview, offset: int) -> Tuple[int, int]:
+    if offset + 8 > len(data):
+        raise ValueError("Not enough data for int")
+    return _INT.unpack_from(data, offset)[0], offset + 8
 
-    @staticmethod
-    def decode_array(data: bytes, offset: int = 0) -> Tuple[list, int]:
-        """Decode an array of values."""
-        length, offset = ProtocolDecoder.decode_length(data, offset)
-        array = []
 
-        for _ in range(length):
-            value, offset = ProtocolDecoder.decode_composite_value(data, offset)
-            array.append(value)
+def _decode_float(data: memoryview, offset: int) -> Tuple[float, int]:
+    if offset + 8 > len(data):
+        raise ValueError("Not enough data for float")
+    return _FLOAT.unpack_from(data, offset)[0], offset + 8
+
+
+def _decode_length(data: memoryview, offset: int) -> Tuple[int, int]:
+    if offset + 4 > len(data):
+        raise ValueError("Not enough data for length")
+    return _LENGTH.unpack_from(data, offset)[0], offset + 4
+
+
+def _decode_str(data: memoryview, offset: int) -> Tuple[str, int]:
+    length, offset = _decode_length(data, offset)
+    end = offset + length
+    if end > len(data):
+        raise ValueError("Not enough data for string")
+    return str(data[offset:end], 'utf-8'), end
+
+
+def _decode_blob(data: memoryview, offset: int) -> Tuple[bytes, int]:
+    length, offset = _decode_length(data, offset)
+    end = offset + length
+    if end > len(data):
+        raise ValueError("Not enough data for blob")
+    return data[offset:end].tobytes(), end
+
+
+# Indexed by the raw type byte so decoding never constructs an enum member.
+_VALUE_DECODERS: List[Optional[Decoder]] = [None] * 256
+_VALUE_DECODERS[DataType.BOOL] = _decode_bool
+_VALUE_DECODERS[DataType.INT] = _decode_int
+_VALUE_DECODERS[DataType.FLOAT] = _decode_float
+_VALUE_DECODERS[DataType.STRING] = _decode_str
+_VALUE_DECODERS[DataType.BLOB] = _decode_blob
+
+
+def _decode_value(data: memoryview, offset: int) -> Tuple[Any, int]:
+    if offset >= len(data):
+        raise ValueError("Not enough data to decode value")
+
+    type_byte = data[offset]
+    decoder = _VALUE_DECODERS[type_byte]
+    if decoder is None:
+        raise ValueError(f"Unknown data type: {type_byte}")
+    return decoder(data, offset + 1)
+
+
+def _decode_composite(data: memoryview, offset: int) -> Tuple[Any, int]:
+    if offset >= len(data):
+        raise ValueError("Not enough data to decode composite value")
+
+    composite_byte = data[offset]
+    if composite_byte == _PRIMITIVE:
+        return _decode_value(data, offset + 1)
+
+    decoder = _COMPOSITE_DECODERS[composite_byte]
+    if decoder is None:
+        raise ValueError(f"Unknown composite type: {composite_byte}")
+    return decoder(data, offset + 1)
 
-        return array, offset
 
+def _decode_element(data: memoryview, offset: int) -> Tuple[Any, int]:
+    # _decode_composite with the primitive case inlined; it dominates large responses.
+    if offset + 1 < len(data) and data[offset] == _PRIMITIVE:
+        decoder = _VALUE_DECODERS[data[offset + 1]]
+        if decoder is not None:
+            return decoder(data, offset + 2)
+    return _decode_composite(data, offset)
+
+
+def _decode_array(data: memoryview, offset: int) -> Tuple[list, int]:
+    length, offset = _decode_length(data, offset)
+    array = []
+    append = array.append
+
+    for _ in range(length):
+        value, offset = _decode_element(data, offset)
+        append(value)
+
+    return array, offset
+
+
+def _decode_map(data: memoryview, offset: int) -> Tuple[dict, int]:
+    length, offset = _decode_length(data, offset)
+    map_dict = {}
+
+    for _ in range(length):
+        key, offset = _decode_element(data, offset)
+        value, offset = _decode_element(data, offset)
+        map_dict[key] = value
+
+    return map_dict, offset
+
+
+_COMPOSITE_DECODERS: List[Optional[Decoder]] = [None] * 256
+_COMPOSITE_DECODERS[CompositeType.PRIMITIVE] = _decode_value
+_COMPOSITE_DECODERS[CompositeType.ARRAY] = _decode_array
+_COMPOSITE_DECODERS[CompositeType.MAP] = _decode_map
+
+
+class ProtocolDecoder:
     @staticmethod
-    def decode_map(data: bytes, offset: int = 0) -> Tuple[dict, int]:
-        """Decode a map (dictionary) of key-value pairs."""
-        length, offset = ProtocolDecoder.decode_length(data, offset)
-        map_dict = {}
+    def decode_value(data: Buffer, offset: int = 0) -> Tuple[Any, int]:
+        return _decode_value(_as_view(data), offset)
+
+    @staticmethod
+    def decode_composite_value(data: Buffer, offset: int = 0) -> Tuple[Any, int]:
+        return _decode_composite(_as_view(data), offset)
 
-        for _ in range(length):
-            key, offset = ProtocolDecoder.decode_composite_value(data, offset)
-            value, offset = ProtocolDecoder.decode_composite_value(data, offset)
-            map_dict[key] = value
+    @staticmethod
+    def decode_array(data: Buffer, offset: int = 0) -> Tuple[list, int]:
+        """Decode an array of values."""
+        return _decode_array(_as_view(data), offset)
 
-        return map_dict, offset
+    @staticmethod
+    def decode_map(data: Buffer, offset: int = 0) -> Tuple[dict, int]:
+        """Decode a map (dictionary) of key-value pairs."""
+        return _decode_map(_as_view(data), offset)
 
     @staticmethod
-    def decode_length(data: bytes, offset: int = 0) -> Tuple[int, int]:
-        if offset + 4 > len(data):
-            raise ValueError("Not enough data for length")
-        length = struct.unpack('<I', data[offset:offset + 4])[0]
-        return length, offset + 4
+    def decode_length(data: Buffer, offset: int = 0) -> Tuple[int, int]:
+        return _decode_length(_as_view(data), offset)
 
     @staticmethod
-    def decode_string(data: bytes, offset: int = 0) -> Tuple[str, int]:
-        length, new_offset = ProtocolDecoder.decode_length(data, offset)
-        if new_offset + length > len(data):
-            raise ValueError("Not enough data for string")
-        string_data = data[new_offset:new_offset + length]
-        return string_data.decode('utf-8'), new_offset + length
+    def decode_string(data: Buffer, offset: int = 0) -> Tuple[str, int]:
+        return _decode_str(_as_view(data), offset)
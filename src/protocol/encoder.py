@@ -1,9 +1,124 @@
 import struct
-from typing import Any
+from typing import Any, Iterable, List, Union
 
 from .types import DataType, CompositeType
 
 
+Buffer = Union[bytes, bytearray, memoryview]
+
+# Blobs at least this large are framed by reference rather than copied.
+ZERO_COPY_MIN_SIZE = 32 * 1024
+
+_LENGTH = struct.Struct('<I')
+_BOOL = struct.Struct('<BB')
+_INT = struct.Struct('<Bq')
+_FLOAT = struct.Struct('<Bd')
+_SIZED = struct.Struct('<BI')
+_COMPOSITE_BOOL = struct.Struct('<BBB')
+_COMPOSITE_INT = struct.Struct('<BBq')
+_COMPOSITE_FLOAT = struct.Struct('<BBd')
+_COMPOSITE_SIZED = struct.Struct('<BBI')
+
+_PRIMITIVE = CompositeType.PRIMITIVE.value
+_INT_TYPE = DataType.INT.value
+
+
+def _reserve(buffer: bytearray, end: int) -> None:
+    size = len(buffer)
+    if end > size:
+        # Grow geometrically so appending n values costs O(n) overall.
+        buffer.extend(bytes(max(end - size, size)))
+
+
+def _write(buffer: bytearray, offset: int, value: Any, composite: bool) -> int:
+    if type(value) is int:
+        # Fast path for the most common array element.
+        if composite:
+            end = offset + 10
+            if end > len(buffer):
+                _reserve(buffer, end)
+            _COMPOSITE_INT.pack_into(buffer, offset, _PRIMITIVE, _INT_TYPE, value)
+        else:
+            end = offset + 9
+            if end > len(buffer):
+                _reserve(buffer, end)
+            _INT.pack_into(buffer, offset, _INT_TYPE, value)
+        return end
+
+    if isinstance(value, bool):
+        if composite:
+            _reserve(buffer, offset + 3)
+            _COMPOSITE_BOOL.pack_into(buffer, offset, CompositeType.PRIMITIVE, DataType.BOOL, value)
+            return offset + 3
+        _reserve(buffer, offset + 2)
+        _BOOL.pack_into(buffer, offset, DataType.BOOL, value)
+        return offset + 2
+
+    elif isinstance(value, int):
+        if composite:
+            _reserve(buffer, offset + 10)
+            _COMPOSITE_INT.pack_into(buffer, offset, CompositeType.PRIMITIVE, DataType.INT, value)
+            return offset + 10
+        _reserve(buffer, offset + 9)
+        _INT.pack_into(buffer, offset, DataType.INT, value)
+        return offset + 9
+
+    elif isinstance(value, float):
+        if composite:
+            _reserve(buffer, offset + 10)
+            _COMPOSITE_FLOAT.pack_into(buffer, offset, CompositeType.PRIMITIVE, DataType.FLOAT, value)
+            return offset + 10
+        _reserve(buffer, offset + 9)
+        _FLOAT.pack_into(buffer, offset, DataType.FLOAT, value)
+        return offset + 9
+
+    elif isinstance(value, (str, bytes, bytearray, memoryview)):
+        if isinstance(value, str):
+            data_type = DataType.STRING
+            payload = memoryview(value.encode('utf-8'))
+        else:
+            data_type = DataType.BLOB
+            payload = memoryview(value).cast('B')
+
+        size = payload.nbytes
+        if composite:
+            _reserve(buffer, offset + 6 + size)
+            _COMPOSITE_SIZED.pack_into(buffer, offset, CompositeType.PRIMITIVE, data_type, size)
+            offset += 6
+        else:
+            _reserve(buffer, offset + 5 + size)
+            _SIZED.pack_into(buffer, offset, data_type, size)
+            offset += 5
+        buffer[offset:offset + size] = payload
+        return offset + size
+
+    elif composite and isinstance(value, (list, tuple)):
+        _reserve(buffer, offset + 5)
+        _SIZED.pack_into(buffer, offset, CompositeType.ARRAY, len(value))
+        offset += 5
+        for item in value:
+            offset = _write(buffer, offset, item, True)
+        return offset
+
+    elif composite and isinstance(value, dict):
+        _reserve(buffer, offset + 5)
+        _SIZED.pack_into(buffer, offset, CompositeType.MAP, len(value))
+        offset += 5
+        for key, item in value.items():
+            offset = _write(buffer, offset, key, True)
+            offset = _write(buffer, offset, item, True)
+        return offset
+
+    else:
+        raise ValueError(f"Unsupported value type: {type(value)}")
+
+
+def _encode(value: Any, composite: bool) -> bytes:
+    buffer = bytearray()
+    end = _write(buffer, 0, value, composite)
+    return bytes(memoryview(buffer)[:end])
+
+
 class ProtocolEncoder:
     @staticmethod
     def encode_type_byte(composite: CompositeType, primitive: DataType) -> int:
@@ -11,67 +126,67 @@ class ProtocolEncoder:
 
     @staticmethod
     def encode_value(value: Any) -> bytes:
-        if isinstance(value, bool):
-            return bytes([DataType.BOOL]) + bytes([int(value)])
-        elif isinstance(value, int):
-            return bytes([DataType.INT]) + struct.pack('<q', value)
-        elif isinstance(value, float):
-            return bytes([DataType.FLOAT]) + struct.pack('<d', value)
-        elif isinstance(value, str):
-            encoded_str = value.encode('utf-8')
-            return (bytes([DataType.STRING]) +
-                    struct.pack('<I', len(encoded_str)) +
-                    encoded_str)
-        elif isinstance(value, bytes):
-            return (bytes([DataType.BLOB]) +
-                    struct.pack('<I', len(value)) +
-                    value)
-        elif isinstance(value, (bytes, bytearray)):
-            return (bytes([DataType.BLOB]) +
-                    struct.pack('<I', len(value)) +
-                    bytes(value))
-        else:
-            raise ValueError(f"Unsupported value type: {type(value)}")
+        return _encode(value, False)
+
+    @staticmethod
+    def encode_into(buffer: bytearray, value: Any, offset: int = 0) -> int:
+        """Write the composite encoding of ``value`` into ``buffer`` at ``offset``.
+
+        The buffer is grown as needed and never shrunk, so it can be reused
+        across calls. Returns the offset just past the encoded value; bytes
+        after it are unspecified.
+        """
+        return _write(buffer, offset, value, True)
+
+    @staticmethod
+    def encode_value_into(buffer: bytearray, value: Any, offset: int = 0) -> int:
+        """Like ``encode_into`` but writes the primitive encoding of ``value``."""
+        return _write(buffer, offset, value, False)
+
+    @staticmethod
+    def encode_values(values: Iterable[Any], prefix: Buffer = b'') -> List[Buffer]:
+        buffers: List[Buffer] = []
+        current = bytearray(prefix)
+        offset = len(current)
+
+        for value in values:
+            if isinstance(value, (bytes, bytearray, memoryview)):
+                size = memoryview(value).nbytes
+                if size >= ZERO_COPY_MIN_SIZE:
+                    del current[offset:]
+                    current += _SIZED.pack(DataType.BLOB, size)
+                    buffers.append(current)
+                    buffers.append(value)
+                    current = bytearray()
+                    offset = 0
+                    continue
+            offset = _write(current, offset, value, False)
+
+        del current[offset:]
+        if current or not buffers:
+            buffers.append(current)
+        return buffers
 
     @staticmethod
     def encode_composite_value(value: Any) -> bytes:
-        if isinstance(value, (list, tuple)):
-            return ProtocolEncoder.encode_array(value)
-        elif isinstance(value, dict):
-            return ProtocolEncoder.encode_map(value)
-        else:
-            return (bytes([CompositeType.PRIMITIVE]) +
-                    ProtocolEncoder.encode_value(value))
+        return _encode(value, True)
 
     @staticmethod
     def encode_string(value: str) -> bytes:
         encoded = value.encode('utf-8')
-        return struct.pack('<I', len(encoded)) + encoded
+        return _LENGTH.pack(len(encoded)) + encoded
 
     @staticmethod
     def encode_length(length: int) -> bytes:
-        return struct.pack('<I', length)
+        return _LENGTH.pack(length)
 
     @staticmethod
     def encode_array(array: list) -> bytes:
-        result = bytes([CompositeType.ARRAY])
-        result += struct.pack('<I', len(array))
-
-        for item in array:
-            result += ProtocolEncoder.encode_composite_value(item)
-
-        return result
+        return _encode(array, True)
 
     @staticmethod
     def encode_map(map_dict: dict) -> bytes:
-        result = bytes([CompositeType.MAP])
-        result += struct.pack('<I', len(map_dict))
-
-        for key, value in map_dict.items():
-            result += ProtocolEncoder.encode_composite_value(key)
-            result += ProtocolEncoder.encode_composite_value(value)
-
-        return result
+        return _encode(map_dict, True)
 
     @staticmethod
     def get_data_type(value: Any) -> DataType:
@@ -83,7 +198,7 @@ class ProtocolEncoder:
             return DataType.FLOAT
         elif isinstance(value, str):
             return DataType.STRING
-        elif isinstance(value, (bytes, bytearray)):
+        elif isinstance(value, (bytes, bytearray, memoryview)):
             return DataType.BLOB
         else:
             raise ValueError(f"Unsupported value type: {type(value)}")
\ No newline at end of file
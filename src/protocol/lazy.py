@@ -0,0 +1,210 @@
+from array import array
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Union
+
+from .types import CompositeType, DataType
+from .decoder import _LENGTH, _PRIMITIVE, Buffer, _as_view, _decode_composite, _decode_element, _decode_length
+
+
+Skipper = Callable[[memoryview, int], int]
+
+_MISSING = object()
+
+
+def _skip_fixed(size: int) -> Skipper:
+    def skip(data: memoryview, offset: int) -> int:
+        end = offset + size
+        if end > len(data):
+            raise ValueError("Not enough data to skip value")
+        return end
+    return skip
+
+
+def _skip_sized(data: memoryview, offset: int) -> int:
+    length, offset = _decode_length(data, offset)
+    end = offset + length
+    if end > len(data):
+        raise ValueError("Not enough data to skip value")
+    return end
+
+
+_VALUE_SKIPPERS: List[Optional[Skipper]] = [None] * 256
+_VALUE_SKIPPERS[DataType.BOOL] = _skip_fixed(1)
+_VALUE_SKIPPERS[DataType.INT] = _skip_fixed(8)
+_VALUE_SKIPPERS[DataType.FLOAT] = _skip_fixed(8)
+_VALUE_SKIPPERS[DataType.STRING] = _skip_sized
+_VALUE_SKIPPERS[DataType.BLOB] = _skip_sized
+
+
+def _skip_composite(data: memoryview, offset: int) -> int:
+    """Return the offset just past the composite value at ``offset`` without decoding it."""
+    if offset + 1 >= len(data):
+        raise ValueError("Not enough data to decode composite value")
+
+    composite_byte = data[offset]
+    if composite_byte == CompositeType.PRIMITIVE:
+        skipper = _VALUE_SKIPPERS[data[offset + 1]]
+        if skipper is None:
+            raise ValueError(f"Unknown data type: {data[offset + 1]}")
+        return skipper(data, offset + 2)
+
+    if composite_byte == CompositeType.ARRAY:
+        count, offset = _decode_length(data, offset + 1)
+    elif composite_byte == CompositeType.MAP:
+        count, offset = _decode_length(data, offset + 1)
+        count *= 2
+    else:
+        raise ValueError(f"Unknown composite type: {composite_byte}")
+
+    for _ in range(count):
+        offset = _skip_composite(data, offset)
+    return offset
+
+
+# Payload size of fixed-width primitives, by type byte; sized types are -1.
+_FIXED_SIZES = [0] * 256
+_FIXED_SIZES[DataType.BOOL] = 1
+_FIXED_SIZES[DataType.INT] = 8
+_FIXED_SIZES[DataType.FLOAT] = 8
+_FIXED_SIZES[DataType.STRING] = -1
+_FIXED_SIZES[DataType.BLOB] = -1
+
+
+def _index(data: memoryview, offset: int, count: int) -> array:
+    offsets = array('Q')
+    append = offsets.append
+    size = len(data)
+    unpack_length = _LENGTH.unpack_from
+
+    for _ in range(count):
+        append(offset)
+        # Primitive elements are skipped inline; anything else takes the general path.
+        if offset + 1 < size and data[offset] == _PRIMITIVE:
+            width = _FIXED_SIZES[data[offset + 1]]
+            if width > 0:
+                offset += 2 + width
+                continue
+            if width < 0 and offset + 6 <= size:
+                offset += 6 + unpack_length(data, offset + 2)[0]
+                continue
+        offset = _skip_composite(data, offset)
+
+    if offset > size:
+        raise ValueError("Not enough data to skip value")
+    append(offset)
+    return offsets
+
+
+class LazyArray(Sequence):
+    """Read-only view of an encoded array that decodes elements on first access.
+
+    Construction makes one pass over the buffer to record where each element
+    starts; nothing is decoded until it is read, and decoded elements are kept.
+    """
+
+    def __init__(self, data: Buffer, offset: int = 0):
+        view = _as_view(data)
+        if offset >= len(view) or view[offset] != CompositeType.ARRAY:
+            raise ValueError("Not an encoded array")
+
+        count, start = _decode_length(view, offset + 1)
+        self._data = view
+        self._offsets = _index(view, start, count)
+        self._values = [_MISSING] * count
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the encoded array, including its header."""
+        return self._offsets[-1] - self._offsets[0] + 5
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _load(self, index: int) -> Any:
+        value = self._values[index]
+        if value is _MISSING:
+            value, _ = _decode_element(self._data, self._offsets[index])
+            self._values[index] = value
+        return value
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self._load(i) for i in range(*index.indices(len(self._values)))]
+        if index < 0:
+            index += len(self._values)
+        if not 0 <= index < len(self._values):
+            raise IndexError("LazyArray index out of range")
+        return self._load(index)
+
+    def __iter__(self) -> Iterator[Any]:
+        for i in range(len(self._values)):
+            yield self._load(i)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (LazyArray, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"LazyArray(len={len(self)})"
+
+    def to_list(self) -> list:
+        return list(self)
+
+
+class LazyMap(Mapping):
+    """Read-only view of an encoded map that decodes values on first access.
+
+    Keys are decoded once up front to build the lookup index; values stay
+    encoded until they are read.
+    """
+
+    def __init__(self, data: Buffer, offset: int = 0):
+        view = _as_view(data)
+        if offset >= len(view) or view[offset] != CompositeType.MAP:
+            raise ValueError("Not an encoded map")
+
+        count, offset = _decode_length(view, offset + 1)
+        self._data = view
+        self._offsets: Dict[Any, int] = {}
+        self._values: Dict[Any, Any] = {}
+
+        for _ in range(count):
+            key, offset = _decode_element(view, offset)
+            self._offsets[key] = offset
+            offset = _skip_composite(view, offset)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, key: Any) -> Any:
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        value, _ = _decode_element(self._data, self._offsets[key])
+        self._values[key] = value
+        return value
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._offsets)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._offsets
+
+    def __repr__(self) -> str:
+        return f"LazyMap(len={len(self)})"
+
+    def to_dict(self) -> dict:
+        return {key: self[key] for key in self._offsets}
+
+
+def decode_lazy(data: Buffer, offset: int = 0) -> Any:
+    """Wrap an encoded array or map in a lazy view; other values are decoded eagerly."""
+    view = _as_view(data)
+    if offset < len(view):
+        if view[offset] == CompositeType.ARRAY:
+            return LazyArray(view, offset)
+        if view[offset] == CompositeType.MAP:
+            return LazyMap(view, offset)
+    value, _ = _decode_composite(view, offset)
+    return value
@@ -0,0 +1,87 @@
+import struct
+from typing import Any, Optional, Tuple
+
+from .types import CompositeType, DataType
+from .decoder import Buffer, ProtocolDecoder
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+if np is not None:
+    # Request elements follow ProtocolEncoder.encode_value: type byte, then payload.
+    _INT_ELEMENT = np.dtype([('type', 'u1'), ('value', '<i8')])
+    _FLOAT_ELEMENT = np.dtype([('type', 'u1'), ('value', '<f8')])
+    _BOOL_ELEMENT = np.dtype([('type', 'u1'), ('value', 'u1')])
+
+    # Response elements are composite values: composite byte, type byte, payload.
+    _SLICE_ELEMENT = np.dtype([('composite', 'u1'), ('type', 'u1'), ('value', '<i8')])
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("NumPy is required for this operation (pip install numpy)")
+
+
+def encode_numeric_array(values: Any) -> Tuple[DataType, Any]:
+    """Encode a 1-D int, float or bool array as a contiguous run of INSERT elements."""
+    _require_numpy()
+
+    array = np.asarray(values)
+    if array.ndim != 1:
+        raise ValueError("Only one-dimensional arrays are supported")
+
+    kind = array.dtype.kind
+    if kind in 'iu':
+        if kind == 'u' and array.size and array.max() > np.iinfo(np.int64).max:
+            raise ValueError("Array values do not fit in a signed 64-bit integer")
+        data_type, element = DataType.INT, _INT_ELEMENT
+    elif kind == 'f':
+        data_type, element = DataType.FLOAT, _FLOAT_ELEMENT
+    elif kind == 'b':
+        data_type, element = DataType.BOOL, _BOOL_ELEMENT
+    else:
+        raise ValueError(f"Unsupported array dtype: {array.dtype}")
+
+    records = np.empty(len(array), dtype=element)
+    records['type'] = data_type
+    records['value'] = array
+    return data_type, records
+
+
+def decode_numeric_array(payload: Optional[Buffer], dtype: Any = None) -> Any:
+    """Decode a SLICE response payload into an ndarray without per-element Python objects."""
+    _require_numpy()
+
+    if not payload:
+        return np.empty(0, dtype=dtype if dtype is not None else np.float64)
+
+    view = memoryview(payload)
+    if view[0] == CompositeType.ARRAY and len(view) >= 5:
+        count = struct.unpack_from('<I', view, 1)[0]
+
+        # The fixed-stride view is only valid if every element is a 10-byte
+        # int or float. Records are checked in order, so a shorter element
+        # shows up as a bad type byte before any misaligned record is trusted.
+        if len(view) == 5 + _SLICE_ELEMENT.itemsize * count:
+            records = np.frombuffer(view, dtype=_SLICE_ELEMENT, count=count, offset=5)
+            types = records['type']
+            if (records['composite'] == CompositeType.PRIMITIVE).all():
+                ints = records['value']
+                if (types == DataType.INT).all():
+                    values = ints
+                elif (types == DataType.FLOAT).all():
+                    values = ints.view('<f8')
+                elif np.isin(types, (DataType.INT, DataType.FLOAT)).all():
+                    values = np.where(types == DataType.INT, ints, ints.view('<f8'))
+                else:
+                    values = None
+
+                if values is not None:
+                    # astype copies, so the result never aliases the receive buffer.
+                    return values.astype(dtype if dtype is not None else values.dtype)
+
+    decoded, _ = ProtocolDecoder.decode_composite_value(view)
+    return np.asarray(decoded, dtype=dtype)
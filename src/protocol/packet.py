@@ -1,28 +1,102 @@
 import struct
-from typing import Any
-from .types import CompositeType, DataType, Operation, Status
-from .encoder import ProtocolEncoder
+from typing import Any, List, Optional, Sequence, Union
+from .types import CompositeType, DataType, Operation, ResponseSchema, Status
+from .encoder import Buffer, ProtocolEncoder
 from .decoder import ProtocolDecoder
+from .lazy import decode_lazy
+
+
+_REQUEST_HEADER = struct.Struct('<IBBI')
+
+_RESPONSE_SCHEMAS = {
+    (CompositeType.PRIMITIVE, Operation.GET): ResponseSchema.VALUE,
+    (CompositeType.PRIMITIVE, Operation.SET): ResponseSchema.NONE,
+    (CompositeType.PRIMITIVE, Operation.REMOVE): ResponseSchema.NONE,
+    (CompositeType.PRIMITIVE, Operation.LEN): ResponseSchema.VALUE,
+    (CompositeType.PRIMITIVE, Operation.APPEND): ResponseSchema.NONE,
+    (CompositeType.PRIMITIVE, Operation.INCREMENT): ResponseSchema.VALUE,
+    (CompositeType.PRIMITIVE, Operation.DECREMENT): ResponseSchema.VALUE,
+
+    (CompositeType.ARRAY, Operation.LEN): ResponseSchema.VALUE,
+    (CompositeType.ARRAY, Operation.INSERT): ResponseSchema.NONE,
+    (CompositeType.ARRAY, Operation.ARRAY_REMOVE): ResponseSchema.NONE,
+    (CompositeType.ARRAY, Operation.SLICE): ResponseSchema.COMPOSITE,
+
+    (CompositeType.MAP, Operation.MAP_GET): ResponseSchema.VALUE,
+    (CompositeType.MAP, Operation.MAP_SET): ResponseSchema.NONE,
+    (CompositeType.MAP, Operation.MAP_REMOVE): ResponseSchema.NONE,
+    (CompositeType.MAP, Operation.MAP_CONTAINS): ResponseSchema.VALUE,
+    (CompositeType.MAP, Operation.MAP_KEYS): ResponseSchema.COMPOSITE,
+    (CompositeType.MAP, Operation.MAP_VALUES): ResponseSchema.COMPOSITE,
+}
+
+# Operations that leave the store unchanged, so they may be repeated or served by a replica.
+_READ_ONLY = {
+    (CompositeType.PRIMITIVE, Operation.GET),
+    (CompositeType.PRIMITIVE, Operation.LEN),
+    (CompositeType.ARRAY, Operation.LEN),
+    (CompositeType.ARRAY, Operation.SLICE),
+    (CompositeType.MAP, Operation.MAP_GET),
+    (CompositeType.MAP, Operation.MAP_CONTAINS),
+    (CompositeType.MAP, Operation.MAP_KEYS),
+    (CompositeType.MAP, Operation.MAP_VALUES),
+}
+
+# Sending these twice leaves the same state and answer. Removes are left out:
+# a replayed remove reports NOT_FOUND.
+_IDEMPOTENT = _READ_ONLY | {
+    (CompositeType.PRIMITIVE, Operation.SET),
+    (CompositeType.MAP, Operation.MAP_SET),
+}
 
 
 class RequestPacket:
     def __init__(self, composite: CompositeType, primitive: DataType,
-                 operation: Operation, key: str, params: bytes = b''):
+                 operation: Operation, key: str,
+                 params: Union[Buffer, Sequence[Buffer]] = b'',
+                 schema: Optional[ResponseSchema] = None):
         self.composite = composite
         self.primitive = primitive
         self.operation = operation
         self.key = key
+        # A list of buffers is framed as-is, so large values are never joined.
+        if isinstance(params, list) and len(params) == 1:
+            params = params[0]
         self.params = params
+        self.schema = schema
 
-    def to_bytes(self) -> bytes:
+    @property
+    def response_schema(self) -> Optional[ResponseSchema]:
+        if self.schema is not None:
+            return self.schema
+        return _RESPONSE_SCHEMAS.get((self.composite, self.operation))
+
+    @property
+    def is_read_only(self) -> bool:
+        return (self.composite, self.operation) in _READ_ONLY
+
+    @property
+    def is_idempotent(self) -> bool:
+        return (self.composite, self.operation) in _IDEMPOTENT
+
+    def to_buffers(self) -> List[Buffer]:
         key_bytes = self.key.encode('utf-8')
 
+        if isinstance(self.params, (bytes, bytearray, memoryview)):
+            params = [self.params]
+        else:
+            params = list(self.params)
+        params_length = sum(memoryview(buffer).nbytes for buffer in params)
+
         type_byte = ProtocolEncoder.encode_type_byte(self.composite, self.primitive)
-        packet_data = struct.pack('<BB', type_byte, self.operation)
-        packet_data += struct.pack('<I', len(key_bytes)) + key_bytes
-        packet_data += self.params
+        header = _REQUEST_HEADER.pack(
+            2 + 4 + len(key_bytes) + params_length, type_byte, self.operation, len(key_bytes)
+        )
 
-        return struct.pack('<I', len(packet_data)) + packet_data
+        return [header + key_bytes] + [buffer for buffer in params if len(buffer)]
+
+    def to_bytes(self) -> bytes:
+        return b''.join(self.to_buffers())
 
 
 class ResponsePacket:
@@ -31,29 +105,52 @@ class ResponsePacket:
         self.data = data
 
     @classmethod
-    def from_bytes(cls, data: bytes) -> 'ResponsePacket':
+    def from_bytes(cls, data: Buffer, schema: Optional[ResponseSchema] = None) -> 'ResponsePacket':
         if len(data) < 1:
             raise ValueError("Response too short")
 
-        status = Status(data[0])
+        view = memoryview(data)
+        status = Status(view[0])
+
+        if schema is None:
+            return cls(status, cls._guess_data(view))
+
+        if schema == ResponseSchema.NONE or status != Status.OK or len(view) == 1:
+            return cls(status)
+
+        if schema == ResponseSchema.VALUE:
+            response_data, _ = ProtocolDecoder.decode_value(view, 1)
+        elif schema == ResponseSchema.RAW:
+            # Left undecoded for callers with a bulk decoder of their own.
+            response_data = view[1:]
+        elif schema == ResponseSchema.LAZY:
+            response_data = decode_lazy(view, 1)
+        else:
+            response_data, _ = ProtocolDecoder.decode_composite_value(view, 1)
+
+        return cls(status, response_data)
+
+    @staticmethod
+    def _guess_data(view: memoryview) -> Any:
+        # Used only when the request that produced this response is unknown.
         response_data = None
 
-        if len(data) > 1:
+        if len(view) > 1:
             try:
-                response_data, _ = ProtocolDecoder.decode_value(data[1:])
+                response_data, _ = ProtocolDecoder.decode_value(view, 1)
             except:
-                remaining_data = data[1:]
+                remaining_data = view[1:]
                 if len(remaining_data) >= 4:
-                    data_length = struct.unpack('<I', remaining_data[:4])[0]
+                    data_length = struct.unpack_from('<I', remaining_data)[0]
                     if len(remaining_data) >= 4 + data_length:
-                        raw_data = remaining_data[4:4 + data_length]
+                        raw_data = remaining_data[4:4 + data_length].tobytes()
                         try:
                             response_data = raw_data.decode('utf-8')
                         except UnicodeDecodeError:
                             response_data = raw_data
                     else:
-                        response_data = remaining_data
+                        response_data = remaining_data.tobytes()
                 else:
-                    response_data = remaining_data
+                    response_data = remaining_data.tobytes()
 
-        return cls(status, response_data)
\ No newline at end of file
+        return response_data
@@ -0,0 +1,139 @@
+import struct
+from typing import Any, AsyncIterator, Awaitable, Callable, Generator, Iterator, Tuple, Union
+
+from .types import CompositeType, DataType
+from .decoder import Buffer, _LENGTH, _PRIMITIVE
+
+
+# A parser yields an int when it needs exactly that many more bytes (which the
+# driver sends back in), and a 1-tuple for every top-level element it decodes.
+# Keeping the parser free of I/O lets the sync and asyncio drivers share it.
+Request = Union[int, Tuple[Any]]
+Parser = Generator[Request, Buffer, None]
+
+_INT = struct.Struct('<q')
+_FLOAT = struct.Struct('<d')
+
+
+def _read_value(type_byte: int) -> Generator[int, Buffer, Any]:
+    if type_byte == DataType.INT:
+        return _INT.unpack((yield 8))[0]
+    if type_byte == DataType.FLOAT:
+        return _FLOAT.unpack((yield 8))[0]
+    if type_byte == DataType.BOOL:
+        return bool((yield 1)[0])
+    if type_byte not in (DataType.STRING, DataType.BLOB):
+        raise ValueError(f"Unknown data type: {type_byte}")
+
+    length = _LENGTH.unpack((yield 4))[0]
+    payload = (yield length) if length else b''
+    return str(payload, 'utf-8') if type_byte == DataType.STRING else bytes(payload)
+
+
+def _read_element() -> Generator[int, Buffer, Any]:
+    return (yield from _read_rest((yield 2)))
+
+
+def _read_rest(header: Buffer) -> Generator[int, Buffer, Any]:
+    # Finish an element whose two-byte header has already been read.
+    composite_byte = header[0]
+    if composite_byte == _PRIMITIVE:
+        return (yield from _read_value(header[1]))
+
+    if composite_byte not in (CompositeType.ARRAY, CompositeType.MAP):
+        raise ValueError(f"Unknown composite type: {composite_byte}")
+
+    # The second header byte is the first byte of the element count.
+    count = _LENGTH.unpack(bytes(header[1:2]) + bytes((yield 3)))[0]
+
+    if composite_byte == CompositeType.ARRAY:
+        array = []
+        for _ in range(count):
+            array.append((yield from _read_element()))
+        return array
+
+    result = {}
+    for _ in range(count):
+        key = yield from _read_element()
+        result[key] = yield from _read_element()
+    return result
+
+
+def parse_stream() -> Parser:
+    """Parse a composite payload element by element.
+
+    Arrays yield their elements; maps yield ``(key, value)`` pairs; a primitive
+    payload yields the single value. Nested composites are decoded whole.
+    """
+    header = yield 1
+    composite_byte = header[0]
+
+    if composite_byte == _PRIMITIVE:
+        type_byte = (yield 1)[0]
+        yield ((yield from _read_value(type_byte)),)
+        return
+
+    if composite_byte not in (CompositeType.ARRAY, CompositeType.MAP):
+        raise ValueError(f"Unknown composite type: {composite_byte}")
+
+    count = _LENGTH.unpack((yield 4))[0]
+    if composite_byte == CompositeType.MAP:
+        for _ in range(count):
+            key = yield from _read_element()
+            yield ((key, (yield from _read_element())),)
+        return
+
+    int_type, float_type = DataType.INT.value, DataType.FLOAT.value
+    for _ in range(count):
+        header = yield 2
+        # Numeric elements dominate large arrays; decode them without a sub-generator.
+        if header[0] == _PRIMITIVE and header[1] == int_type:
+            yield (_INT.unpack((yield 8))[0],)
+        elif header[0] == _PRIMITIVE and header[1] == float_type:
+            yield (_FLOAT.unpack((yield 8))[0],)
+        else:
+            yield ((yield from _read_rest(header)),)
+
+
+def iter_stream(read: Callable[[int], Buffer], length: int) -> Iterator[Any]:
+    """Drive ``parse_stream`` over a payload of ``length`` bytes pulled through ``read``."""
+    parser = parse_stream()
+    consumed = 0
+    try:
+        request = parser.send(None)
+        while True:
+            if type(request) is int:
+                consumed += request
+                if consumed > length:
+                    raise ValueError("Response is shorter than its contents")
+                request = parser.send(read(request))
+            else:
+                yield request[0]
+                request = parser.send(None)
+    except StopIteration:
+        pass
+
+    if consumed != length:
+        raise ValueError("Response is longer than its contents")
+
+
+async def aiter_stream(read: Callable[[int], Awaitable[Buffer]], length: int) -> AsyncIterator[Any]:
+    """Asyncio counterpart of ``iter_stream``."""
+    parser = parse_stream()
+    consumed = 0
+    try:
+        request = parser.send(None)
+        while True:
+            if type(request) is int:
+                consumed += request
+                if consumed > length:
+                    raise ValueError("Response is shorter than its contents")
+                request = parser.send(await read(request))
+            else:
+                yield request[0]
+                request = parser.send(None)
+    except StopIteration:
+        pass
+
+    if consumed != length:
+        raise ValueError("Response is longer than its contents")
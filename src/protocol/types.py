@@ -44,4 +44,12 @@ class Status(IntEnum):
     NOT_FOUND = 128
     WRONG_TYPE = 129
     OUT_OF_RANGE = 130
-    INTERNAL_ERROR = 255
\ No newline at end of file
+    INTERNAL_ERROR = 255
+
+
+class ResponseSchema(IntEnum):
+    NONE = 0
+    VALUE = 1
+    COMPOSITE = 2
+    RAW = 3
+    LAZY = 4
@@ -0,0 +1,246 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, TypeVar
+
+from src.client import ValkyrieClient
+from src.connection.hash_ring import DEFAULT_VNODES, HashRing
+from src.connection.nodes import Node, parse_node
+from src.operations.batch import DEFAULT_WINDOW
+from src.exceptions.errors import ValkyrieConnectionError
+
+
+T = TypeVar('T')
+
+
+def group_by_node(ring: HashRing, keys: Iterable[str]) -> Dict[str, List[str]]:
+    groups: Dict[str, List[str]] = {}
+    for key in keys:
+        groups.setdefault(ring.node_for(key), []).append(key)
+    return groups
+
+
+def merge_in_order(keys: Iterable[str], results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge per-node result dicts back into the order of ``keys``."""
+    merged = {key: value for values in results.values() for key, value in values.items()}
+    return {key: merged[key] for key in keys}
+
+
+class ShardedOperations:
+    """Routes each call to the shard owning its first argument, the key.
+
+    Wraps the ``primitives``, ``maps`` or ``arrays`` attribute of the shard
+    clients. Every operation that names one key first is available
+    unchanged, including the ``maps`` ``*_many`` methods, whose fields all
+    live under one key. ``ShardedPrimitives`` adds the multi-key methods.
+    """
+
+    def __init__(self, client, attribute: str):
+        self._client = client
+        self._attribute = attribute
+
+    def _operations(self, client):
+        operations = getattr(client, self._attribute)
+        if operations is None:
+            raise ValkyrieConnectionError("Not connected")
+        return operations
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        def call(key: str, *args, **kwargs):
+            return getattr(self._operations(self._client.client_for(key)), name)(key, *args, **kwargs)
+        return call
+
+
+class ShardedPrimitives(ShardedOperations):
+    """``primitives`` of a sharded client; ``get_many``, ``set_many`` and
+    ``remove_many`` split their keys by node and run the batches in parallel.
+    """
+
+    def __init__(self, client):
+        super().__init__(client, 'primitives')
+
+    def _split(self, keys: List[str], call: Callable[[Any, List[str]], Dict[str, Any]]) -> Dict[str, Any]:
+        groups = group_by_node(self._client.ring, keys)
+        results = self._client._run({
+            name: (lambda operations=self._operations(self._client.clients[name]), group=group:
+                   call(operations, group))
+            for name, group in groups.items()
+        })
+        return merge_in_order(keys, results)
+
+    def get_many(self, keys: Iterable[str], raise_on_error: bool = False,
+                 window: int = DEFAULT_WINDOW) -> Dict[str, Any]:
+        return self._split(list(keys), lambda operations, group:
+                           operations.get_many(group, raise_on_error=raise_on_error, window=window))
+
+    def set_many(self, mapping: Mapping[str, Any], raise_on_error: bool = False,
+                 window: int = DEFAULT_WINDOW) -> Dict[str, Any]:
+        return self._split(list(mapping), lambda operations, group: operations.set_many(
+            {key: mapping[key] for key in group}, raise_on_error=raise_on_error, window=window))
+
+    def remove_many(self, keys: Iterable[str], raise_on_error: bool = False,
+                    window: int = DEFAULT_WINDOW) -> Dict[str, Any]:
+        return self._split(list(keys), lambda operations, group:
+                           operations.remove_many(group, raise_on_error=raise_on_error, window=window))
+
+
+class ShardedValkyrieClient:
+    """Spreads keys over several servers with a consistent-hash ring.
+
+    Every key lives on exactly one node, chosen by ``HashRing``; keys sharing
+    a ``{tag}`` share a node. ``primitives``, ``maps`` and ``arrays`` and the
+    single-key methods behave like ``ValkyrieClient``'s. ``mget``, ``mset``
+    and ``mremove`` split their keys by node and run the per-node batches in
+    parallel. Pipelines span one connection, so take them from
+    ``client_for(key)`` for keys on the same node.
+
+    Extra keyword arguments are passed to each node's ``ValkyrieClient``.
+    """
+
+    def __init__(self, nodes: Sequence[Node], password: str = '', vnodes: int = DEFAULT_VNODES,
+                 max_workers: Optional[int] = None, **client_kwargs):
+        if not nodes:
+            raise ValueError("At least one node is required")
+
+        self.password = password
+        self.max_workers = max_workers
+        self.client_kwargs = client_kwargs
+        self.ring = HashRing(vnodes=vnodes)
+        self.clients: Dict[str, ValkyrieClient] = {}
+        for node in nodes:
+            name, _ = self._add(node)
+            self.ring.add(name)
+
+        self.primitives = ShardedPrimitives(self)
+        self.maps = ShardedOperations(self, 'maps')
+        self.arrays = ShardedOperations(self, 'arrays')
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _add(self, node: Node) -> Tuple[str, ValkyrieClient]:
+        host, port = parse_node(node)
+        name = f"{host}:{port}"
+        if name in self.clients:
+            raise ValueError(f"Node {name!r} is already configured")
+        client = ValkyrieClient(host, port, self.password, **self.client_kwargs)
+        self.clients[name] = client
+        return name, client
+
+    def connect(self) -> None:
+        self._executor = ThreadPoolExecutor(self.max_workers or len(self.clients),
+                                            thread_name_prefix='ValkyrieShard')
+        try:
+            self._run({name: client.connect for name, client in self.clients.items()})
+        except Exception:
+            self.disconnect()
+            raise
+
+    def disconnect(self) -> None:
+        for client in self.clients.values():
+            client.disconnect()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def add_node(self, node: Node) -> str:
+        """Add a node, connecting to it first if the client is connected.
+
+        About 1/N of the keys move to the new node; their existing values are
+        not copied over.
+        """
+        connected = self.is_connected
+        name, client = self._add(node)
+        if connected:
+            try:
+                client.connect()
+            except Exception:
+                del self.clients[name]
+                raise
+        self.ring.add(name)
+        return name
+
+    def remove_node(self, node: Node) -> None:
+        host, port = parse_node(node)
+        name = f"{host}:{port}"
+        if len(self.clients) == 1 and name in self.clients:
+            raise ValueError("Cannot remove the last node")
+        self.ring.remove(name)
+        self.clients.pop(name).disconnect()
+
+    def client_for(self, key: str) -> ValkyrieClient:
+        return self.clients[self.ring.node_for(key)]
+
+    def _run(self, calls: Dict[str, Callable[[], T]]) -> Dict[str, T]:
+        # Calls for a single node run inline; others go to the executor.
+        if len(calls) == 1 or self._executor is None:
+            return {name: call() for name, call in calls.items()}
+
+        futures = {name: self._executor.submit(call) for name, call in calls.items()}
+        results: Dict[str, T] = {}
+        error: Optional[BaseException] = None
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except BaseException as e:
+                if error is None:
+                    error = e
+        if error is not None:
+            raise error
+        return results
+
+    @property
+    def is_connected(self) -> bool:
+        return bool(self.clients) and all(client.is_connected for client in self.clients.values())
+
+    def get(self, key: str):
+        return self.client_for(key).get(key)
+
+    def set(self, key: str, value):
+        return self.client_for(key).set(key, value)
+
+    def remove(self, key: str):
+        return self.client_for(key).remove(key)
+
+    def length(self, key: str):
+        return self.client_for(key).length(key)
+
+    def append(self, key: str, value: str):
+        return self.client_for(key).append(key, value)
+
+    def increment(self, key: str):
+        return self.client_for(key).increment(key)
+
+    def decrement(self, key: str):
+        return self.client_for(key).decrement(key)
+
+    def mget(self, keys: Iterable[str], window: int = DEFAULT_WINDOW) -> Dict[str, Any]:
+        """Like ``ValkyrieClient.mget``, with each node's keys fetched in parallel."""
+        keys = list(keys)
+        groups = group_by_node(self.ring, keys)
+        results = self._run({
+            name: (lambda client=self.clients[name], group=group: client.mget(group, window))
+            for name, group in groups.items()
+        })
+        return merge_in_order(keys, results)
+
+    def mset(self, mapping: Mapping[str, Any], window: int = DEFAULT_WINDOW) -> None:
+        groups = group_by_node(self.ring, mapping)
+        self._run({
+            name: (lambda client=self.clients[name], group=group:
+                   client.mset({key: mapping[key] for key in group}, window))
+            for name, group in groups.items()
+        })
+
+    def mremove(self, keys: Iterable[str], window: int = DEFAULT_WINDOW) -> Dict[str, Any]:
+        keys = list(keys)
+        groups = group_by_node(self.ring, keys)
+        results = self._run({
+            name: (lambda client=self.clients[name], group=group: client.mremove(group, window))
+            for name, group in groups.items()
+        })
+        return merge_in_order(keys, results)
+
+    def __enter__(self):
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.disconnect()
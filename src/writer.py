@@ -0,0 +1,212 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, List, Optional, Tuple
+
+from src.connection.replica_router import primary_reads
+from src.protocol.types import Status
+from src.exceptions.errors import (
+    ValkyrieConnectionError, ValkyrieError, ValkyrieServerError, ValkyrieTimeoutError
+)
+
+
+class ArrayWriter:
+    """Buffers values and appends them to the end of an array in batches.
+
+    A background thread flushes the buffer as one ``INSERT`` at the array's
+    current length once ``max_batch`` values are waiting or the oldest has
+    waited ``max_delay_ms``. ``append`` only touches the local buffer; when
+    ``max_pending`` values are already waiting it blocks until a flush makes
+    room. A failed flush keeps its values buffered and the error is raised
+    once, from the next ``append``, ``flush`` or ``close``; the background
+    flusher then tries again, so a transient failure does not stop the writer.
+
+    ``INSERT`` is not idempotent, and a connection can drop after the server
+    applied it. Before retrying a batch, the writer re-reads the length: if
+    the array grew by exactly that batch since the failed attempt, the batch
+    counts as sent. This relies on the writer being the array's only
+    appender, which inserting at the current length already assumes.
+    """
+
+    def __init__(self, client, key: str, max_batch: int = 1000,
+                 max_delay_ms: Optional[float] = 50.0, max_pending: Optional[int] = None):
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        if max_pending is None:
+            max_pending = 10 * max_batch
+        if max_pending < max_batch:
+            raise ValueError("max_pending must be at least max_batch")
+
+        self.client = client
+        self.key = key
+        self.max_batch = max_batch
+        self.max_delay = None if max_delay_ms is None else max_delay_ms / 1000
+        self.max_pending = max_pending
+        self.flush_count = 0
+
+        self._buffer: Deque[Any] = deque()
+        self._deadline: Optional[float] = None
+        self._error: Optional[Exception] = None
+        # (index, size) of an INSERT that failed without saying whether it was applied.
+        self._unconfirmed: Optional[Tuple[int, int]] = None
+        self._closed = False
+        self._condition = threading.Condition(threading.Lock())
+        # Held for a whole flush so batches reach the server in append order.
+        self._flush_lock = threading.Lock()
+
+        self._thread = threading.Thread(target=self._run, name=f"ArrayWriter({key})", daemon=True)
+        self._thread.start()
+
+    def append(self, value: Any, timeout: Optional[float] = None) -> None:
+        """Buffer ``value``, waiting up to ``timeout`` seconds for room if the buffer is full."""
+        with self._condition:
+            self._check()
+            if len(self._buffer) >= self.max_pending:
+                has_room = self._condition.wait_for(
+                    lambda: len(self._buffer) < self.max_pending or self._closed or self._error is not None,
+                    timeout
+                )
+                self._check()
+                if not has_room:
+                    raise ValkyrieTimeoutError("ArrayWriter buffer is full")
+
+            self._buffer.append(value)
+            if len(self._buffer) == 1:
+                if self.max_delay is not None:
+                    self._deadline = time.monotonic() + self.max_delay
+                self._condition.notify_all()
+            elif len(self._buffer) == self.max_batch:
+                self._condition.notify_all()
+
+    def flush(self) -> None:
+        """Send everything buffered so far, in the calling thread."""
+        with self._condition:
+            self._check()
+        self._drain()
+
+    def close(self) -> None:
+        """Stop the background flusher and send whatever is still buffered.
+
+        A background failure that was never reported only surfaces if the
+        final drain fails too; otherwise its values have been sent after all.
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+
+        self._error = None
+        self._drain()
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _check(self) -> None:
+        # Called with the condition held.
+        if self._error is not None:
+            error = self._error
+            # Reported once; the flusher retries the buffered values after that.
+            self._error = None
+            self._condition.notify_all()
+            raise error
+        if self._closed:
+            raise ValkyrieError("ArrayWriter is closed")
+
+    def _ready(self) -> bool:
+        if not self._buffer:
+            return False
+        if len(self._buffer) >= self.max_batch:
+            return True
+        return self._deadline is not None and time.monotonic() >= self._deadline
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                # After a failure, wait until a caller has seen the error before retrying.
+                while not self._closed and (self._error is not None or not self._ready()):
+                    timeout = None
+                    if self._error is None and self._buffer and self._deadline is not None:
+                        timeout = max(self._deadline - time.monotonic(), 0)
+                    self._condition.wait(timeout)
+                if self._closed:
+                    return
+
+            try:
+                self._flush_batch()
+            except Exception as e:
+                with self._condition:
+                    self._error = e
+                    self._condition.notify_all()
+
+    def _drain(self) -> None:
+        while self._buffer:
+            self._flush_batch()
+
+    def _flush_batch(self) -> None:
+        with self._flush_lock:
+            with self._condition:
+                count = min(len(self._buffer), self.max_batch)
+                if self._unconfirmed is not None:
+                    # Retry the same values, so a grown length can be matched against them.
+                    count = min(len(self._buffer), self._unconfirmed[1])
+                batch = [self._buffer.popleft() for _ in range(count)]
+                if self._buffer and self.max_delay is not None:
+                    self._deadline = time.monotonic() + self.max_delay
+                else:
+                    self._deadline = None
+                self._condition.notify_all()
+
+            if not batch:
+                return
+
+            try:
+                self._insert(batch)
+            except BaseException:
+                with self._condition:
+                    self._buffer.extendleft(reversed(batch))
+                    if self.max_delay is not None:
+                        self._deadline = time.monotonic() + self.max_delay
+                raise
+            self.flush_count += 1
+
+    def _insert(self, batch: List[Any]) -> None:
+        arrays = self.client.arrays
+        if not arrays:
+            raise ValkyrieConnectionError("Not connected")
+
+        try:
+            # A lagging replica would report a stale length and misplace the batch.
+            with primary_reads():
+                index = arrays.length(self.key)
+        except ValkyrieServerError as e:
+            if e.status != Status.NOT_FOUND:
+                raise
+            index = 0
+
+        unconfirmed = self._unconfirmed
+        if unconfirmed is not None and index == unconfirmed[0] + len(batch):
+            # The failed attempt reached the server before the connection dropped.
+            self._unconfirmed = None
+            return
+
+        self._unconfirmed = (index, len(batch))
+        try:
+            arrays.insert(self.key, index, batch)
+        except ValkyrieServerError:
+            # Rejected by the server, so certainly not applied.
+            self._unconfirmed = None
+            raise
+        self._unconfirmed = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
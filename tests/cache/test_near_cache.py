@@ -0,0 +1,130 @@
+import pytest
+from src.cache.near_cache import MISS, CacheHooks, NearCache
+from src.protocol.encoder import ProtocolEncoder
+from src.protocol.packet import RequestPacket, ResponsePacket
+from src.protocol.types import CompositeType, DataType, Operation, Status
+from src.exceptions.errors import error_for_status
+
+
+def get_packet(key):
+    return RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.GET, key)
+
+
+def map_get_packet(key, field):
+    return RequestPacket(CompositeType.MAP, DataType.STRING, Operation.MAP_GET, key,
+                         ProtocolEncoder.encode_string(field))
+
+
+def set_packet(key, value):
+    return RequestPacket(CompositeType.PRIMITIVE, DataType.INT, Operation.SET, key,
+                         ProtocolEncoder.encode_values([value]))
+
+
+class TestNearCache:
+
+    def test_hooks_require_storage_methods(self):
+        class Partial(CacheHooks):
+            def get(self, key, field=None):
+                return MISS
+
+        with pytest.raises(TypeError):
+            Partial()
+
+    def test_get_put_and_counters(self):
+        cache = NearCache()
+
+        assert cache.get("a") is MISS
+        cache.put("a", None, 1)
+        assert cache.get("a") == 1
+
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_lru_eviction(self):
+        cache = NearCache(max_entries=2)
+        cache.put("a", None, 1)
+        cache.put("b", None, 2)
+        cache.get("a")
+        cache.put("c", None, 3)
+
+        assert cache.get("b") is MISS
+        assert cache.get("a") == 1
+        assert cache.evictions == 1
+        assert len(cache) == 2
+
+    def test_byte_budget(self):
+        cache = NearCache(max_bytes=300)
+        cache.put("a", None, "x" * 100)
+        cache.put("b", None, "y" * 100)
+        cache.put("c", None, "z" * 100)
+
+        assert cache.nbytes <= 300
+        assert cache.get("a") is MISS
+        assert cache.evictions == 1
+
+    def test_oversized_value_not_cached(self):
+        cache = NearCache(max_bytes=100)
+        cache.put("a", None, "x" * 1000)
+
+        assert len(cache) == 0
+
+    def test_ttl_expiry(self, clock):
+        cache = NearCache(ttl=10, clock=clock)
+        cache.put("a", None, 1)
+
+        clock.now = 9.9
+        assert cache.get("a") == 1
+        clock.now = 10
+        assert cache.get("a") is MISS
+        assert cache.expirations == 1
+        assert len(cache) == 0
+
+    def test_invalidate_key_drops_fields(self):
+        cache = NearCache()
+        cache.put("user", None, "raw")
+        cache.put("user", "name", "Ada")
+        cache.put("user", "age", 36)
+
+        cache.invalidate("user", "name")
+        assert cache.get("user", "name") is MISS
+        assert cache.get("user", "age") == 36
+
+        cache.invalidate("user")
+        assert len(cache) == 0
+        assert cache.nbytes == 0
+
+    def test_stale_version_is_not_stored(self):
+        cache = NearCache()
+        version = cache.version("a")
+        cache.invalidate("a")
+
+        cache.put("a", None, "old", version)
+        assert cache.get("a") is MISS
+
+    def test_packet_hooks(self):
+        cache = NearCache()
+        token = cache.track(map_get_packet("user", "name"))
+        assert cache.lookup(map_get_packet("user", "name")) is None
+
+        cache.complete(token, ResponsePacket(Status.OK, "Ada"))
+        assert cache.lookup(map_get_packet("user", "name")).data == "Ada"
+
+        cache.complete(cache.track(set_packet("user", 1)), ResponsePacket(Status.OK))
+        assert cache.lookup(map_get_packet("user", "name")) is None
+
+    def test_errors_are_not_cached(self):
+        cache = NearCache()
+        cache.complete(cache.track(get_packet("a")), error_for_status(Status.NOT_FOUND))
+
+        assert len(cache) == 0
+
+    def test_other_operations_are_ignored(self):
+        cache = NearCache()
+        packet = RequestPacket(CompositeType.ARRAY, DataType.STRING, Operation.LEN, "a")
+
+        assert cache.track(packet) is None
+        assert cache.lookup(packet) is None
+
+    def test_invalid_max_entries(self):
+        with pytest.raises(ValueError):
+            NearCache(max_entries=0)
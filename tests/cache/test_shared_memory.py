@@ -0,0 +1,153 @@
+import multiprocessing
+import uuid
+
+import pytest
+
+from src.cache.near_cache import MISS
+from src.cache.shared_memory import SharedMemoryCache
+from src.protocol.packet import RequestPacket, ResponsePacket
+from src.protocol.types import CompositeType, DataType, Operation, Status
+
+
+@pytest.fixture
+def open_cache():
+    name = f"valkyrie-test-{uuid.uuid4().hex[:12]}"
+    caches = []
+
+    def open_(**kwargs):
+        kwargs.setdefault('size', 1024 * 1024)
+        cache = SharedMemoryCache(name, **kwargs)
+        caches.append(cache)
+        return cache
+
+    yield open_
+    for cache in caches:
+        cache.close()
+    if caches:
+        caches[0].unlink()
+
+
+def _put_in_child(name):
+    cache = SharedMemoryCache(name)
+    cache.put("shared", None, ["from", "child", 1])
+    cache.close()
+
+
+class TestSharedMemoryCache:
+
+    def test_round_trip_encodes_values(self, open_cache):
+        cache = open_cache()
+        value = {"name": "Ada", "scores": [1, 2.5, True], "raw": b"\x00\x01"}
+        cache.put("user", None, value)
+
+        assert cache.get("user") == value
+        assert cache.get("other") is MISS
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_shared_between_attached_caches(self, open_cache):
+        first = open_cache()
+        second = open_cache()
+        first.put("a", "field", 1)
+
+        assert second.get("a", "field") == 1
+        second.invalidate("a", "field")
+        assert first.get("a", "field") is MISS
+
+    def test_shared_across_processes(self, open_cache):
+        cache = open_cache()
+        process = multiprocessing.get_context('fork').Process(target=_put_in_child, args=(cache.name,))
+        process.start()
+        process.join(10)
+
+        assert process.exitcode == 0
+        assert cache.get("shared") == ["from", "child", 1]
+
+    def test_field_and_key_are_distinct(self, open_cache):
+        cache = open_cache()
+        cache.put("k", None, "whole")
+        cache.put("k", "", "empty field")
+
+        assert cache.get("k") == "whole"
+        assert cache.get("k", "") == "empty field"
+
+    def test_invalidate_key_drops_fields(self, open_cache):
+        cache = open_cache()
+        cache.put("user", "name", "Ada")
+        cache.put("user", "age", 36)
+        cache.put("other", None, 1)
+
+        cache.invalidate("user")
+
+        assert cache.get("user", "name") is MISS
+        assert cache.get("user", "age") is MISS
+        assert len(cache) == 1
+
+    def test_stale_version_is_not_stored(self, open_cache):
+        cache = open_cache()
+        version = cache.version("a")
+        cache.invalidate("a")
+
+        cache.put("a", None, "old", version)
+        assert cache.get("a") is MISS
+
+    def test_ttl_expiry(self, open_cache, clock):
+        cache = open_cache(ttl=10, clock=clock)
+        cache.put("a", None, 1)
+
+        clock.now += 9.9
+        assert cache.get("a") == 1
+        clock.now += 0.1
+        assert cache.get("a") is MISS
+        assert cache.expirations == 1
+        assert len(cache) == 0
+
+    def test_full_bucket_evicts_least_recently_read(self, open_cache, clock):
+        # Room for exactly one bucket of two slots.
+        cache = open_cache(size=64 + 1024 * 16 + 2 * 256, slot_size=256, ways=2, clock=clock)
+        cache.put("a", None, 1)
+        clock.now += 1
+        cache.put("b", None, 2)
+        clock.now += 1
+        cache.get("a")
+        clock.now += 1
+        cache.put("c", None, 3)
+
+        assert cache.get("b") is MISS
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.evictions == 1
+
+    def test_oversized_and_unencodable_values_skipped(self, open_cache):
+        cache = open_cache(slot_size=128)
+        cache.put("big", None, "x" * 200)
+        cache.put("odd", None, object())
+
+        assert len(cache) == 0
+
+    def test_clear(self, open_cache):
+        cache = open_cache()
+        cache.put("a", None, 1)
+        cache.put("b", "f", 2)
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.nbytes == 0
+
+    def test_attaches_with_existing_geometry(self, open_cache):
+        first = open_cache(slot_size=256, ways=4)
+        second = open_cache(slot_size=512, ways=8)
+
+        assert (second.slot_size, second.ways, second.buckets) == (256, 4, first.buckets)
+
+    def test_packet_hooks(self, open_cache):
+        cache = open_cache()
+        packet = RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.GET, "a")
+        cache.complete(cache.track(packet), ResponsePacket(Status.OK, "v"))
+
+        assert cache.lookup(packet).data == "v"
+
+    def test_invalid_geometry(self):
+        with pytest.raises(ValueError):
+            SharedMemoryCache("unused", slot_size=16)
+        with pytest.raises(ValueError):
+            SharedMemoryCache("unused", size=1024)
@@ -20,3 +20,16 @@ def sample_response_packet():
     from src.protocol.types import Status
     return ResponsePacket(Status.OK, "test_data")
 
+
+class FakeClock:
+    """Stand-in for ``time.monotonic``; tests move ``now`` by hand."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
@@ -1,7 +1,9 @@
+import asyncio
 import pytest
 import struct
-from unittest.mock import Mock
-from src.connection.auth import AuthHandler
+from unittest.mock import AsyncMock, Mock
+from src.connection.auth import AsyncAuthHandler, AuthHandler
+from src.connection.async_connection import AsyncTCPConnection
 from src.connection.connection import TCPConnection
 from src.protocol.types import Status
 from src.exceptions.errors import ValkyrieAuthError
@@ -81,4 +83,25 @@ class TestAuthHandler:
         auth = AuthHandler(mock_connection)
         auth.authenticate("password")
 
-        assert mock_connection.send.call_count == 3
\ No newline at end of file
+        assert mock_connection.send.call_count == 3
+
+class TestAsyncAuthHandler:
+
+    def test_authenticate_success(self):
+        mock_connection = AsyncMock(spec=AsyncTCPConnection)
+        mock_connection.receive.return_value = struct.pack('<I', 1) + bytes([Status.OK])
+
+        asyncio.run(AsyncAuthHandler(mock_connection).authenticate("password123"))
+
+        expected_password = "password123".encode('utf-8')
+        mock_connection.send.assert_awaited_once_with(struct.pack('<I', len(expected_password)) + expected_password)
+        mock_connection.receive.assert_awaited_once_with(5)
+
+    def test_authenticate_invalid_password(self):
+        mock_connection = AsyncMock(spec=AsyncTCPConnection)
+        mock_connection.receive.return_value = struct.pack('<I', 1) + bytes([Status.UNAUTHORIZED])
+
+        with pytest.raises(ValkyrieAuthError, match="Authentication failed: Invalid password"):
+            asyncio.run(AsyncAuthHandler(mock_connection).authenticate("wrong_password"))
+
+        assert mock_connection.send.await_count == 3
@@ -1,10 +1,33 @@
 import pytest
 import socket
 from unittest.mock import Mock, patch, MagicMock
+import time
 from src.connection.connection import TCPConnection
-from src.exceptions.errors import ValkyrieConnectionError
+from src.connection.options import ConnectionOptions
+from src.exceptions.errors import ValkyrieConnectionError, ValkyrieTimeoutError
 import struct
 
+
+def socket_with_chunks(chunks):
+    """Mock socket whose recv_into delivers the given chunks, then EOF."""
+    pending = [bytearray(chunk) for chunk in chunks]
+
+    def recv_into(view, nbytes):
+        if not pending:
+            return 0
+        chunk = pending[0]
+        count = min(len(chunk), nbytes)
+        view[:count] = chunk[:count]
+        del chunk[:count]
+        if not chunk:
+            pending.pop(0)
+        return count
+
+    mock_socket = Mock()
+    mock_socket.recv_into.side_effect = recv_into
+    return mock_socket
+
+
 class TestTCPConnection:
 
     def test_init(self):
@@ -65,6 +88,51 @@ class TestTCPConnection:
         with pytest.raises(ValkyrieConnectionError, match="Failed to send data"):
             conn.send(b"test")
 
+    def test_send_buffers_single_buffer(self):
+        conn = TCPConnection("localhost", 8080)
+        mock_socket = Mock()
+        conn.socket = mock_socket
+
+        conn.send_buffers([b"abc", b"def"])
+
+        mock_socket.sendall.assert_called_once()
+        assert bytes(mock_socket.sendall.call_args[0][0]) == b"abcdef"
+        mock_socket.sendmsg.assert_not_called()
+
+    def test_send_buffers_scatter_gather(self):
+        conn = TCPConnection("localhost", 8080)
+        mock_socket = Mock()
+        sent = bytearray()
+
+        def sendmsg(views):
+            # Accept at most 10000 bytes per call to exercise partial sends.
+            budget = 10000
+            for view in views:
+                chunk = bytes(view[:budget])
+                sent.extend(chunk)
+                budget -= len(chunk)
+                if not budget:
+                    break
+            return 10000 - budget
+
+        mock_socket.sendmsg.side_effect = sendmsg
+        conn.socket = mock_socket
+        large = bytes(range(256)) * 200
+
+        conn.send_buffers([b"head", b"er", large, b"tail"])
+
+        assert bytes(sent) == b"header" + large + b"tail"
+        mock_socket.sendall.assert_not_called()
+
+    def test_send_buffers_failure(self):
+        conn = TCPConnection("localhost", 8080)
+        mock_socket = Mock()
+        mock_socket.sendall.side_effect = Exception("Send failed")
+        conn.socket = mock_socket
+
+        with pytest.raises(ValkyrieConnectionError, match="Failed to send data"):
+            conn.send_buffers([b"test"])
+
     def test_receive_not_connected(self):
         conn = TCPConnection("localhost", 8080)
 
@@ -73,45 +141,87 @@ class TestTCPConnection:
 
     def test_receive_success(self):
         conn = TCPConnection("localhost", 8080)
-        mock_socket = Mock()
-        mock_socket.recv.return_value = b"test"
+        mock_socket = socket_with_chunks([b"test"])
         conn.socket = mock_socket
 
         result = conn.receive(4)
 
         assert result == b"test"
-        mock_socket.recv.assert_called_once_with(4)
+        mock_socket.recv_into.assert_called_once()
 
     def test_receive_partial_data(self):
         conn = TCPConnection("localhost", 8080)
-        mock_socket = Mock()
-        mock_socket.recv.side_effect = [b"te", b"st"]
+        mock_socket = socket_with_chunks([b"te", b"st"])
         conn.socket = mock_socket
 
         result = conn.receive(4)
         assert result == b"test"
-        assert mock_socket.recv.call_count == 2
+        assert mock_socket.recv_into.call_count == 2
 
     def test_receive_connection_closed(self):
         conn = TCPConnection("localhost", 8080)
-        mock_socket = Mock()
-        mock_socket.recv.return_value = b""
+        mock_socket = socket_with_chunks([])
         conn.socket = mock_socket
 
         with pytest.raises(ValkyrieConnectionError, match="Connection closed by server"):
             conn.receive(4)
 
-    def test_receive_response(self):
+    def test_receive_failure(self):
         conn = TCPConnection("localhost", 8080)
         mock_socket = Mock()
+        mock_socket.recv_into.side_effect = OSError("reset")
+        conn.socket = mock_socket
+
+        with pytest.raises(ValkyrieConnectionError, match="Failed to receive data"):
+            conn.receive(4)
+
+    def test_receive_response(self):
+        conn = TCPConnection("localhost", 8080)
         response_data = b"test_response"
         length_bytes = struct.pack('<I', len(response_data))
-        mock_socket.recv.side_effect = [length_bytes, response_data]
-        conn.socket = mock_socket
+        conn.socket = socket_with_chunks([length_bytes, response_data])
 
         result = conn.receive_response()
         assert result == response_data
 
+    def test_receive_response_single_syscall(self):
+        conn = TCPConnection("localhost", 8080)
+        response_data = b"test_response"
+        mock_socket = socket_with_chunks([struct.pack('<I', len(response_data)) + response_data])
+        conn.socket = mock_socket
+
+        assert conn.receive_response() == response_data
+        mock_socket.recv_into.assert_called_once()
+
+    def test_receive_response_reads_ahead(self):
+        conn = TCPConnection("localhost", 8080)
+        frames = [b"first", b"second", b"third"]
+        stream = b"".join(struct.pack('<I', len(frame)) + frame for frame in frames)
+        mock_socket = socket_with_chunks([stream])
+        conn.socket = mock_socket
+
+        assert [conn.receive_response() for _ in frames] == frames
+        mock_socket.recv_into.assert_called_once()
+        assert conn.is_connected
+
+    def test_receive_response_split_across_buffer(self):
+        conn = TCPConnection("localhost", 8080, buffer_size=16)
+        frames = [b"abcdefghij", b"klmnopqrst"]
+        stream = b"".join(struct.pack('<I', len(frame)) + frame for frame in frames)
+        conn.socket = socket_with_chunks([stream[i:i + 5] for i in range(0, len(stream), 5)])
+
+        assert [conn.receive_response() for _ in frames] == frames
+
+    def test_receive_response_larger_than_buffer(self):
+        conn = TCPConnection("localhost", 8080, buffer_size=16)
+        payload = bytes(range(256)) * 40
+        stream = struct.pack('<I', len(payload)) + payload
+        conn.socket = socket_with_chunks([stream[i:i + 1000] for i in range(0, len(stream), 1000)])
+
+        result = conn.receive_response()
+        assert result == payload
+        assert len(result) == len(payload)
+
     def test_is_connected_property(self):
         conn = TCPConnection("localhost", 8080)
         assert not conn.is_connected
@@ -137,4 +247,71 @@ class TestTCPConnection:
             with TCPConnection("localhost", 8080) as conn:
                 assert conn.socket == mock_socket
 
-            mock_socket.close.assert_called_once()
\ No newline at end of file
+            mock_socket.close.assert_called_once()
+
+    @patch('socket.socket')
+    def test_connect_applies_options_and_timeouts(self, mock_socket_class):
+        mock_socket = Mock()
+        mock_socket_class.return_value = mock_socket
+
+        conn = TCPConnection("localhost", 8080, options=ConnectionOptions(connect_timeout=2, read_timeout=5))
+        conn.connect()
+
+        mock_socket.setsockopt.assert_called_once_with(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        assert mock_socket.settimeout.call_args_list == [((2,),), ((5,),)]
+
+    @patch('socket.socket')
+    def test_connect_timeout(self, mock_socket_class):
+        mock_socket = Mock()
+        mock_socket.connect.side_effect = socket.timeout("timed out")
+        mock_socket_class.return_value = mock_socket
+
+        conn = TCPConnection("localhost", 8080, options=ConnectionOptions(connect_timeout=0.1))
+        with pytest.raises(ValkyrieTimeoutError, match="Timed out connecting"):
+            conn.connect()
+        mock_socket.close.assert_called_once()
+        assert conn.socket is None
+
+    def test_read_timeout(self):
+        local, remote = socket.socketpair()
+        conn = TCPConnection("localhost", 8080, options=ConnectionOptions(read_timeout=0.05))
+        conn.socket = local
+        try:
+            with pytest.raises(ValkyrieTimeoutError, match="Timed out receiving"):
+                conn.receive_response()
+
+            remote.sendall(struct.pack('<I', 2) + b"ok")
+            assert conn.receive_response() == b"ok"
+        finally:
+            conn.disconnect()
+            remote.close()
+
+    def test_deadline_bounds_frame_trickling_in(self):
+        local, remote = socket.socketpair()
+        conn = TCPConnection("localhost", 8080, options=ConnectionOptions(read_timeout=1.0))
+        conn.socket = local
+        try:
+            remote.sendall(struct.pack('<I', 10) + b"part")
+            start = time.monotonic()
+            with pytest.raises(ValkyrieTimeoutError):
+                conn.receive_response(deadline=start + 0.05)
+            assert time.monotonic() - start < 0.5
+        finally:
+            conn.disconnect()
+            remote.close()
+
+    def test_expired_deadline_skips_socket(self):
+        conn = TCPConnection("localhost", 8080)
+        conn.socket = Mock()
+
+        with pytest.raises(ValkyrieTimeoutError, match="Deadline exceeded"):
+            conn.send_buffers([b"data"], deadline=time.monotonic() - 1)
+        conn.socket.sendall.assert_not_called()
+        conn.socket.sendmsg.assert_not_called()
+
+    def test_buffered_data_needs_no_time(self):
+        conn = TCPConnection("localhost", 8080)
+        conn.socket = socket_with_chunks([struct.pack('<I', 2) + b"ok"])
+
+        assert conn.receive(4) == struct.pack('<I', 2)
+        assert conn.receive(2, deadline=time.monotonic() - 1) == b"ok"
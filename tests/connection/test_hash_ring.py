@@ -0,0 +1,62 @@
+import pytest
+
+from src.connection.hash_ring import HashRing, hash_key
+from src.exceptions.errors import ValkyrieConnectionError
+
+
+NODES = [f"10.0.0.{i}:8080" for i in range(4)]
+KEYS = [f"user:{i}" for i in range(20000)]
+
+
+class TestHashKey:
+
+    def test_tag_is_hashed(self):
+        assert hash_key("user:{42}:name") == "42"
+        assert hash_key("{a}{b}") == "a"
+
+    def test_untagged_or_empty_tag_uses_whole_key(self):
+        assert hash_key("user:42") == "user:42"
+        assert hash_key("user:{}:name") == "user:{}:name"
+        assert hash_key("user:{42") == "user:{42"
+
+
+class TestHashRing:
+
+    def test_keys_spread_over_nodes(self):
+        ring = HashRing(NODES)
+        counts = {node: 0 for node in NODES}
+        for key in KEYS:
+            counts[ring.node_for(key)] += 1
+
+        for count in counts.values():
+            assert abs(count - len(KEYS) / 4) < len(KEYS) * 0.05
+
+    def test_tagged_keys_share_a_node(self):
+        ring = HashRing(NODES)
+        nodes = {ring.node_for(f"user:{{7}}:{field}") for field in ("name", "email", "age", "x", "y")}
+        assert len(nodes) == 1
+
+    def test_adding_node_moves_about_one_nth(self):
+        ring = HashRing(NODES)
+        before = [ring.node_for(key) for key in KEYS]
+        ring.add("10.0.0.9:8080")
+        after = [ring.node_for(key) for key in KEYS]
+
+        moved = [(old, new) for old, new in zip(before, after) if old != new]
+        assert all(new == "10.0.0.9:8080" for _, new in moved)
+        assert 0.12 < len(moved) / len(KEYS) < 0.28
+
+        ring.remove("10.0.0.9:8080")
+        assert [ring.node_for(key) for key in KEYS] == before
+
+    def test_placement_is_independent_of_node_order(self):
+        assert HashRing(NODES).node_for("k") == HashRing(reversed(NODES)).node_for("k")
+
+    def test_duplicate_node_rejected(self):
+        ring = HashRing(NODES)
+        with pytest.raises(ValueError):
+            ring.add(NODES[0])
+
+    def test_empty_ring(self):
+        with pytest.raises(ValkyrieConnectionError):
+            HashRing().node_for("k")
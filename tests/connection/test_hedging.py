@@ -0,0 +1,60 @@
+import pytest
+
+from src.connection.hedging import HedgePolicy
+
+
+class TestHedgePolicy:
+
+    def test_max_delay_until_warmed_up(self):
+        policy = HedgePolicy(max_delay=0.1, min_samples=20)
+        for _ in range(19):
+            policy.record(0.002)
+        assert policy.next_delay() == 0.1
+
+        policy.record(0.002)
+        assert policy.next_delay() == 0.002
+
+    def test_delay_follows_percentile(self):
+        policy = HedgePolicy(percentile=90, min_delay=0, max_delay=1, window=100, min_samples=10)
+        for i in range(100):
+            policy.record(i / 1000)
+
+        assert policy.next_delay() == pytest.approx(0.090)
+
+    def test_delay_is_clamped(self):
+        policy = HedgePolicy(min_delay=0.005, max_delay=0.05, window=50, min_samples=1)
+        for _ in range(50):
+            policy.record(0.0001)
+        assert policy.delay == 0.005
+
+        for _ in range(1000):
+            policy.record(2.0)
+        assert policy.delay == 0.05
+
+    def test_budget_caps_hedge_rate(self):
+        policy = HedgePolicy(budget=0.125, burst=2)
+
+        fired = 0
+        for _ in range(1000):
+            policy.next_delay()
+            fired += policy.try_hedge()
+
+        # Two from the initial burst, then one per eight reads.
+        assert fired == 126
+        assert policy.stats['hedges_denied'] == 874
+
+    def test_counters(self):
+        policy = HedgePolicy()
+        policy.next_delay()
+        policy.try_hedge()
+        policy.hedge_won()
+
+        assert policy.stats == {'reads': 1, 'hedges_fired': 1, 'hedges_won': 1, 'hedges_denied': 0}
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            HedgePolicy(percentile=100)
+        with pytest.raises(ValueError):
+            HedgePolicy(min_delay=1, max_delay=0.5)
+        with pytest.raises(ValueError):
+            HedgePolicy(budget=2)
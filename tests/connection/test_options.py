@@ -0,0 +1,80 @@
+import socket
+import time
+import pytest
+from unittest.mock import Mock, call
+
+from src.connection.deadline import current_deadline, deadline, timeout_for
+from src.connection.options import ConnectionOptions
+from src.exceptions.errors import ValkyrieTimeoutError
+
+
+class TestConnectionOptions:
+
+    def test_defaults_only_disable_nagle(self):
+        sock = Mock()
+        ConnectionOptions().configure(sock)
+
+        sock.setsockopt.assert_called_once_with(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def test_configure_applies_buffers_and_keepalive(self):
+        sock = Mock()
+        ConnectionOptions(tcp_nodelay=False, keepalive=True, keepalive_idle=30,
+                          send_buffer_size=1 << 20, receive_buffer_size=1 << 21).configure(sock)
+
+        calls = sock.setsockopt.call_args_list
+        assert call(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20) in calls
+        assert call(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 21) in calls
+        assert call(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in calls
+        if hasattr(socket, 'TCP_KEEPIDLE'):
+            assert call(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30) in calls
+        assert all(c.args[1] != socket.TCP_NODELAY for c in calls)
+
+    def test_configure_real_socket(self):
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            ConnectionOptions(keepalive=True, keepalive_idle=60, keepalive_interval=10,
+                              keepalive_count=3).configure(sock)
+            assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+            assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+
+    def test_invalid_values(self):
+        with pytest.raises(ValueError):
+            ConnectionOptions(read_timeout=0)
+        with pytest.raises(ValueError):
+            ConnectionOptions(connect_timeout=-1)
+        with pytest.raises(ValueError):
+            ConnectionOptions(receive_buffer_size=0)
+
+
+class TestDeadline:
+
+    def test_no_deadline_by_default(self):
+        assert current_deadline() is None
+        assert timeout_for(None) is None
+        assert timeout_for(None, 2.0) == 2.0
+
+    def test_nested_deadline_only_shortens(self):
+        with deadline(10) as outer:
+            with deadline(60) as inner:
+                assert inner == outer
+                assert current_deadline() == outer
+            with deadline(1) as inner:
+                assert inner < outer
+                assert current_deadline() == inner
+            assert current_deadline() == outer
+        assert current_deadline() is None
+
+    def test_default_timeout_applies_alongside_deadline(self):
+        now = time.monotonic()
+        assert current_deadline(5) == pytest.approx(now + 5, abs=0.5)
+        with deadline(1) as at:
+            assert current_deadline(5) == at
+
+    def test_timeout_for_caps_timeout(self):
+        at = time.monotonic() + 10
+        assert timeout_for(at, 1.0) == 1.0
+        assert 9 < timeout_for(at, 60.0) <= 10
+        assert 9 < timeout_for(at) <= 10
+
+    def test_timeout_for_raises_once_passed(self):
+        with pytest.raises(ValkyrieTimeoutError, match="Deadline exceeded"):
+            timeout_for(time.monotonic() - 0.001)
@@ -0,0 +1,208 @@
+import threading
+import pytest
+from unittest.mock import Mock, patch
+from src.connection.pool import ConnectionPool
+from src.connection.connection import TCPConnection
+from src.connection.retry import CircuitBreaker
+from src.exceptions.errors import (
+    ValkyrieAuthError, ValkyrieCircuitOpenError, ValkyrieConnectionError, ValkyrieServerError,
+    ValkyrieTimeoutError
+)
+
+
+class TestConnectionPool:
+
+    @pytest.fixture
+    def mock_connection_class(self):
+        with patch('src.connection.pool.TCPConnection') as mock_class, \
+                patch('src.connection.pool.AuthHandler'):
+            mock_class.side_effect = lambda host, port, **kwargs: Mock(spec=TCPConnection, is_connected=True)
+            yield mock_class
+
+    def test_invalid_sizes(self):
+        with pytest.raises(ValueError):
+            ConnectionPool("localhost", 8080, max_size=0)
+        with pytest.raises(ValueError):
+            ConnectionPool("localhost", 8080, min_size=3, max_size=2)
+
+    def test_open_warms_min_size(self, mock_connection_class):
+        pool = ConnectionPool("localhost", 8080, min_size=3, max_size=5)
+        pool.open()
+
+        assert mock_connection_class.call_count == 3
+        assert pool.size == 3
+        assert pool.idle_count == 3
+
+    def test_open_failure_closes_created_connections(self):
+        good = Mock(spec=TCPConnection)
+        bad = Mock(spec=TCPConnection)
+        with patch('src.connection.pool.TCPConnection', side_effect=[good, bad]), \
+                patch('src.connection.pool.AuthHandler') as mock_auth:
+            mock_auth.return_value.authenticate.side_effect = [None, ValkyrieAuthError("denied")]
+            pool = ConnectionPool("localhost", 8080, min_size=2, max_size=2)
+
+            with pytest.raises(ValkyrieAuthError):
+                pool.open()
+
+        assert pool.size == 0
+        good.disconnect.assert_called()
+        bad.disconnect.assert_called_once()
+
+    def test_acquire_reuses_released_connection(self, mock_connection_class):
+        pool = ConnectionPool("localhost", 8080, min_size=1, max_size=2)
+        pool.open()
+
+        first = pool.acquire()
+        pool.release(first)
+        second = pool.acquire()
+
+        assert first is second
+        assert mock_connection_class.call_count == 1
+
+    def test_acquire_grows_to_max_size(self, mock_connection_class):
+        pool = ConnectionPool("localhost", 8080, min_size=0, max_size=2)
+        pool.open()
+
+        first = pool.acquire()
+        second = pool.acquire()
+
+        assert first is not second
+        assert pool.size == 2
+
+    def test_acquire_timeout(self, mock_connection_class):
+        pool = ConnectionPool("localhost", 8080, min_size=1, max_size=1)
+        pool.open()
+        pool.acquire()
+
+        with pytest.raises(ValkyrieTimeoutError):
+            pool.acquire(timeout=0.01)
+
+    def test_acquire_waits_for_release(self, mock_connection_class):
+        pool = ConnectionPool("localhost", 8080, min_size=1, max_size=1)
+        pool.open()
+        held = pool.acquire()
+
+        timer = threading.Timer(0.05, pool.release, args=(held,))
+        timer.start()
+        try:
+            assert pool.acquire(timeout=1.0) is held
+        finally:
+            timer.cancel()
+
+    def test_acquire_closed_pool(self):
+        pool = ConnectionPool("localhost", 8080)
+
+        with pytest.raises(ValkyrieConnectionError, match="closed"):
+            pool.acquire()
+
+    def test_unhealthy_connection_is_replaced(self, mock_connection_class):
+        pool = ConnectionPool("localhost", 8080, min_size=1, max_size=1, health_check_interval=0)
+        pool.open()
+        stale = pool.acquire()
+        stale.is_alive.return_value = False
+        pool.release(stale)
+
+        fresh = pool.acquire()
+
+        assert fresh is not stale
+        stale.disconnect.assert_called_once()
+        assert pool.size == 1
+
+    def test_idle_eviction_keeps_min_size(self, mock_connection_class):
+        pool = ConnectionPool("localhost", 8080, min_size=1, max_size=3, idle_timeout=0)
+        pool.open()
+        connections = [pool.acquire() for _ in range(3)]
+
+        for connection in connections:
+            pool.release(connection)
+
+        assert pool.size == 1
+        assert pool.idle_count == 1
+
+    def test_connection_context_discards_on_connection_error(self, mock_connection_class):
+        pool = ConnectionPool("localhost", 8080, min_size=1, max_size=1)
+        pool.open()
+
+        with pytest.raises(ValkyrieConnectionError):
+            with pool.connection() as connection:
+                raise ValkyrieConnectionError("broken")
+
+        connection.disconnect.assert_called_once()
+        assert pool.size == 0
+
+    def test_connection_context_keeps_on_server_error(self, mock_connection_class):
+        pool = ConnectionPool("localhost", 8080, min_size=1, max_size=1)
+        pool.open()
+
+        with pytest.raises(ValkyrieServerError):
+            with pool.connection() as connection:
+                raise ValkyrieServerError("Key not found")
+
+        connection.disconnect.assert_not_called()
+        assert pool.idle_count == 1
+
+    def test_close(self, mock_connection_class):
+        pool = ConnectionPool("localhost", 8080, min_size=2, max_size=2)
+        pool.open()
+        pool.close()
+
+        assert pool.closed
+        assert pool.size == 0
+
+    def test_purge_closes_idle_connections(self, mock_connection_class):
+        pool = ConnectionPool("localhost", 8080, min_size=2, max_size=3)
+        pool.open()
+        busy = pool.acquire()
+        pool.acquire()
+        pool.release(busy)
+        idle = pool._idle[0][0]
+
+        pool.purge()
+
+        idle.disconnect.assert_called_once()
+        assert pool.idle_count == 0
+        assert pool.size == 1
+
+    def test_open_circuit_fails_fast(self, mock_connection_class):
+        down = Mock(spec=TCPConnection)
+        down.connect.side_effect = ValkyrieConnectionError("Failed to connect")
+        mock_connection_class.side_effect = lambda host, port, **kwargs: down
+        pool = ConnectionPool("localhost", 8080, min_size=0, max_size=4,
+                              breaker=CircuitBreaker(threshold=2, reset_timeout=60))
+        pool.open()
+
+        for _ in range(2):
+            with pytest.raises(ValkyrieConnectionError, match="Failed to connect"):
+                pool.acquire()
+        with pytest.raises(ValkyrieCircuitOpenError):
+            pool.acquire()
+
+        assert down.connect.call_count == 2
+        assert pool.size == 0
+
+    def test_refused_password_does_not_trip_circuit(self):
+        breaker = CircuitBreaker(threshold=1)
+        with patch('src.connection.pool.TCPConnection'), \
+                patch('src.connection.pool.AuthHandler') as mock_auth:
+            mock_auth.return_value.authenticate.side_effect = ValkyrieAuthError("denied")
+            pool = ConnectionPool("localhost", 8080, min_size=0, max_size=1, breaker=breaker)
+            pool.open()
+
+            with pytest.raises(ValkyrieAuthError):
+                pool.acquire()
+
+        assert breaker.state == 'closed'
+
+    def test_interrupted_connect_does_not_count(self, mock_connection_class):
+        interrupted = Mock(spec=TCPConnection)
+        interrupted.connect.side_effect = KeyboardInterrupt
+        mock_connection_class.side_effect = lambda host, port, **kwargs: interrupted
+        breaker = CircuitBreaker(threshold=1)
+        pool = ConnectionPool("localhost", 8080, min_size=0, max_size=1, breaker=breaker)
+        pool.open()
+
+        with pytest.raises(KeyboardInterrupt):
+            pool.acquire()
+
+        assert breaker.state == 'closed'
+        assert pool.size == 0
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from src.connection.replica_router import ReplicaRouter
+
+
+def warm(router, latencies):
+    for index, latency in enumerate(latencies):
+        router._pending[index] += 1
+        router.record(index, latency)
+
+
+class TestReplicaRouter:
+
+    def test_untried_replicas_are_preferred(self):
+        router = ReplicaRouter(2, rng=random.Random(1))
+        warm(router, [0.002])
+
+        assert all(router.choose() == 1 for _ in range(10))
+
+    def test_prefers_lower_latency(self):
+        router = ReplicaRouter(3, demote_ratio=100, rng=random.Random(1))
+        warm(router, [0.001, 0.003, 0.020])
+
+        picks = [0, 0, 0]
+        for _ in range(300):
+            index = router.choose()
+            picks[index] += 1
+            router.record(index, [0.001, 0.003, 0.020][index])
+
+        assert picks[0] > picks[1] > picks[2] == 0
+
+    def test_in_flight_reads_spread_load(self):
+        router = ReplicaRouter(2, rng=random.Random(1))
+        warm(router, [0.001, 0.0015])
+
+        picks = [router.choose() for _ in range(10)]
+        assert set(picks) == {0, 1}
+
+    def test_latency_spike_demotes_until_retry(self, clock):
+        router = ReplicaRouter(2, demote_seconds=5, clock=clock)
+        warm(router, [0.001, 0.001])
+
+        router._pending[1] += 1
+        router.record(1, 0.5)
+
+        assert router.is_demoted(1)
+        assert router.demotions == 1
+        assert all(router.choose() == 0 for _ in range(10))
+
+        clock.now = 5
+        assert not router.is_demoted(1)
+        assert router.latency(1) is None
+
+    def test_small_absolute_difference_does_not_demote(self):
+        router = ReplicaRouter(2)
+        warm(router, [0.0001, 0.0005])
+
+        assert not router.is_demoted(1)
+
+    def test_failure_demotes(self):
+        router = ReplicaRouter(2)
+        index = router.choose()
+        router.failed(index)
+
+        assert router.is_demoted(index)
+        assert router.choose() == 1 - index
+
+    def test_release_returns_pending_slot(self):
+        router = ReplicaRouter(1)
+        router.choose()
+        router.release(0)
+
+        assert router._pending == [0]
+        assert not router.is_demoted(0)
+
+    def test_all_demoted(self):
+        router = ReplicaRouter(2)
+        router.demote(0)
+        router.demote(1)
+
+        assert router.choose() is None
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            ReplicaRouter(0)
+        with pytest.raises(ValueError):
+            ReplicaRouter(1, alpha=0)
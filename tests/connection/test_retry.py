@@ -0,0 +1,101 @@
+import random
+import pytest
+
+from src.connection.retry import CircuitBreaker, RetryPolicy, is_retryable
+from src.exceptions.errors import (
+    ValkyrieCircuitOpenError, ValkyrieConnectionError, ValkyrieServerError, ValkyrieTimeoutError
+)
+
+
+class TestRetryPolicy:
+
+    def test_first_replay_is_immediate(self):
+        assert RetryPolicy().backoff(0) == 0.0
+
+    def test_backoff_is_jittered_and_capped(self):
+        policy = RetryPolicy(retries=10, base_delay=0.1, max_delay=0.5, rng=random.Random(7))
+
+        for attempt, ceiling in ((1, 0.1), (2, 0.2), (3, 0.4), (4, 0.5), (9, 0.5)):
+            delays = [policy.backoff(attempt) for _ in range(200)]
+            assert all(0 <= delay <= ceiling for delay in delays)
+            assert max(delays) > ceiling * 0.8
+            assert len(set(delays)) > 1
+
+    def test_invalid_values(self):
+        with pytest.raises(ValueError):
+            RetryPolicy(retries=-1)
+        with pytest.raises(ValueError):
+            RetryPolicy(base_delay=1, max_delay=0.5)
+
+    def test_only_broken_connections_are_retryable(self):
+        assert is_retryable(ValkyrieConnectionError("Connection closed by server"))
+        assert not is_retryable(ValkyrieTimeoutError("Timed out receiving data"))
+        assert not is_retryable(ValkyrieCircuitOpenError("Circuit open"))
+        assert not is_retryable(ValkyrieServerError("Key not found"))
+
+
+class TestCircuitBreaker:
+
+    def test_opens_after_threshold(self, clock):
+        breaker = CircuitBreaker(threshold=3, reset_timeout=5, clock=clock)
+
+        for _ in range(2):
+            breaker.allow()
+            breaker.record_failure()
+        assert breaker.state == 'closed'
+
+        breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == 'open'
+        assert breaker.trips == 1
+        with pytest.raises(ValkyrieCircuitOpenError):
+            breaker.allow()
+
+    def test_success_resets_failure_count(self, clock):
+        breaker = CircuitBreaker(threshold=2, clock=clock)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == 'closed'
+
+    def test_half_open_lets_one_trial_through(self, clock):
+        breaker = CircuitBreaker(threshold=1, reset_timeout=5, clock=clock)
+        breaker.record_failure()
+
+        clock.now = 5
+        assert breaker.state == 'half-open'
+        breaker.allow()
+        with pytest.raises(ValkyrieCircuitOpenError):
+            breaker.allow()
+
+        breaker.record_success()
+        assert breaker.state == 'closed'
+        breaker.allow()
+
+    def test_failed_trial_reopens(self, clock):
+        breaker = CircuitBreaker(threshold=1, reset_timeout=5, clock=clock)
+        breaker.record_failure()
+
+        clock.now = 6
+        breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == 'open'
+        assert breaker.trips == 1
+
+        clock.now = 10
+        with pytest.raises(ValkyrieCircuitOpenError):
+            breaker.allow()
+        clock.now = 11
+        breaker.allow()
+
+    def test_abandoned_trial_allows_another(self, clock):
+        breaker = CircuitBreaker(threshold=1, reset_timeout=5, clock=clock)
+        breaker.record_failure()
+
+        clock.now = 5
+        breaker.allow()
+        breaker.abandon()
+        assert breaker.state == 'half-open'
+        breaker.allow()
+        assert breaker.trips == 1
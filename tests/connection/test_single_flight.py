@@ -0,0 +1,172 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.connection.single_flight import AsyncSingleFlight, SingleFlight, flight_key
+from src.exceptions.errors import ValkyrieConnectionError, ValkyrieTimeoutError
+from src.protocol.packet import RequestPacket
+from src.protocol.types import CompositeType, DataType, Operation, ResponseSchema
+
+
+def packet(composite, operation, key="k", params=b'', schema=None):
+    return RequestPacket(composite, DataType.STRING, operation, key, params, schema)
+
+
+class TestFlightKey:
+
+    def test_writes_are_not_coalesced(self):
+        assert flight_key(packet(CompositeType.PRIMITIVE, Operation.SET)) is None
+        assert flight_key(packet(CompositeType.PRIMITIVE, Operation.INCREMENT)) is None
+        assert flight_key(packet(CompositeType.MAP, Operation.MAP_SET)) is None
+        assert flight_key(packet(CompositeType.ARRAY, Operation.INSERT)) is None
+
+    def test_reads_are_keyed_by_composite_key_params_and_schema(self):
+        get = flight_key(packet(CompositeType.PRIMITIVE, Operation.GET))
+        map_get = flight_key(packet(CompositeType.MAP, Operation.MAP_GET, params=b'f'))
+
+        assert get is not None and map_get is not None
+        assert get != map_get
+        assert map_get == flight_key(packet(CompositeType.MAP, Operation.MAP_GET, params=[b'f']))
+        assert map_get != flight_key(packet(CompositeType.MAP, Operation.MAP_GET, params=b'g'))
+        assert flight_key(packet(CompositeType.ARRAY, Operation.SLICE)) != \
+            flight_key(packet(CompositeType.ARRAY, Operation.SLICE, schema=ResponseSchema.LAZY))
+
+
+class TestSingleFlight:
+
+    def run_concurrently(self, flight, func, callers=8):
+        results = [None] * callers
+        errors = [None] * callers
+
+        def call(i):
+            try:
+                results[i] = flight.do("key", func)
+            except Exception as e:
+                errors[i] = e
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(callers)]
+        for thread in threads:
+            thread.start()
+        return threads, results, errors
+
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def func():
+            calls.append(1)
+            release.wait(5)
+            return ["value"]
+
+        threads, results, errors = self.run_concurrently(flight, func)
+        deadline = time.monotonic() + 5
+        while flight.coalesced < 7 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert errors == [None] * 8
+        assert all(result is results[0] for result in results)
+        assert flight.coalesced == 7
+        assert len(flight) == 0
+
+    def test_error_is_shared(self):
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def func():
+            release.wait(5)
+            raise ValkyrieConnectionError("down")
+
+        threads, _, errors = self.run_concurrently(flight, func, callers=4)
+        deadline = time.monotonic() + 5
+        while flight.coalesced < 3 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert all(isinstance(error, ValkyrieConnectionError) for error in errors)
+
+    def test_joining_caller_times_out(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        thread = threading.Thread(target=flight.do, args=("key", lambda: release.wait(5)))
+        thread.start()
+        deadline = time.monotonic() + 5
+        while not len(flight) and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+        try:
+            with pytest.raises(ValkyrieTimeoutError):
+                flight.do("key", lambda: None, timeout=0.01)
+        finally:
+            release.set()
+            thread.join()
+
+    def test_completed_call_is_not_reused(self):
+        flight = SingleFlight()
+        values = iter([1, 2])
+
+        assert flight.do("key", lambda: next(values)) == 1
+        assert flight.do("key", lambda: next(values)) == 2
+        assert flight.coalesced == 0
+
+
+class TestAsyncSingleFlight:
+
+    def test_concurrent_callers_share_one_call(self):
+        async def scenario():
+            flight = AsyncSingleFlight()
+            calls = []
+
+            async def func():
+                calls.append(1)
+                await asyncio.sleep(0.01)
+                return "value"
+
+            results = await asyncio.gather(*(flight.do("key", func) for _ in range(10)))
+            assert results == ["value"] * 10
+            assert len(calls) == 1
+            assert flight.coalesced == 9
+            assert len(flight) == 0
+
+        asyncio.run(scenario())
+
+    def test_cancelled_first_caller_does_not_cancel_others(self):
+        async def scenario():
+            flight = AsyncSingleFlight()
+
+            async def func():
+                await asyncio.sleep(0.01)
+                return "value"
+
+            first = asyncio.ensure_future(flight.do("key", func))
+            second = asyncio.ensure_future(flight.do("key", func))
+            await asyncio.sleep(0)
+            first.cancel()
+
+            assert await second == "value"
+            with pytest.raises(asyncio.CancelledError):
+                await first
+
+        asyncio.run(scenario())
+
+    def test_error_is_shared(self):
+        async def scenario():
+            flight = AsyncSingleFlight()
+
+            async def func():
+                await asyncio.sleep(0)
+                raise ValkyrieConnectionError("down")
+
+            results = await asyncio.gather(*(flight.do("key", func) for _ in range(3)),
+                                           return_exceptions=True)
+            assert all(isinstance(result, ValkyrieConnectionError) for result in results)
+
+        asyncio.run(scenario())
@@ -0,0 +1,140 @@
+import asyncio
+import struct
+from src.protocol.decoder import ProtocolDecoder
+from src.protocol.encoder import ProtocolEncoder
+from src.protocol.types import CompositeType, Operation, Status
+
+
+class FakeServer:
+    """Minimal in-process server speaking the auth handshake and framed requests."""
+
+    def __init__(self, password='secret'):
+        self.password = password
+        self.store = {}
+        self.arrays = {}
+        self.maps = {}
+        self.connections = 0
+        self.requests = 0
+        # Seconds to stall before answering, consumed one per request.
+        self.stalls = []
+        # Requests answered by closing the connection instead, as a restarting server would.
+        self.hangups = 0
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            length = struct.unpack('<I', await reader.readexactly(4))[0]
+            password = (await reader.readexactly(length)).decode('utf-8')
+            status = Status.OK if password == self.password else Status.UNAUTHORIZED
+            writer.write(struct.pack('<I', 1) + bytes([status]))
+            if status != Status.OK:
+                return
+
+            while True:
+                length = struct.unpack('<I', await reader.readexactly(4))[0]
+                self.requests += 1
+                payload = await reader.readexactly(length)
+                if self.hangups:
+                    self.hangups -= 1
+                    return
+                if self.stalls:
+                    await asyncio.sleep(self.stalls.pop(0))
+                response = self._respond(payload)
+                writer.write(struct.pack('<I', len(response)) + response)
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            pass
+        finally:
+            writer.close()
+
+    def _respond(self, payload):
+        composite = payload[0] >> 4
+        operation = payload[1]
+        key_length = struct.unpack('<I', payload[2:6])[0]
+        key = payload[6:6 + key_length].decode('utf-8')
+        params = payload[6 + key_length:]
+
+        if composite == CompositeType.MAP:
+            return self._respond_map(operation, key, params)
+        if operation == Operation.SET:
+            self.store[key] = params
+            return bytes([Status.OK])
+        if operation == Operation.GET:
+            if key not in self.store:
+                return bytes([Status.NOT_FOUND])
+            return bytes([Status.OK]) + self.store[key]
+        if operation == Operation.REMOVE:
+            if self.store.pop(key, None) is None:
+                return bytes([Status.NOT_FOUND])
+            return bytes([Status.OK])
+        if operation == Operation.INCREMENT:
+            value = self.store.get(key, 0) + 1
+            self.store[key] = value
+            return bytes([Status.OK]) + ProtocolEncoder.encode_value(value)
+        if composite == CompositeType.ARRAY and operation == Operation.LEN:
+            if key not in self.arrays:
+                return bytes([Status.NOT_FOUND])
+            return bytes([Status.OK]) + ProtocolEncoder.encode_value(len(self.arrays[key]))
+        if operation == Operation.INSERT:
+            index = struct.unpack('<I', params[:4])[0]
+            values, offset = [], 4
+            while offset < len(params):
+                value, offset = ProtocolDecoder.decode_value(params, offset)
+                values.append(value)
+            array = self.arrays.setdefault(key, [])
+            if index > len(array):
+                return bytes([Status.OUT_OF_RANGE])
+            array[index:index] = values
+            return bytes([Status.OK])
+        if operation == Operation.SLICE:
+            if key not in self.arrays:
+                return bytes([Status.NOT_FOUND])
+            start, end = struct.unpack('<II', params)
+            return bytes([Status.OK]) + ProtocolEncoder.encode_array(self.arrays[key][start:end])
+        return bytes([Status.UNAVAILABLE_OPERATION])
+
+    def _respond_map(self, operation, key, params):
+        if operation == Operation.MAP_SET:
+            map_key, offset = ProtocolDecoder.decode_string(params)
+            self.maps.setdefault(key, {})[map_key] = ProtocolDecoder.decode_value(params, offset)[0]
+            return bytes([Status.OK])
+
+        if key not in self.maps:
+            return bytes([Status.NOT_FOUND])
+        fields = self.maps[key]
+
+        if operation == Operation.MAP_KEYS:
+            return bytes([Status.OK]) + ProtocolEncoder.encode_array(list(fields))
+        if operation == Operation.MAP_VALUES:
+            return bytes([Status.OK]) + ProtocolEncoder.encode_array(list(fields.values()))
+
+        map_key, _ = ProtocolDecoder.decode_string(params)
+        if map_key not in fields:
+            return bytes([Status.NOT_FOUND])
+        if operation == Operation.MAP_GET:
+            return bytes([Status.OK]) + ProtocolEncoder.encode_value(fields[map_key])
+        if operation == Operation.MAP_REMOVE:
+            del fields[map_key]
+            return bytes([Status.OK])
+        return bytes([Status.UNAVAILABLE_OPERATION])
+
+
+def run(coro_func, **server_kwargs):
+    async def main():
+        server = FakeServer(**server_kwargs)
+        port = await server.start()
+        try:
+            await coro_func(server, port)
+        finally:
+            await server.stop()
+
+    asyncio.run(main())
@@ -1,8 +1,11 @@
+import struct
 import pytest
 from unittest.mock import Mock
 from src.operations.arrays import ArrayOperations
+from src.protocol.encoder import ProtocolEncoder
 from src.protocol.packet import RequestPacket, ResponsePacket
-from src.protocol.types import CompositeType, DataType, Operation, Status
+from src.protocol.types import CompositeType, DataType, Operation, ResponseSchema, Status
+from src.exceptions.errors import ValkyrieServerError, error_for_status
 
 
 class TestArrayOperations:
@@ -29,6 +32,14 @@ class TestArrayOperations:
         assert call_args.operation == Operation.SLICE
         assert call_args.key == "array_key"
 
+    def test_slice_lazy_requests_lazy_schema(self, arrays, mock_send_request):
+        mock_send_request.return_value = ResponsePacket(Status.OK, ["item1"])
+
+        arrays.slice("array_key", 0, 1, lazy=True)
+
+        call_args = mock_send_request.call_args[0][0]
+        assert call_args.response_schema == ResponseSchema.LAZY
+
     def test_slice_empty_response(self, arrays, mock_send_request):
         mock_response = ResponsePacket(Status.OK, None)
         mock_send_request.return_value = mock_response
@@ -51,4 +62,109 @@ class TestArrayOperations:
 
     def test_remove(self, arrays, mock_send_request):
         mock_response = ResponsePacket(Status.OK)
-        mock_send_request.return_value = mock_response
\ No newline at end of file
+        mock_send_request.return_value = mock_response
+    def test_insert_numpy(self, arrays, mock_send_request):
+        np = pytest.importorskip("numpy")
+        mock_send_request.return_value = ResponsePacket(Status.OK)
+
+        arrays.insert_numpy("array_key", 2, np.array([1.0, 2.0]))
+
+        call_args = mock_send_request.call_args[0][0]
+        assert call_args.operation == Operation.INSERT
+        assert call_args.primitive == DataType.FLOAT
+        assert b"".join(call_args.params) == (struct.pack('<I', 2) + ProtocolEncoder.encode_value(1.0) +
+                                             ProtocolEncoder.encode_value(2.0))
+
+    def test_slice_numpy(self, arrays, mock_send_request):
+        np = pytest.importorskip("numpy")
+        payload = ProtocolEncoder.encode_composite_value([4, 5, 6])
+        mock_send_request.return_value = ResponsePacket(Status.OK, memoryview(payload))
+
+        result = arrays.slice_numpy("array_key", 0, 3)
+
+        assert result.tolist() == [4, 5, 6]
+        call_args = mock_send_request.call_args[0][0]
+        assert call_args.operation == Operation.SLICE
+        assert call_args.response_schema == ResponseSchema.RAW
+
+    def test_scan_pages_through_array(self, arrays, mock_send_request):
+        mock_send_request.side_effect = [
+            ResponsePacket(Status.OK, 5),
+            ResponsePacket(Status.OK, [0, 1]),
+            ResponsePacket(Status.OK, [2, 3]),
+            ResponsePacket(Status.OK, [4]),
+        ]
+
+        assert list(arrays.scan("array_key", page_size=2)) == [0, 1, 2, 3, 4]
+
+        slices = [struct.unpack('<II', call[0][0].params) for call in mock_send_request.call_args_list[1:]]
+        assert slices == [(0, 2), (2, 4), (4, 5)]
+
+    def test_scan_stops_when_array_shrinks(self, arrays, mock_send_request):
+        mock_send_request.side_effect = [
+            ResponsePacket(Status.OK, 6),
+            ResponsePacket(Status.OK, [0, 1]),
+            ResponsePacket(Status.OK, [2]),
+        ]
+
+        assert list(arrays.scan("array_key", page_size=2)) == [0, 1, 2]
+        assert mock_send_request.call_count == 3
+
+    def test_scan_stops_on_out_of_range(self, arrays, mock_send_request):
+        mock_send_request.side_effect = [
+            ResponsePacket(Status.OK, 4),
+            ResponsePacket(Status.OK, [0, 1]),
+            error_for_status(Status.OUT_OF_RANGE),
+        ]
+
+        assert list(arrays.scan("array_key", page_size=2)) == [0, 1]
+
+    def test_scan_raises_other_errors(self, arrays, mock_send_request):
+        mock_send_request.side_effect = [ResponsePacket(Status.OK, 4), error_for_status(Status.WRONG_TYPE)]
+
+        with pytest.raises(ValkyrieServerError, match="Wrong data type"):
+            list(arrays.scan("array_key", page_size=2))
+
+    def test_scan_uses_prefetch_window(self, mock_send_request):
+        stream_requests = Mock(return_value=(response for response in [ResponsePacket(Status.OK, [1])]))
+        arrays = ArrayOperations(mock_send_request, stream_requests_func=stream_requests)
+        mock_send_request.return_value = ResponsePacket(Status.OK, 1)
+
+        assert list(arrays.scan("array_key", page_size=10, prefetch=3)) == [1]
+        assert stream_requests.call_args[0][1] == 4
+
+    def test_scan_invalid_arguments(self, arrays):
+        with pytest.raises(ValueError):
+            arrays.scan("array_key", page_size=0)
+        with pytest.raises(ValueError):
+            arrays.scan("array_key", prefetch=-1)
+
+    def test_insert_bulk_chunks_at_advancing_indexes(self, arrays, mock_send_request):
+        mock_send_request.return_value = ResponsePacket(Status.OK)
+        progress = []
+
+        inserted = arrays.insert_bulk("array_key", 3, (i for i in range(7)), chunk_size=3, progress=progress.append)
+
+        assert inserted == 7
+        assert progress == [3, 6, 7]
+        packets = [call[0][0] for call in mock_send_request.call_args_list]
+        assert [struct.unpack('<I', bytes(packet.params[:4]))[0] for packet in packets] == [3, 6, 9]
+        assert b"".join(packets[2].to_buffers()).endswith(ProtocolEncoder.encode_value(6))
+
+    def test_insert_bulk_empty_iterable(self, arrays, mock_send_request):
+        assert arrays.insert_bulk("array_key", 0, []) == 0
+        mock_send_request.assert_not_called()
+
+    def test_insert_bulk_stops_after_failed_chunk(self, arrays, mock_send_request):
+        mock_send_request.side_effect = [ResponsePacket(Status.OK), error_for_status(Status.OUT_OF_RANGE)]
+        progress = []
+
+        with pytest.raises(ValkyrieServerError, match="Index out of range"):
+            arrays.insert_bulk("array_key", 0, range(10), chunk_size=2, progress=progress.append)
+
+        assert mock_send_request.call_count == 2
+        assert progress == [2]
+
+    def test_insert_bulk_invalid_chunk_size(self, arrays):
+        with pytest.raises(ValueError):
+            arrays.insert_bulk("array_key", 0, [1], chunk_size=0)
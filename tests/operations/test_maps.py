@@ -2,7 +2,8 @@ import pytest
 from unittest.mock import Mock
 from src.operations.maps import MapOperations
 from src.protocol.packet import RequestPacket, ResponsePacket
-from src.protocol.types import CompositeType, DataType, Operation, Status
+from src.protocol.types import CompositeType, DataType, Operation, ResponseSchema, Status
+from src.exceptions.errors import ValkyrieConnectionError, ValkyrieServerError, error_for_status
 
 
 class TestMapOperations:
@@ -63,4 +64,80 @@ class TestMapOperations:
         assert result is True
         mock_send_request.assert_called_once()
         call_args = mock_send_request.call_args[0][0]
-        assert call_args.operation == Operation.MAP_CONTAINS
\ No newline at end of file
+        assert call_args.operation == Operation.MAP_CONTAINS
+
+    def test_values(self, maps, mock_send_request):
+        mock_send_request.return_value = ResponsePacket(Status.OK, [1, 2])
+
+        assert maps.values("map_key") == [1, 2]
+        call_args = mock_send_request.call_args[0][0]
+        assert call_args.operation == Operation.MAP_VALUES
+        assert call_args.response_schema == ResponseSchema.COMPOSITE
+
+    def test_keys_lazy_requests_lazy_schema(self, maps, mock_send_request):
+        mock_send_request.return_value = ResponsePacket(Status.OK, None)
+
+        assert maps.keys("map_key", lazy=True) == []
+        call_args = mock_send_request.call_args[0][0]
+        assert call_args.operation == Operation.MAP_KEYS
+        assert call_args.response_schema == ResponseSchema.LAZY
+
+    def test_get_many_keeps_order_and_errors(self, maps, mock_send_request):
+        not_found = error_for_status(Status.NOT_FOUND)
+        mock_send_request.side_effect = [ResponsePacket(Status.OK, 1), not_found, ResponsePacket(Status.OK, "c")]
+
+        result = maps.get_many("map_key", ["a", "b", "c"])
+
+        assert list(result.items()) == [("a", 1), ("b", not_found), ("c", "c")]
+        assert [call[0][0].operation for call in mock_send_request.call_args_list] == [Operation.MAP_GET] * 3
+
+    def test_get_many_raise_on_error(self, maps, mock_send_request):
+        mock_send_request.side_effect = [error_for_status(Status.NOT_FOUND), ResponsePacket(Status.OK, 2)]
+
+        with pytest.raises(ValkyrieServerError, match="Key not found"):
+            maps.get_many("map_key", ["a", "b"], raise_on_error=True)
+        assert mock_send_request.call_count == 2
+
+    def test_get_many_connection_error_propagates(self, maps, mock_send_request):
+        mock_send_request.side_effect = ValkyrieConnectionError("boom")
+
+        with pytest.raises(ValkyrieConnectionError):
+            maps.get_many("map_key", ["a"])
+
+    def test_set_many(self, maps, mock_send_request):
+        mock_send_request.return_value = ResponsePacket(Status.OK)
+
+        result = maps.set_many("map_key", {"a": 1, "b": "two"})
+
+        assert result == {"a": None, "b": None}
+        packets = [call[0][0] for call in mock_send_request.call_args_list]
+        assert [packet.operation for packet in packets] == [Operation.MAP_SET] * 2
+        assert [packet.primitive for packet in packets] == [DataType.INT, DataType.STRING]
+
+    def test_remove_many(self, maps, mock_send_request):
+        mock_send_request.return_value = ResponsePacket(Status.OK)
+
+        assert maps.remove_many("map_key", ["a", "b"]) == {"a": None, "b": None}
+        assert mock_send_request.call_count == 2
+
+    def test_many_uses_one_pipelined_flight(self, mock_send_request):
+        stream_requests = Mock(side_effect=lambda packets, window: (ResponsePacket(Status.OK, 1) for _ in packets))
+        maps = MapOperations(mock_send_request, stream_requests_func=stream_requests)
+
+        assert maps.get_many("map_key", ["a", "b"], window=8) == {"a": 1, "b": 1}
+        stream_requests.assert_called_once()
+        assert stream_requests.call_args[0][1] == 8
+        mock_send_request.assert_not_called()
+
+    def test_items(self, maps, mock_send_request):
+        mock_send_request.side_effect = [ResponsePacket(Status.OK, ["a", "b"]), ResponsePacket(Status.OK, [1, 2])]
+
+        assert maps.items("map_key") == [("a", 1), ("b", 2)]
+        operations = [call[0][0].operation for call in mock_send_request.call_args_list]
+        assert operations == [Operation.MAP_KEYS, Operation.MAP_VALUES]
+
+    def test_items_missing_map_raises(self, maps, mock_send_request):
+        mock_send_request.side_effect = [error_for_status(Status.NOT_FOUND)] * 2
+
+        with pytest.raises(ValkyrieServerError):
+            maps.items("map_key")
@@ -2,8 +2,9 @@ import pytest
 from unittest.mock import Mock
 from src.operations.primitives import PrimitiveOperations
 from src.protocol.packet import RequestPacket, ResponsePacket
+from src.protocol.encoder import ProtocolEncoder, ZERO_COPY_MIN_SIZE
 from src.protocol.types import CompositeType, DataType, Operation, Status
-from unittest.mock import patch
+from src.exceptions.errors import ValkyrieServerError, error_for_status
 
 class TestPrimitiveOperations:
     """Test suite for PrimitiveOperations"""
@@ -37,9 +38,7 @@ class TestPrimitiveOperations:
         mock_response = ResponsePacket(Status.OK)
         mock_send_request.return_value = mock_response
 
-        with patch('src.operations.primitives.ProtocolEncoder.encode_value') as mock_encode:
-            mock_encode.return_value = (b'encoded_value', DataType.STRING)
-            primitives.set("test_key", "test_value")
+        primitives.set("test_key", "test_value")
 
         mock_send_request.assert_called_once()
         call_args = mock_send_request.call_args[0][0]
@@ -47,7 +46,17 @@ class TestPrimitiveOperations:
         assert call_args.primitive == DataType.STRING
         assert call_args.operation == Operation.SET
         assert call_args.key == "test_key"
-        assert call_args.params == b'encoded_value'
+        assert call_args.params == ProtocolEncoder.encode_value("test_value")
+
+    def test_set_large_blob_is_not_copied(self, primitives, mock_send_request):
+        mock_send_request.return_value = ResponsePacket(Status.OK)
+        blob = bytes(ZERO_COPY_MIN_SIZE)
+
+        primitives.set("blob_key", blob)
+
+        call_args = mock_send_request.call_args[0][0]
+        assert call_args.primitive == DataType.BLOB
+        assert call_args.params[-1] is blob
 
     def test_remove(self, primitives, mock_send_request):
         mock_response = ResponsePacket(Status.OK)
@@ -108,4 +117,25 @@ class TestPrimitiveOperations:
         call_args = mock_send_request.call_args[0][0]
         assert call_args.operation == Operation.DECREMENT
         assert call_args.primitive == DataType.INT
-        assert call_args.key == "counter"
\ No newline at end of file
+        assert call_args.key == "counter"
+
+    def test_get_many(self, primitives, mock_send_request):
+        not_found = error_for_status(Status.NOT_FOUND)
+        mock_send_request.side_effect = [ResponsePacket(Status.OK, 1), not_found]
+
+        assert primitives.get_many(["a", "b"]) == {"a": 1, "b": not_found}
+        keys = [call[0][0].key for call in mock_send_request.call_args_list]
+        assert keys == ["a", "b"]
+
+    def test_set_many_raise_on_error(self, primitives, mock_send_request):
+        mock_send_request.side_effect = [error_for_status(Status.WRONG_TYPE), ResponsePacket(Status.OK)]
+
+        with pytest.raises(ValkyrieServerError, match="Wrong data type"):
+            primitives.set_many({"a": 1, "b": 2.5}, raise_on_error=True)
+        assert [call[0][0].primitive for call in mock_send_request.call_args_list] == [DataType.INT, DataType.FLOAT]
+
+    def test_remove_many(self, primitives, mock_send_request):
+        mock_send_request.return_value = ResponsePacket(Status.OK)
+
+        assert primitives.remove_many(["a"]) == {"a": None}
+        assert mock_send_request.call_args[0][0].operation == Operation.REMOVE
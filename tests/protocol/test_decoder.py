@@ -124,3 +124,27 @@ class TestProtocolDecoder:
         data = bytes([invalid_type])
         with pytest.raises(ValueError, match=f"Unknown composite type: {invalid_type}"):
             ProtocolDecoder.decode_composite_value(data)
+
+    def test_decode_from_memoryview_with_offset(self):
+        data = b'\xff\xff' + bytes([DataType.INT.value]) + struct.pack('<q', 7)
+        value, offset = ProtocolDecoder.decode_value(memoryview(data), 2)
+        assert value == 7
+        assert offset == len(data)
+
+    def test_decode_blob_returns_bytes(self):
+        data = bytearray([DataType.BLOB.value]) + struct.pack('<I', 3) + b'abc'
+        value, _ = ProtocolDecoder.decode_value(data)
+        assert value == b'abc'
+        assert isinstance(value, bytes)
+
+    def test_decode_nested_composite(self):
+        from src.protocol.encoder import ProtocolEncoder
+        original = {"a": [1, 2.5, True, b"x", {"n": "s"}], "b": []}
+        value, offset = ProtocolDecoder.decode_composite_value(ProtocolEncoder.encode_composite_value(original))
+        assert value == original
+
+    def test_truncated_array_element(self):
+        data = (bytes([CompositeType.ARRAY.value]) + struct.pack('<I', 1) +
+                bytes([CompositeType.PRIMITIVE.value, DataType.INT.value]) + b'\x00\x00')
+        with pytest.raises(ValueError, match="Not enough data for int"):
+            ProtocolDecoder.decode_composite_value(data)
@@ -1,6 +1,6 @@
 import pytest
 import struct
-from src.protocol.encoder import ProtocolEncoder
+from src.protocol.encoder import ProtocolEncoder, ZERO_COPY_MIN_SIZE
 from src.protocol.types import DataType, CompositeType
 
 
@@ -79,4 +79,83 @@ class TestProtocolEncoder:
         expected = (bytes([DataType.STRING]) +
                    struct.pack('<I', len(encoded_bytes)) +
                    encoded_bytes)
-        assert result == expected
\ No newline at end of file
+        assert result == expected
+
+    def test_encode_values_small_values_single_buffer(self):
+        result = ProtocolEncoder.encode_values([1, "a", b"xy"], prefix=b"\x00\x00\x00\x00")
+        expected = (b"\x00\x00\x00\x00" + ProtocolEncoder.encode_value(1) +
+                    ProtocolEncoder.encode_value("a") + ProtocolEncoder.encode_value(b"xy"))
+        assert len(result) == 1
+        assert result[0] == expected
+
+    def test_encode_values_large_blob_by_reference(self):
+        blob = bytearray(ZERO_COPY_MIN_SIZE)
+        result = ProtocolEncoder.encode_values(["a", blob, 7])
+
+        assert len(result) == 3
+        assert result[1] is blob
+        assert b"".join(result) == (ProtocolEncoder.encode_value("a") +
+                                    ProtocolEncoder.encode_value(blob) +
+                                    ProtocolEncoder.encode_value(7))
+
+    def test_encode_values_empty(self):
+        assert ProtocolEncoder.encode_values([]) == [bytearray()]
+
+    def test_encode_memoryview(self):
+        result = ProtocolEncoder.encode_value(memoryview(b"abc"))
+        assert result == bytes([DataType.BLOB]) + struct.pack('<I', 3) + b"abc"
+
+    def test_encode_into_at_offset(self):
+        buffer = bytearray(b"prefix")
+        end = ProtocolEncoder.encode_into(buffer, 42, offset=6)
+
+        assert end == 16
+        assert buffer[:end] == b"prefix" + bytes([CompositeType.PRIMITIVE, DataType.INT]) + struct.pack('<q', 42)
+
+    def test_encode_into_reuses_buffer(self):
+        buffer = bytearray()
+        end = 0
+        for i in range(1000):
+            end = ProtocolEncoder.encode_into(buffer, i, end)
+
+        assert len(buffer) < 2 * end
+        assert buffer[:end] == b"".join(ProtocolEncoder.encode_composite_value(i) for i in range(1000))
+
+    def test_encode_into_nested(self):
+        value = {"a": [1, 2.5, True, b"x", {"n": "s"}]}
+        buffer = bytearray()
+        end = ProtocolEncoder.encode_into(buffer, value)
+
+        inner_map = (bytes([CompositeType.MAP]) + struct.pack('<I', 1) +
+                     bytes([CompositeType.PRIMITIVE]) + ProtocolEncoder.encode_value("n") +
+                     bytes([CompositeType.PRIMITIVE]) + ProtocolEncoder.encode_value("s"))
+        array = (bytes([CompositeType.ARRAY]) + struct.pack('<I', 5) +
+                 b"".join(bytes([CompositeType.PRIMITIVE]) + ProtocolEncoder.encode_value(item)
+                          for item in [1, 2.5, True, b"x"]) +
+                 inner_map)
+        expected = (bytes([CompositeType.MAP]) + struct.pack('<I', 1) +
+                    bytes([CompositeType.PRIMITIVE]) + ProtocolEncoder.encode_value("a") +
+                    array)
+        assert buffer[:end] == expected
+
+    def test_encode_into_large_array(self):
+        buffer = bytearray()
+        end = ProtocolEncoder.encode_into(buffer, list(range(10000)))
+
+        assert end == 5 + 10 * 10000
+        assert buffer[end - 8:end] == struct.pack('<q', 9999)
+
+    def test_encode_into_unsupported_type(self):
+        with pytest.raises(ValueError, match="Unsupported value type"):
+            ProtocolEncoder.encode_into(bytearray(), [1, object()])
+
+    def test_encode_value_into(self):
+        buffer = bytearray()
+        end = ProtocolEncoder.encode_value_into(buffer, "hi")
+        assert buffer[:end] == ProtocolEncoder.encode_value("hi")
+
+    def test_encode_array_and_map(self):
+        assert ProtocolEncoder.encode_array([1]) == (bytes([CompositeType.ARRAY]) + struct.pack('<I', 1) +
+                                                     bytes([CompositeType.PRIMITIVE]) +
+                                                     ProtocolEncoder.encode_value(1))
+        assert ProtocolEncoder.encode_map({}) == bytes([CompositeType.MAP]) + struct.pack('<I', 0)
@@ -0,0 +1,101 @@
+import pytest
+from src.protocol.encoder import ProtocolEncoder
+from src.protocol.lazy import _MISSING, LazyArray, LazyMap, decode_lazy
+
+
+class TestLazyArray:
+
+    def test_len_and_index(self):
+        array = LazyArray(ProtocolEncoder.encode_array([1, "two", 3.0, True, b"five"]))
+
+        assert len(array) == 5
+        assert array[1] == "two"
+        assert array[-1] == b"five"
+        assert array[0] == 1
+
+    def test_decodes_only_accessed_elements(self):
+        array = LazyArray(ProtocolEncoder.encode_array(list(range(100))))
+
+        assert array[42] == 42
+        assert sum(1 for value in array._values if value is not _MISSING) == 1
+
+    def test_iteration_and_slicing(self):
+        values = ["a", [1, 2], {"k": "v"}, 7]
+        array = LazyArray(ProtocolEncoder.encode_array(values))
+
+        assert list(array) == values
+        assert array[1:3] == values[1:3]
+        assert array[::-1] == values[::-1]
+        assert array == values
+
+    def test_index_out_of_range(self):
+        array = LazyArray(ProtocolEncoder.encode_array([1]))
+        with pytest.raises(IndexError):
+            array[1]
+
+    def test_empty(self):
+        array = LazyArray(ProtocolEncoder.encode_array([]))
+        assert len(array) == 0
+        assert not array
+        assert array.nbytes == 5
+
+    def test_not_an_array_raises(self):
+        with pytest.raises(ValueError, match="Not an encoded array"):
+            LazyArray(ProtocolEncoder.encode_map({}))
+
+    def test_truncated_data_raises_on_construction(self):
+        data = ProtocolEncoder.encode_array(["abc", "def"])[:-1]
+        with pytest.raises(ValueError):
+            LazyArray(data)
+
+    def test_overlong_string_length_raises(self):
+        data = bytearray(ProtocolEncoder.encode_array(["abc", 1]))
+        data[7] = 200
+        with pytest.raises(ValueError):
+            LazyArray(data)
+
+    def test_unknown_type_raises_on_construction(self):
+        data = bytearray(ProtocolEncoder.encode_array([1]))
+        data[6] = 0xFF
+        with pytest.raises(ValueError, match="Unknown data type"):
+            LazyArray(data)
+
+
+class TestLazyMap:
+
+    def test_lookup_and_len(self):
+        lazy_map = LazyMap(ProtocolEncoder.encode_map({"a": 1, "b": [1, 2], "c": {"x": "y"}}))
+
+        assert len(lazy_map) == 3
+        assert lazy_map["b"] == [1, 2]
+        assert lazy_map["c"] == {"x": "y"}
+        assert "a" in lazy_map
+        assert "z" not in lazy_map
+        assert lazy_map.get("z") is None
+
+    def test_values_decoded_on_first_access(self):
+        lazy_map = LazyMap(ProtocolEncoder.encode_map({"a": 1, "b": 2}))
+
+        assert lazy_map._values == {}
+        assert lazy_map["a"] == 1
+        assert lazy_map._values == {"a": 1}
+
+    def test_equality_and_iteration(self):
+        value = {"a": 1, "b": "two"}
+        lazy_map = LazyMap(ProtocolEncoder.encode_map(value))
+
+        assert list(lazy_map) == ["a", "b"]
+        assert lazy_map == value
+        assert lazy_map.to_dict() == value
+
+    def test_missing_key_raises(self):
+        with pytest.raises(KeyError):
+            LazyMap(ProtocolEncoder.encode_map({}))["a"]
+
+
+class TestDecodeLazy:
+
+    def test_dispatches_on_composite_type(self):
+        assert isinstance(decode_lazy(ProtocolEncoder.encode_array([1])), LazyArray)
+        assert isinstance(decode_lazy(ProtocolEncoder.encode_map({"a": 1})), LazyMap)
+        assert decode_lazy(ProtocolEncoder.encode_composite_value(5)) == 5
@@ -0,0 +1,75 @@
+import struct
+import pytest
+from src.protocol.encoder import ProtocolEncoder
+from src.protocol.numpy_codec import decode_numeric_array, encode_numeric_array
+from src.protocol.types import DataType
+
+np = pytest.importorskip("numpy")
+
+
+class TestNumpyCodec:
+
+    def test_encode_int_array_matches_encoder(self):
+        data_type, records = encode_numeric_array(np.arange(5, dtype=np.int32))
+
+        assert data_type == DataType.INT
+        assert records.tobytes() == b"".join(ProtocolEncoder.encode_value(i) for i in range(5))
+
+    def test_encode_float_array_matches_encoder(self):
+        values = [0.5, -1.25, 3.0]
+        data_type, records = encode_numeric_array(np.array(values))
+
+        assert data_type == DataType.FLOAT
+        assert records.tobytes() == b"".join(ProtocolEncoder.encode_value(v) for v in values)
+
+    def test_encode_bool_array_matches_encoder(self):
+        data_type, records = encode_numeric_array(np.array([True, False]))
+
+        assert data_type == DataType.BOOL
+        assert records.tobytes() == ProtocolEncoder.encode_value(True) + ProtocolEncoder.encode_value(False)
+
+    def test_encode_rejects_unsupported(self):
+        with pytest.raises(ValueError, match="one-dimensional"):
+            encode_numeric_array(np.zeros((2, 2)))
+        with pytest.raises(ValueError, match="Unsupported array dtype"):
+            encode_numeric_array(np.array(["a"]))
+        with pytest.raises(ValueError, match="signed 64-bit"):
+            encode_numeric_array(np.array([2 ** 64 - 1], dtype=np.uint64))
+
+    def test_decode_int_array(self):
+        payload = ProtocolEncoder.encode_composite_value(list(range(1000)))
+        result = decode_numeric_array(payload)
+
+        assert result.dtype == np.int64
+        assert result.tolist() == list(range(1000))
+
+    def test_decode_float_array_with_dtype(self):
+        payload = ProtocolEncoder.encode_composite_value([1.5, 2.5])
+        result = decode_numeric_array(memoryview(payload), dtype=np.float32)
+
+        assert result.dtype == np.float32
+        assert result.tolist() == [1.5, 2.5]
+
+    def test_decode_mixed_int_float(self):
+        payload = ProtocolEncoder.encode_composite_value([1, 2.5, 3])
+        assert decode_numeric_array(payload).tolist() == [1.0, 2.5, 3.0]
+
+    def test_decode_falls_back_for_other_types(self):
+        payload = ProtocolEncoder.encode_composite_value([True, 7])
+        assert decode_numeric_array(payload, dtype=np.int64).tolist() == [1, 7]
+
+    def test_decode_misaligned_string_is_detected(self):
+        # A 4-byte string is exactly one record long; it must not be read as a number.
+        payload = ProtocolEncoder.encode_composite_value(["abcd", 1])
+        with pytest.raises(ValueError):
+            decode_numeric_array(payload, dtype=np.int64)
+
+    def test_decode_empty(self):
+        assert decode_numeric_array(None).size == 0
+        assert decode_numeric_array(ProtocolEncoder.encode_composite_value([])).size == 0
+
+    def test_result_does_not_alias_payload(self):
+        payload = bytearray(ProtocolEncoder.encode_composite_value([1, 2]))
+        result = decode_numeric_array(payload)
+        payload[7:15] = struct.pack('<q', 99)
+        assert result.tolist() == [1, 2]
@@ -1,7 +1,9 @@
 import pytest
 import struct
-from src.protocol.packet import RequestPacket, ResponsePacket
-from src.protocol.types import CompositeType, DataType, Operation, Status
+from src.protocol.encoder import ProtocolEncoder
+from src.protocol.lazy import LazyArray
+from src.protocol.packet import _IDEMPOTENT, _READ_ONLY, _RESPONSE_SCHEMAS, RequestPacket, ResponsePacket
+from src.protocol.types import CompositeType, DataType, Operation, ResponseSchema, Status
 
 
 class TestRequestPacket:
@@ -57,6 +59,40 @@ class TestRequestPacket:
         assert isinstance(result, bytes)
         assert len(result) > len(params) + 4
 
+    def test_request_packet_to_buffers_keeps_params_by_reference(self):
+        blob = b"x" * 100
+        packet = RequestPacket(
+            CompositeType.PRIMITIVE,
+            DataType.BLOB,
+            Operation.SET,
+            "key",
+            [b"\x04" + struct.pack('<I', len(blob)), blob]
+        )
+        buffers = packet.to_buffers()
+
+        assert buffers[-1] is blob
+        assert struct.unpack('<I', buffers[0][:4])[0] == sum(len(buffer) for buffer in buffers) - 4
+        assert packet.to_bytes() == b"".join(buffers)
+
+    def test_request_packet_single_buffer_list_is_unwrapped(self):
+        packet = RequestPacket(CompositeType.PRIMITIVE, DataType.INT, Operation.SET, "key", [b"abc"])
+        assert packet.params == b"abc"
+
+    def test_idempotent_operations(self):
+        def packet(composite, operation):
+            return RequestPacket(composite, DataType.STRING, operation, "k")
+
+        assert packet(CompositeType.PRIMITIVE, Operation.GET).is_idempotent
+        assert packet(CompositeType.PRIMITIVE, Operation.SET).is_idempotent
+        assert packet(CompositeType.MAP, Operation.MAP_SET).is_idempotent
+        assert not packet(CompositeType.PRIMITIVE, Operation.INCREMENT).is_idempotent
+        assert not packet(CompositeType.PRIMITIVE, Operation.REMOVE).is_idempotent
+        assert not packet(CompositeType.ARRAY, Operation.INSERT).is_idempotent
+
+    def test_read_only_and_idempotent_are_real_operations(self):
+        assert _READ_ONLY <= _RESPONSE_SCHEMAS.keys()
+        assert _IDEMPOTENT <= _RESPONSE_SCHEMAS.keys()
+
 
 class TestResponsePacket:
 
@@ -93,4 +129,45 @@ class TestResponsePacket:
         response_bytes = bytes([Status.OK, 0xFF, 0xFE])
         packet = ResponsePacket.from_bytes(response_bytes)
         assert packet.status == Status.OK
-        assert packet.data == bytes([0xFF, 0xFE])
\ No newline at end of file
+        assert packet.data == bytes([0xFF, 0xFE])
+
+    def test_response_schema_derived_from_request(self):
+        get = RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.GET, "k")
+        set_ = RequestPacket(CompositeType.PRIMITIVE, DataType.INT, Operation.SET, "k")
+        keys = RequestPacket(CompositeType.MAP, DataType.STRING, Operation.MAP_KEYS, "k")
+        slice_ = RequestPacket(CompositeType.ARRAY, DataType.STRING, Operation.SLICE, "k")
+
+        assert get.response_schema == ResponseSchema.VALUE
+        assert set_.response_schema == ResponseSchema.NONE
+        assert keys.response_schema == ResponseSchema.COMPOSITE
+        assert slice_.response_schema == ResponseSchema.COMPOSITE
+
+    def test_response_packet_from_bytes_value_schema(self):
+        response_bytes = bytes([Status.OK]) + ProtocolEncoder.encode_value("hello")
+        packet = ResponsePacket.from_bytes(response_bytes, ResponseSchema.VALUE)
+        assert packet.data == "hello"
+
+    def test_response_packet_from_bytes_composite_schema(self):
+        response_bytes = bytes([Status.OK]) + ProtocolEncoder.encode_composite_value(["a", "b"])
+        packet = ResponsePacket.from_bytes(response_bytes, ResponseSchema.COMPOSITE)
+        assert packet.data == ["a", "b"]
+
+    def test_response_packet_from_bytes_lazy_schema(self):
+        response_bytes = bytes([Status.OK]) + ProtocolEncoder.encode_composite_value(["a", "b"])
+        packet = ResponsePacket.from_bytes(response_bytes, ResponseSchema.LAZY)
+        assert isinstance(packet.data, LazyArray)
+        assert packet.data == ["a", "b"]
+
+    def test_response_packet_from_bytes_none_schema_ignores_payload(self):
+        response_bytes = bytes([Status.OK]) + ProtocolEncoder.encode_value(1)
+        packet = ResponsePacket.from_bytes(response_bytes, ResponseSchema.NONE)
+        assert packet.data is None
+
+    def test_response_packet_from_bytes_error_status_skips_decoding(self):
+        packet = ResponsePacket.from_bytes(bytes([Status.NOT_FOUND, 0xFF]), ResponseSchema.VALUE)
+        assert packet.status == Status.NOT_FOUND
+        assert packet.data is None
+
+    def test_response_packet_from_bytes_schema_mismatch_raises(self):
+        with pytest.raises(ValueError, match="Unknown data type"):
+            ResponsePacket.from_bytes(bytes([Status.OK, 0xFF, 0xFE]), ResponseSchema.VALUE)
@@ -0,0 +1,85 @@
+import io
+import asyncio
+import pytest
+from src.protocol.encoder import ProtocolEncoder
+from src.protocol.stream import aiter_stream, iter_stream
+
+
+def stream(value):
+    data = ProtocolEncoder.encode_composite_value(value)
+    reads = []
+
+    def read(n):
+        reads.append(n)
+        return buffer.read(n)
+
+    buffer = io.BytesIO(data)
+    return read, len(data), reads
+
+
+class TestIterStream:
+
+    def test_array_elements(self):
+        values = [1, "two", 3.5, False, b"five", [6, [7]], {"eight": 8}, ""]
+        read, length, _ = stream(values)
+
+        assert list(iter_stream(read, length)) == values
+
+    def test_map_yields_pairs(self):
+        read, length, _ = stream({"a": 1, "b": [2, 3]})
+
+        assert list(iter_stream(read, length)) == [("a", 1), ("b", [2, 3])]
+
+    def test_primitive_yields_single_value(self):
+        read, length, _ = stream("hello")
+
+        assert list(iter_stream(read, length)) == ["hello"]
+
+    def test_reads_are_bounded_by_element(self):
+        read, length, reads = stream(["x" * 1000] * 100)
+
+        for _ in iter_stream(read, length):
+            pass
+
+        assert max(reads) == 1000
+        assert sum(reads) == length
+
+    def test_is_lazy(self):
+        read, length, reads = stream(list(range(1000)))
+
+        elements = iter_stream(read, length)
+        assert next(elements) == 0
+        assert sum(reads) < 20
+
+    def test_frame_shorter_than_contents(self):
+        read, length, _ = stream([1, 2, 3])
+
+        with pytest.raises(ValueError, match="shorter"):
+            list(iter_stream(read, length - 1))
+
+    def test_frame_longer_than_contents(self):
+        read, length, _ = stream([1, 2, 3])
+
+        with pytest.raises(ValueError, match="longer"):
+            list(iter_stream(read, length + 1))
+
+    def test_unknown_type(self):
+        data = io.BytesIO(bytes([1, 1, 0, 0, 0, 0, 0xFF]))
+
+        with pytest.raises(ValueError, match="Unknown data type"):
+            list(iter_stream(data.read, 7))
+
+
+class TestAiterStream:
+
+    def test_array_elements(self):
+        values = [1, "two", [3]]
+        read, length, _ = stream(values)
+
+        async def aread(n):
+            return read(n)
+
+        async def collect():
+            return [value async for value in aiter_stream(aread, length)]
+
+        assert asyncio.run(collect()) == values
@@ -0,0 +1,464 @@
+import asyncio
+import pytest
+from src.async_client import AsyncValkyrieClient
+from src.client import NOT_FOUND
+from src.connection.deadline import deadline
+from src.connection.hedging import HedgePolicy
+from src.connection.options import ConnectionOptions
+from src.exceptions.errors import (
+    ValkyrieCircuitOpenError, ValkyrieConnectionError, ValkyrieServerError, ValkyrieTimeoutError
+)
+from tests.fake_server import FakeServer, run
+
+
+class TestAsyncValkyrieClient:
+
+    def test_set_and_get(self):
+        async def scenario(server, port):
+            async with AsyncValkyrieClient('127.0.0.1', port, 'secret') as client:
+                await client.set('greeting', 'hello')
+                assert await client.get('greeting') == 'hello'
+
+        run(scenario)
+
+    def test_not_found_raises(self):
+        async def scenario(server, port):
+            async with AsyncValkyrieClient('127.0.0.1', port, 'secret') as client:
+                with pytest.raises(ValkyrieServerError, match="Key not found"):
+                    await client.get('missing')
+
+        run(scenario)
+
+    def test_wrong_password(self):
+        async def scenario(server, port):
+            client = AsyncValkyrieClient('127.0.0.1', port, 'wrong')
+            with pytest.raises(ValkyrieConnectionError, match="Failed to connect"):
+                await client.connect()
+            assert not client.is_connected
+
+        run(scenario)
+
+    def test_concurrent_requests_share_pool(self):
+        async def scenario(server, port):
+            async with AsyncValkyrieClient('127.0.0.1', port, 'secret', pool_size=4, min_pool_size=1) as client:
+                results = await asyncio.gather(*(client.increment('counter') for _ in range(200)))
+                assert sorted(results) == list(range(1, 201))
+                assert client.pool.size <= 4
+
+            assert server.connections <= 4
+
+        run(scenario)
+
+    def test_operations_require_connection(self):
+        async def scenario(server, port):
+            client = AsyncValkyrieClient('127.0.0.1', port, 'secret')
+            with pytest.raises(ValkyrieConnectionError, match="Not connected"):
+                await client.get('key')
+
+        run(scenario)
+
+    def test_auto_pipeline_coalesces_same_tick_requests(self):
+        async def scenario(server, port):
+            async with AsyncValkyrieClient('127.0.0.1', port, 'secret', auto_pipeline=True) as client:
+                await client.set('warm', 'up')
+                flushes = client._auto_pipeline.flush_count
+
+                results = await asyncio.gather(*(client.increment(f'counter:{i % 5}') for i in range(20)))
+
+                assert sorted(results) == sorted([n for n in range(1, 5) for _ in range(5)])
+                assert client._auto_pipeline.flush_count == flushes + 1
+
+        run(scenario)
+
+    def test_auto_pipeline_errors_are_per_request(self):
+        async def scenario(server, port):
+            async with AsyncValkyrieClient('127.0.0.1', port, 'secret', auto_pipeline=True) as client:
+                await client.set('present', 'value')
+                results = await asyncio.gather(client.get('present'), client.get('missing'), return_exceptions=True)
+
+                assert results[0] == 'value'
+                assert isinstance(results[1], ValkyrieServerError)
+
+        run(scenario)
+
+    def test_auto_pipeline_cancelled_caller_keeps_order(self):
+        async def scenario(server, port):
+            async with AsyncValkyrieClient('127.0.0.1', port, 'secret', auto_pipeline=True) as client:
+                await client.set('a', 'first')
+                await client.set('b', 'second')
+
+                cancelled = asyncio.ensure_future(client.get('a'))
+                survivor = asyncio.ensure_future(client.get('b'))
+                await asyncio.sleep(0)
+                cancelled.cancel()
+
+                assert await survivor == 'second'
+                assert await client.get('a') == 'first'
+
+        run(scenario)
+
+    def test_auto_pipeline_reconnects_after_failure(self):
+        async def scenario(server, port):
+            async with AsyncValkyrieClient('127.0.0.1', port, 'secret', auto_pipeline=True) as client:
+                await client.set('key', 'value')
+                broken = client._auto_pipeline
+                await broken.connection.disconnect()
+                await asyncio.sleep(0)
+
+                assert broken.closed
+                assert await client.get('key') == 'value'
+                assert client._auto_pipeline is not broken
+                assert client.pool.size == 1
+
+        run(scenario)
+
+    def test_iter_slice_streams_elements(self):
+        async def scenario(server, port):
+            server.arrays['numbers'] = list(range(100))
+            async with AsyncValkyrieClient('127.0.0.1', port, 'secret', auto_pipeline=True) as client:
+                values = [value async for value in client.arrays.iter_slice('numbers', 10, 20)]
+                assert values == list(range(10, 20))
+
+        run(scenario)
+
+    def test_iter_values_abandoned_discards_connection(self):
+        async def scenario(server, port):
+            server.maps['fields'] = {'a': 1, 'b': 2}
+            async with AsyncValkyrieClient('127.0.0.1', port, 'secret') as client:
+                values = client.maps.iter_values('fields')
+                assert await values.__anext__() == 1
+                await values.aclose()
+                assert client.pool.size == 0
+
+                assert [value async for value in client.maps.iter_values('fields')] == [1, 2]
+                assert client.pool.idle_count == 1
+
+        run(scenario)
+
+    def test_scan_with_prefetch_handles_shrink(self):
+        async def scenario(server, port):
+            server.arrays['numbers'] = list(range(100))
+            async with AsyncValkyrieClient('127.0.0.1', port, 'secret') as client:
+                values = []
+                async for value in client.arrays.scan('numbers', page_size=10, prefetch=2):
+                    values.append(value)
+                    if value == 25:
+                        del server.arrays['numbers'][30:]
+
+                assert values == list(range(len(values)))
+                assert 30 <= len(values) < 100
+                assert client.pool.idle_count == 1
+
+        run(scenario)
+
+    def test_bulk_map_operations(self):
+        async def scenario(server, port):
+            async with AsyncValkyrieClient('127.0.0.1', port, 'secret') as client:
+                fields = {f'field{i}': i for i in range(200)}
+                assert set((await client.maps.set_many('record', fields, window=16)).values()) == {None}
+
+                result = await client.maps.get_many('record', ['field5', 'missing', 'field7'])
+                assert result['field5'] == 5 and result['field7'] == 7
+                assert isinstance(result['missing'], ValkyrieServerError)
+
+                assert await client.maps.items('record') == list(fields.items())
+                await client.maps.remove_many('record', list(fields)[1:])
+                assert await client.maps.items('record') == [('field0', 0)]
+                assert client.pool.idle_count == 1
+
+        run(scenario)
+
+    def test_mset_mget_mremove(self):
+        async def scenario(server, port):
+            async with AsyncValkyrieClient('127.0.0.1', port, 'secret', auto_pipeline=True) as client:
+                await client.mset({f'key{i}': i for i in range(300)}, window=32)
+
+                result = await client.mget(['key1', 'nope', 'key299'])
+                assert result == {'key1': 1, 'nope': NOT_FOUND, 'key299': 299}
+
+                assert await client.mremove(['key1', 'nope']) == {'key1': None, 'nope': NOT_FOUND}
+                assert (await client.mget(['key1']))['key1'] is NOT_FOUND
+
+        run(scenario)
+
+    def test_insert_bulk_pipelines_chunks(self):
+        async def scenario(server, port):
+            server.arrays['numbers'] = ['head', 'tail']
+            async with AsyncValkyrieClient('127.0.0.1', port, 'secret') as client:
+                progress = []
+                inserted = await client.arrays.insert_bulk('numbers', 1, iter(range(1000)), chunk_size=64,
+                                                           progress=progress.append)
+
+                assert inserted == 1000
+                assert progress[-1] == 1000 and len(progress) == 16
+                assert server.arrays['numbers'] == ['head'] + list(range(1000)) + ['tail']
+
+        run(scenario)
+
+    def test_coalesce_reads_sends_one_request(self):
+        async def scenario(server, port):
+            async with AsyncValkyrieClient('127.0.0.1', port, 'secret', coalesce_reads=True) as client:
+                await client.set('hot', 'value')
+                before = server.requests
+
+                results = await asyncio.gather(*(client.get('hot') for _ in range(50)))
+                assert results == ['value'] * 50
+                assert server.requests == before + 1
+
+                before = server.requests
+                await asyncio.gather(*(client.set('hot', 'new') for _ in range(5)))
+                assert server.requests == before + 5
+
+        run(scenario)
+
+    def test_replicas_serve_reads_and_primary_takes_writes(self):
+        async def scenario(server, port):
+            replicas = [FakeServer() for _ in range(2)]
+            ports = [await replica.start() for replica in replicas]
+            try:
+                nodes = [('127.0.0.1', replica_port) for replica_port in ports]
+                async with AsyncValkyrieClient('127.0.0.1', port, 'secret', replicas=nodes) as client:
+                    await client.set('k', 'primary')
+                    assert server.store and not any(replica.store for replica in replicas)
+
+                    for replica in replicas:
+                        replica.store.update(server.store)
+                    before = server.requests
+                    assert [await client.get('k') for _ in range(20)] == ['primary'] * 20
+                    assert server.requests == before
+                    assert sum(replica.requests for replica in replicas) == 20
+
+                    # An unreachable replica is demoted and the primary answers instead.
+                    await client.replica_pools[0].close()
+                    await client.replica_pools[1].close()
+                    assert await client.get('k') == 'primary'
+                    assert server.requests == before + 1
+                    assert client.replica_router.demotions >= 1
+            finally:
+                for replica in replicas:
+                    await replica.stop()
+
+        run(scenario)
+
+    def test_hedged_read_beats_stalled_request(self):
+        async def scenario(server, port):
+            hedging = HedgePolicy(max_delay=0.02)
+            async with AsyncValkyrieClient('127.0.0.1', port, 'secret', pool_size=2,
+                                           hedging=hedging) as client:
+                await client.set('k', 'v')
+                server.stalls.append(2.0)
+
+                loop = asyncio.get_running_loop()
+                start = loop.time()
+                assert await client.get('k') == 'v'
+                assert loop.time() - start < 1.0
+                assert hedging.hedges_fired == 1
+                assert hedging.hedges_won == 1
+
+                assert await client.get('k') == 'v'
+                assert hedging.hedges_fired == 1
+
+        run(scenario)
+
+    def test_cancelled_replica_read_is_recorded(self):
+        async def scenario(server, port):
+            replica = FakeServer()
+            replica_port = await replica.start()
+            try:
+                hedging = HedgePolicy(max_delay=0.02)
+                async with AsyncValkyrieClient('127.0.0.1', port, 'secret', hedging=hedging,
+                                               replicas=[('127.0.0.1', replica_port)]) as client:
+                    await client.set('k', 'v')
+                    replica.stalls.extend([1.0] * 5)
+
+                    for _ in range(5):
+                        assert await client.get('k') == 'v'
+                    assert hedging.hedges_won == 5
+                    # Losers are cancelled without being awaited.
+                    await asyncio.sleep(0.05)
+
+                    router = client.replica_router
+                    assert router._pending == [0]
+                    assert router.latency(0) >= 0.02
+            finally:
+                await replica.stop()
+
+        run(scenario)
+
+    def test_hedging_respects_budget(self):
+        async def scenario(server, port):
+            hedging = HedgePolicy(max_delay=0.01, budget=0, burst=0)
+            async with AsyncValkyrieClient('127.0.0.1', port, 'secret', pool_size=2,
+                                           hedging=hedging) as client:
+                await client.set('k', 'v')
+                server.stalls.append(0.1)
+
+                assert await client.get('k') == 'v'
+                assert hedging.hedges_fired == 0
+                assert hedging.hedges_denied == 1
+
+        run(scenario)
+
+    def test_read_timeout_discards_stalled_connection(self):
+        async def scenario(server, port):
+            options = ConnectionOptions(connect_timeout=1, read_timeout=0.05)
+            async with AsyncValkyrieClient('127.0.0.1', port, 'secret', options=options) as client:
+                await client.set('k', 'v')
+                server.stalls.append(1.0)
+
+                with pytest.raises(ValkyrieTimeoutError):
+                    await client.get('k')
+                assert client.pool.size == 0
+
+                assert await client.get('k') == 'v'
+                assert server.connections == 2
+
+        run(scenario)
+
+    def test_deadline_bounds_request(self):
+        async def scenario(server, port):
+            async with AsyncValkyrieClient('127.0.0.1', port, 'secret') as client:
+                await client.set('k', 'v')
+                server.stalls.append(1.0)
+
+                loop = asyncio.get_running_loop()
+                start = loop.time()
+                with pytest.raises(ValkyrieTimeoutError):
+                    with deadline(0.05):
+                        await client.get('k')
+                assert loop.time() - start < 0.5
+
+                with deadline(1.0):
+                    assert await client.get('k') == 'v'
+
+        run(scenario)
+
+    def test_request_timeout_with_auto_pipeline(self):
+        async def scenario(server, port):
+            options = ConnectionOptions(request_timeout=0.05)
+            async with AsyncValkyrieClient('127.0.0.1', port, 'secret', auto_pipeline=True,
+                                           options=options) as client:
+                await client.set('k', 'v')
+                server.stalls.append(0.2)
+
+                with pytest.raises(ValkyrieTimeoutError):
+                    await client.get('k')
+
+                # The late response is dropped and the shared connection stays in sync.
+                await asyncio.sleep(0.3)
+                assert await client.get('k') == 'v'
+                assert server.connections == 1
+
+        run(scenario)
+
+    def test_read_timeout_with_auto_pipeline(self):
+        async def scenario(server, port):
+            options = ConnectionOptions(read_timeout=0.2)
+            async with AsyncValkyrieClient('127.0.0.1', port, 'secret', auto_pipeline=True,
+                                           options=options) as client:
+                await client.set('k', 'v')
+                # Idle longer than the read timeout, then stall mid-request.
+                await asyncio.sleep(0.3)
+                server.stalls.append(1.0)
+
+                loop = asyncio.get_running_loop()
+                start = loop.time()
+                with pytest.raises(ValkyrieTimeoutError):
+                    await client.get('k')
+                assert loop.time() - start < 0.6
+
+                assert await client.get('k') == 'v'
+
+        run(scenario)
+
+    def test_deadline_bounds_stream(self):
+        async def scenario(server, port):
+            options = ConnectionOptions(tcp_nodelay=False, send_buffer_size=1 << 16)
+            async with AsyncValkyrieClient('127.0.0.1', port, 'secret', options=options) as client:
+                await client.set('a', 'v')
+                server.stalls.append(1.0)
+
+                with pytest.raises(ValkyrieTimeoutError):
+                    with deadline(0.05):
+                        await client.mget(['a', 'b'])
+
+        run(scenario)
+
+    def test_read_survives_dropped_connections(self):
+        async def scenario(server, port):
+            async with AsyncValkyrieClient('127.0.0.1', port, 'secret', pool_size=2) as client:
+                await client.set('k', 'v')
+                server.hangups = 1
+
+                assert await client.get('k') == 'v'
+                # The idle connection opened before the failure is dropped too.
+                assert client.pool.size == 1
+                assert server.connections == 3
+
+        run(scenario)
+
+    def test_auto_pipelined_read_is_replayed(self):
+        async def scenario(server, port):
+            async with AsyncValkyrieClient('127.0.0.1', port, 'secret', auto_pipeline=True) as client:
+                await client.set('k', 'v')
+                server.hangups = 1
+
+                assert await asyncio.gather(client.get('k'), client.get('k')) == ['v', 'v']
+
+        run(scenario)
+
+    def test_unencodable_value_raises_before_sending(self):
+        async def scenario(server, port):
+            async with AsyncValkyrieClient('127.0.0.1', port, 'secret') as client:
+                before = server.requests
+
+                with pytest.raises(ValueError, match="Unsupported value type"):
+                    await client.maps.set_many('k', {'a': 1, 'b': object()})
+                assert server.requests == before
+                assert client.pool.size == 1
+                assert server.connections == 1
+
+        run(scenario)
+
+    def test_increment_is_not_replayed(self):
+        async def scenario(server, port):
+            async with AsyncValkyrieClient('127.0.0.1', port, 'secret') as client:
+                server.hangups = 1
+                before = server.requests
+
+                with pytest.raises(ValkyrieConnectionError):
+                    await client.increment('n')
+                assert server.requests == before + 1
+
+                await client.set('k', 'v')
+                assert await client.get('k') == 'v'
+
+        run(scenario)
+
+    def test_batch_replays_unanswered_requests(self):
+        async def scenario(server, port):
+            async with AsyncValkyrieClient('127.0.0.1', port, 'secret') as client:
+                keys = [f"key:{i}" for i in range(20)]
+                await client.mset({key: i for i, key in enumerate(keys)})
+                server.hangups = 1
+
+                assert list((await client.mget(keys, window=4)).values()) == list(range(20))
+
+        run(scenario)
+
+    def test_circuit_opens_while_server_is_down(self):
+        async def scenario(server, port):
+            async with AsyncValkyrieClient('127.0.0.1', port, 'secret', breaker_threshold=2,
+                                           breaker_timeout=60) as client:
+                await client.pool.purge()
+                await server.stop()
+
+                # One failed connect, one replay after backoff, then the circuit opens.
+                with pytest.raises(ValkyrieCircuitOpenError):
+                    await client.get('k')
+                assert client.pool.breaker.trips == 1
+
+                with pytest.raises(ValkyrieCircuitOpenError):
+                    await client.get('k')
+
+        run(scenario)
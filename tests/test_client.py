@@ -0,0 +1,577 @@
+import io
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from unittest.mock import MagicMock, Mock, patch
+from src.cache.near_cache import NearCache
+from src.client import NOT_FOUND, ValkyrieClient
+from src.connection.connection import TCPConnection
+from src.connection.deadline import deadline
+from src.connection.hedging import HedgePolicy
+from src.connection.options import ConnectionOptions
+from src.connection.pool import ConnectionPool
+from src.connection.replica_router import ReplicaRouter, primary_reads
+from src.connection.retry import RetryPolicy
+from src.operations.arrays import ArrayOperations
+from src.protocol.encoder import ProtocolEncoder
+from src.protocol.packet import RequestPacket
+from src.protocol.types import CompositeType, DataType, Operation, Status
+from src.writer import ArrayWriter
+from src.exceptions.errors import ValkyrieConnectionError, ValkyrieServerError, ValkyrieTimeoutError
+
+
+def frame(status, payload=b''):
+    return struct.pack('<I', 1 + len(payload)) + bytes([status]) + payload
+
+
+@pytest.fixture
+def connect_client():
+    def connect(*frames, **client_kwargs):
+        stream = io.BytesIO(b''.join(frames))
+        connection = Mock(spec=TCPConnection, is_connected=True)
+        connection.receive.side_effect = stream.read
+        with patch('src.connection.pool.TCPConnection', return_value=connection), \
+                patch('src.connection.pool.AuthHandler'):
+            client = ValkyrieClient(**client_kwargs)
+            client.connect()
+        return client, connection
+
+    return connect
+
+
+class TestStreaming:
+
+    def test_iter_slice_yields_elements(self, connect_client):
+        values = ["a", 1, [2.5]]
+        client, connection = connect_client(frame(Status.OK, ProtocolEncoder.encode_array(values)))
+
+        assert list(client.arrays.iter_slice("key", 0, 3)) == values
+        connection.send_buffers.assert_called_once()
+        assert client.pool.idle_count == 1
+
+    def test_iter_values(self, connect_client):
+        client, _ = connect_client(frame(Status.OK, ProtocolEncoder.encode_array([1, 2])))
+
+        assert list(client.maps.iter_values("key")) == [1, 2]
+
+    def test_empty_payload(self, connect_client):
+        client, _ = connect_client(frame(Status.OK))
+
+        assert list(client.arrays.iter_slice("key", 0, 0)) == []
+        assert client.pool.idle_count == 1
+
+    def test_error_status_keeps_connection(self, connect_client):
+        client, connection = connect_client(frame(Status.NOT_FOUND))
+
+        with pytest.raises(ValkyrieServerError, match="Key not found"):
+            list(client.arrays.iter_slice("key", 0, 1))
+        assert client.pool.idle_count == 1
+        connection.disconnect.assert_not_called()
+
+    def test_abandoned_stream_discards_connection(self, connect_client):
+        client, connection = connect_client(frame(Status.OK, ProtocolEncoder.encode_array([1, 2, 3])))
+
+        elements = client.arrays.iter_slice("key", 0, 3)
+        assert next(elements) == 1
+        elements.close()
+
+        assert client.pool.size == 0
+        connection.disconnect.assert_called_once()
+
+    def test_malformed_frame_raises_connection_error(self, connect_client):
+        client, _ = connect_client(frame(Status.OK, ProtocolEncoder.encode_array([1])[:-1]))
+
+        with pytest.raises(ValkyrieConnectionError, match="Communication error"):
+            list(client.arrays.iter_slice("key", 0, 1))
+        assert client.pool.size == 0
+
+
+class TestStreamRequests:
+
+    def packets(self, count):
+        return [RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.GET, f"k{i}") for i in range(count)]
+
+    def test_window_bounds_requests_in_flight(self, connect_client):
+        int_frame = frame(Status.OK, ProtocolEncoder.encode_value(1))
+        client, connection = connect_client(*[int_frame] * 5)
+        connection.receive_response.side_effect = lambda deadline=None: bytes([Status.OK]) + ProtocolEncoder.encode_value(1)
+        sent = []
+        connection.send_buffers.side_effect = lambda buffers, deadline=None: sent.append(len(buffers))
+
+        results = list(client._stream_requests(self.packets(5), window=2))
+
+        assert [result.data for result in results] == [1] * 5
+        assert sent == [2, 1, 1, 1]
+        assert client.pool.idle_count == 1
+
+    def test_error_statuses_are_yielded(self, connect_client):
+        client, connection = connect_client()
+        connection.receive_response.side_effect = [bytes([Status.NOT_FOUND]), bytes([Status.OK])]
+
+        results = list(client._stream_requests(self.packets(2), window=4))
+
+        assert isinstance(results[0], ValkyrieServerError)
+        assert results[0].status == Status.NOT_FOUND
+        assert results[1].status == Status.OK
+        assert client.pool.idle_count == 1
+
+    def test_unencodable_value_raises_before_sending(self, connect_client):
+        client, connection = connect_client()
+
+        with pytest.raises(ValueError, match="Unsupported value type"):
+            client.maps.set_many("k", {"a": 1, "b": object()})
+        with pytest.raises(ValueError, match="Unsupported value type"):
+            client.mset({"a": 1, "b": object()})
+        with pytest.raises(ValueError, match="Unsupported value type"):
+            client.arrays.insert_bulk("log", 0, [1, object()], chunk_size=1)
+
+        connection.send_buffers.assert_not_called()
+        assert client.pool.idle_count == 1
+
+    def test_packet_error_after_sending_keeps_connection_in_sync(self, connect_client):
+        client, connection = connect_client()
+        connection.receive_response.side_effect = lambda deadline=None: bytes([Status.OK])
+
+        def packets():
+            yield from self.packets(2)
+            raise ValueError("bad value")
+
+        results = []
+        with pytest.raises(ValueError, match="bad value"):
+            for result in client._stream_requests(packets(), window=2):
+                results.append(result)
+
+        assert len(results) == 2
+        assert connection.receive_response.call_count == 2
+        assert client.pool.idle_count == 1
+
+    def test_invalid_window(self, connect_client):
+        client, _ = connect_client()
+
+        with pytest.raises(ValueError):
+            next(client._stream_requests(self.packets(1), window=0))
+
+
+class TestMultiKey:
+
+    def test_mget_maps_not_found_to_sentinel(self, connect_client):
+        client, connection = connect_client()
+        connection.receive_response.side_effect = [
+            bytes([Status.OK]) + ProtocolEncoder.encode_value("x"),
+            bytes([Status.NOT_FOUND]),
+            bytes([Status.OK]) + ProtocolEncoder.encode_value(3),
+        ]
+
+        result = client.mget(["a", "b", "c"])
+
+        assert result == {"a": "x", "b": NOT_FOUND, "c": 3}
+        assert list(result) == ["a", "b", "c"]
+        assert not NOT_FOUND
+
+    def test_mget_raises_other_errors_after_batch(self, connect_client):
+        client, connection = connect_client()
+        connection.receive_response.side_effect = [bytes([Status.WRONG_TYPE]), bytes([Status.OK])]
+
+        with pytest.raises(ValkyrieServerError, match="Wrong data type"):
+            client.mget(["a", "b"])
+        assert connection.receive_response.call_count == 2
+        assert client.pool.idle_count == 1
+
+    def test_mget_windows_requests(self, connect_client):
+        client, connection = connect_client()
+        connection.receive_response.side_effect = lambda deadline=None: bytes([Status.OK]) + ProtocolEncoder.encode_value(0)
+        sent = []
+        connection.send_buffers.side_effect = lambda buffers, deadline=None: sent.append(len(buffers))
+
+        result = client.mget([f"k{i}" for i in range(10)], window=4)
+
+        assert len(result) == 10
+        assert sent[0] == 4 and max(sent) <= 4
+
+    def test_mremove(self, connect_client):
+        client, connection = connect_client()
+        connection.receive_response.side_effect = [bytes([Status.OK]), bytes([Status.NOT_FOUND])]
+
+        assert client.mremove(["a", "b"]) == {"a": None, "b": NOT_FOUND}
+
+    def test_requires_connection(self):
+        with pytest.raises(ValkyrieConnectionError, match="Not connected"):
+            ValkyrieClient().mget(["a"])
+
+
+class TestNearCache:
+
+    def ok(self, value=None):
+        return bytes([Status.OK]) + (b'' if value is None else ProtocolEncoder.encode_value(value))
+
+    def test_repeated_get_served_from_cache(self, connect_client):
+        cache = NearCache()
+        client, connection = connect_client(near_cache=cache)
+        connection.receive_response.side_effect = [self.ok("v")]
+
+        assert client.get("a") == "v"
+        assert client.get("a") == "v"
+
+        assert connection.receive_response.call_count == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_write_invalidates(self, connect_client):
+        client, connection = connect_client(near_cache=NearCache())
+        connection.receive_response.side_effect = [self.ok(1), self.ok(2), self.ok(2)]
+
+        assert client.get("n") == 1
+        assert client.increment("n") == 2
+        assert client.get("n") == 2
+        assert connection.receive_response.call_count == 3
+
+    def test_map_field_cached_and_invalidated(self, connect_client):
+        client, connection = connect_client(near_cache=NearCache())
+        connection.receive_response.side_effect = [self.ok("Ada"), self.ok(), self.ok("Grace")]
+
+        assert client.maps.get("user", "name") == "Ada"
+        assert client.maps.get("user", "name") == "Ada"
+        client.maps.set("user", "name", "Grace")
+        assert client.maps.get("user", "name") == "Grace"
+        assert connection.receive_response.call_count == 3
+
+    def test_pipelined_writes_invalidate(self, connect_client):
+        cache = NearCache()
+        client, connection = connect_client(near_cache=cache)
+        connection.receive_response.side_effect = [self.ok("old"), self.ok(), self.ok()]
+
+        client.get("a")
+        client.mset({"a": "new", "b": "x"})
+        assert len(cache) == 0
+
+        connection.receive_response.side_effect = [self.ok(), self.ok()]
+        with client.pipeline() as pipe:
+            client.near_cache.put("a", None, "stale")
+            pipe.set("a", "newer").execute()
+        assert len(cache) == 0
+
+    def test_disabled_by_default(self, connect_client):
+        client, connection = connect_client()
+        connection.receive_response.side_effect = [self.ok(1), self.ok(1)]
+
+        client.get("a")
+        client.get("a")
+        assert connection.receive_response.call_count == 2
+
+
+class TestDeadlines:
+
+    def ok(self, value=None):
+        return bytes([Status.OK]) + (b'' if value is None else ProtocolEncoder.encode_value(value))
+
+    def client(self, *responses, **client_kwargs):
+        connection = Mock(spec=TCPConnection)
+        connection.receive_response.side_effect = list(responses)
+        pool = MagicMock(spec=ConnectionPool, closed=False, timeout=None)
+        pool.connection.return_value.__enter__.return_value = connection
+        client = ValkyrieClient(**client_kwargs)
+        client.pool = pool
+        return client, pool, connection
+
+    def test_no_deadline_by_default(self):
+        client, pool, connection = self.client(self.ok("v"))
+        read = RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.GET, "k")
+
+        assert client._send_request(read).data == "v"
+        pool.connection.assert_called_once_with(None)
+        assert connection.receive_response.call_args.args == (None,)
+
+    def test_deadline_reaches_pool_and_socket(self):
+        client, pool, connection = self.client(self.ok("v"))
+        read = RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.GET, "k")
+
+        with deadline(5) as at:
+            client._send_request(read)
+        assert 4 < pool.connection.call_args.args[0] <= 5
+        assert connection.send_buffers.call_args.args[1] == at
+        assert connection.receive_response.call_args.args == (at,)
+
+    def test_request_timeout_option(self):
+        client, pool, connection = self.client(self.ok(), options=ConnectionOptions(request_timeout=2))
+        write = RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.SET, "k",
+                              ProtocolEncoder.encode_value("v"))
+
+        start = time.monotonic()
+        client._send_request(write)
+        at = connection.receive_response.call_args.args[0]
+        assert start + 2 <= at <= time.monotonic() + 2
+
+    def test_expired_deadline_sends_nothing(self):
+        client, pool, connection = self.client(self.ok("v"))
+        read = RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.GET, "k")
+
+        with deadline(0.001):
+            time.sleep(0.01)
+            with pytest.raises(ValkyrieTimeoutError):
+                client._send_request(read)
+        pool.connection.assert_not_called()
+
+    def test_deadline_covers_batches(self):
+        client, pool, connection = self.client(self.ok(), self.ok())
+        packets = [RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.SET, key,
+                                 ProtocolEncoder.encode_value("v")) for key in "ab"]
+
+        with deadline(5) as at:
+            client._send_requests(packets)
+        assert [c.args for c in connection.receive_response.call_args_list] == [(at,), (at,)]
+
+
+class TestReconnect:
+
+    def ok(self, value=None):
+        return bytes([Status.OK]) + (b'' if value is None else ProtocolEncoder.encode_value(value))
+
+    def client(self, *responses, **client_kwargs):
+        connection = Mock(spec=TCPConnection)
+        connection.receive_response.side_effect = list(responses)
+        pool = MagicMock(spec=ConnectionPool, closed=False, timeout=None)
+        pool.connection.return_value.__enter__.return_value = connection
+        client = ValkyrieClient(**client_kwargs)
+        client.pool = pool
+        return client, pool, connection
+
+    def get(self, key="k"):
+        return RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.GET, key)
+
+    def test_read_is_replayed_on_fresh_connection(self):
+        client, pool, connection = self.client(ValkyrieConnectionError("Connection closed by server"),
+                                               self.ok("v"))
+
+        assert client._send_request(self.get()).data == "v"
+        pool.purge.assert_called_once()
+        assert connection.send_buffers.call_count == 2
+
+    def test_set_is_replayed(self):
+        client, pool, connection = self.client(ValkyrieConnectionError("Connection closed by server"), self.ok())
+        write = RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.SET, "k",
+                              ProtocolEncoder.encode_value("v"))
+
+        client._send_request(write)
+        assert connection.send_buffers.call_count == 2
+
+    def test_increment_is_not_replayed(self):
+        client, pool, connection = self.client(ValkyrieConnectionError("Connection closed by server"))
+        increment = RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.INCREMENT, "k")
+
+        with pytest.raises(ValkyrieConnectionError):
+            client._send_request(increment)
+        assert connection.send_buffers.call_count == 1
+        pool.purge.assert_called_once()
+
+    def test_timeout_is_not_replayed(self):
+        client, pool, connection = self.client(ValkyrieTimeoutError("Timed out receiving data"))
+
+        with pytest.raises(ValkyrieTimeoutError):
+            client._send_request(self.get())
+        assert connection.send_buffers.call_count == 1
+        pool.purge.assert_not_called()
+
+    def test_gives_up_after_retries(self):
+        error = ValkyrieConnectionError("Failed to connect")
+        client, pool, connection = self.client(*[error] * 5, retry=RetryPolicy(retries=2, base_delay=0))
+
+        with pytest.raises(ValkyrieConnectionError):
+            client._send_request(self.get())
+        assert connection.send_buffers.call_count == 3
+
+    def test_retry_can_be_disabled(self):
+        client, pool, connection = self.client(ValkyrieConnectionError("Connection closed by server"),
+                                               retry=None)
+
+        with pytest.raises(ValkyrieConnectionError):
+            client._send_request(self.get())
+        assert connection.send_buffers.call_count == 1
+
+    def test_batch_replays_unanswered_requests(self):
+        client, pool, connection = self.client(self.ok("a"), ValkyrieConnectionError("Connection closed by server"),
+                                               self.ok("b"), self.ok("c"))
+
+        results = list(client._stream_requests([self.get(key) for key in "abc"], 8))
+
+        assert [result.data for result in results] == ["a", "b", "c"]
+        sent = [len(c.args[0]) for c in connection.send_buffers.call_args_list]
+        assert sent == [3, 2]
+
+    def test_pipeline_with_write_is_not_replayed(self):
+        client, pool, connection = self.client(ValkyrieConnectionError("Connection closed by server"))
+        increment = RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.INCREMENT, "k")
+
+        with pytest.raises(ValkyrieConnectionError):
+            client._send_requests([self.get(), increment])
+        assert connection.send_buffers.call_count == 1
+
+
+class TestReplicas:
+
+    def pool(self, *responses):
+        connection = Mock(spec=TCPConnection)
+        connection.receive_response.side_effect = list(responses)
+        pool = MagicMock(spec=ConnectionPool, closed=False, timeout=None)
+        pool.connection.return_value.__enter__.return_value = connection
+        return pool, connection
+
+    def client(self, primary, *replicas):
+        client = ValkyrieClient(replicas=[f"replica-{i}:8080" for i in range(len(replicas))])
+        client.pool = primary
+        client.replica_pools = list(replicas)
+        client.replica_router = ReplicaRouter(len(replicas))
+        return client
+
+    def ok(self, value=None):
+        return bytes([Status.OK]) + (b'' if value is None else ProtocolEncoder.encode_value(value))
+
+    def test_replicas_parsed(self):
+        client = ValkyrieClient(replicas=["r1:9000", ("r2", 9001)])
+        assert client.replicas == [("r1", 9000), ("r2", 9001)]
+
+    def test_reads_go_to_replica_and_writes_to_primary(self):
+        primary, primary_connection = self.pool(self.ok())
+        replica, replica_connection = self.pool(self.ok("v"))
+        client = self.client(primary, replica)
+
+        read = RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.GET, "k")
+        write = RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.SET, "k",
+                              ProtocolEncoder.encode_value("v"))
+
+        assert client._send_request(read).data == "v"
+        client._send_request(write)
+
+        assert replica_connection.send_buffers.call_count == 1
+        assert primary_connection.send_buffers.call_count == 1
+        assert client.replica_router.latency(0) is not None
+
+    def test_primary_reads_skip_replicas(self):
+        primary, primary_connection = self.pool(self.ok("fresh"))
+        replica, replica_connection = self.pool(self.ok("stale"))
+        client = self.client(primary, replica)
+
+        read = RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.GET, "k")
+        with primary_reads():
+            assert client._send_request(read).data == "fresh"
+
+        replica_connection.send_buffers.assert_not_called()
+        assert client.replica_router._pending == [0]
+
+    def test_writer_reads_length_from_primary(self):
+        primary, primary_connection = self.pool(self.ok(5), self.ok())
+        replica, replica_connection = self.pool(self.ok(2))
+        client = self.client(primary, replica)
+        client.arrays = ArrayOperations(client._send_request, client._stream_request, client._stream_requests)
+
+        writer = ArrayWriter(client, "events", max_delay_ms=None)
+        writer.append("x")
+        writer.close()
+
+        replica_connection.send_buffers.assert_not_called()
+        sent = [call.args[0] for call in primary_connection.send_buffers.call_args_list]
+        insert = b"".join(bytes(buffer) for buffer in sent[1])
+        assert insert.endswith(b"events" + struct.pack('<I', 5) + ProtocolEncoder.encode_value("x"))
+
+    def test_failed_replica_falls_back_to_primary(self):
+        primary, _ = self.pool(self.ok("from primary"))
+        replica, _ = self.pool()
+        replica.connection.side_effect = ValkyrieConnectionError("down")
+        client = self.client(primary, replica)
+
+        read = RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.GET, "k")
+
+        assert client._send_request(read).data == "from primary"
+        assert client.replica_router.is_demoted(0)
+
+    def test_error_status_from_replica_is_raised(self):
+        primary, primary_connection = self.pool()
+        replica, _ = self.pool(bytes([Status.NOT_FOUND]))
+        client = self.client(primary, replica)
+
+        read = RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.GET, "k")
+        with pytest.raises(ValkyrieServerError):
+            client._send_request(read)
+        assert primary_connection.send_buffers.call_count == 0
+
+
+class TestHedging:
+
+    def ok(self, value):
+        return bytes([Status.OK]) + ProtocolEncoder.encode_value(value)
+
+    def client(self, receive, hedging):
+        connection = Mock(spec=TCPConnection)
+        connection.receive_response.side_effect = receive
+        pool = MagicMock(spec=ConnectionPool, closed=False, timeout=None)
+        pool.connection.return_value.__enter__.return_value = connection
+
+        client = ValkyrieClient(pool_size=2, hedging=hedging)
+        client.pool = pool
+        client._hedge_executor = ThreadPoolExecutor(2)
+        return client, connection
+
+    def test_slow_read_is_hedged(self):
+        release = threading.Event()
+        responses = iter([(release, "slow"), (None, "fast")])
+
+        def receive(deadline=None):
+            event, value = next(responses)
+            if event is not None:
+                event.wait(5)
+            return self.ok(value)
+
+        hedging = HedgePolicy(max_delay=0.01)
+        client, connection = self.client(receive, hedging)
+        read = RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.GET, "k")
+
+        try:
+            assert client._send_request(read).data == "fast"
+        finally:
+            release.set()
+            client._hedge_executor.shutdown()
+
+        assert connection.send_buffers.call_count == 2
+        assert hedging.stats == {'reads': 1, 'hedges_fired': 1, 'hedges_won': 1, 'hedges_denied': 0}
+
+    def test_hedging_needs_a_second_connection(self):
+        with pytest.raises(ValueError, match="pool_size"):
+            ValkyrieClient(hedging=HedgePolicy())
+        ValkyrieClient(replicas=["r1:9000"], hedging=HedgePolicy())
+
+    def test_no_hedge_without_free_connection(self):
+        release = threading.Event()
+
+        def receive(deadline=None):
+            release.wait(0.1)
+            return self.ok("slow")
+
+        hedging = HedgePolicy(max_delay=0.01)
+        client, connection = self.client(receive, hedging)
+        client.pool.has_capacity = False
+        read = RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.GET, "k")
+
+        assert client._send_request(read).data == "slow"
+        client._hedge_executor.shutdown()
+        assert connection.send_buffers.call_count == 1
+        assert hedging.stats == {'reads': 1, 'hedges_fired': 0, 'hedges_won': 0, 'hedges_denied': 0}
+
+    def test_fast_read_is_not_hedged(self):
+        hedging = HedgePolicy(max_delay=1.0)
+        client, connection = self.client([self.ok("v")], hedging)
+        read = RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.GET, "k")
+
+        assert client._send_request(read).data == "v"
+        client._hedge_executor.shutdown()
+        assert hedging.hedges_fired == 0
+        assert connection.send_buffers.call_count == 1
+
+    def test_writes_are_never_hedged(self):
+        hedging = HedgePolicy(max_delay=0.0, min_delay=0.0)
+        client, connection = self.client([bytes([Status.OK])], hedging)
+        write = RequestPacket(CompositeType.PRIMITIVE, DataType.STRING, Operation.SET, "k",
+                              ProtocolEncoder.encode_value("v"))
+
+        client._send_request(write)
+        client._hedge_executor.shutdown()
+        assert hedging.reads == 0
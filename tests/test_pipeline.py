@@ -0,0 +1,101 @@
+import struct
+import pytest
+from unittest.mock import MagicMock, Mock
+from src.client import ValkyrieClient
+from src.pipeline import Pipeline
+from src.protocol.packet import RequestPacket, ResponsePacket
+from src.protocol.types import DataType, Operation, Status
+from src.exceptions.errors import ValkyrieServerError
+
+
+def make_client(responses):
+    connection = Mock()
+    connection.receive_response.side_effect = responses
+    pool = MagicMock(closed=False)
+    pool.connection.return_value.__enter__.return_value = connection
+
+    client = ValkyrieClient()
+    client.pool = pool
+    return client, connection
+
+
+class TestPipeline:
+
+    @pytest.fixture
+    def mock_send_requests(self):
+        return Mock()
+
+    @pytest.fixture
+    def pipeline(self, mock_send_requests):
+        return Pipeline(mock_send_requests)
+
+    def test_queues_operations(self, pipeline, mock_send_requests):
+        pipeline.get("a").increment("b")
+        pipeline.maps.get("map", "field")
+        pipeline.arrays.length("array")
+
+        assert len(pipeline) == 4
+        mock_send_requests.assert_not_called()
+
+    def test_execute_returns_results_in_order(self, pipeline, mock_send_requests):
+        error = ValkyrieServerError("Key not found")
+        mock_send_requests.return_value = [ResponsePacket(Status.OK, "value"), error, ResponsePacket(Status.OK, 3)]
+
+        pipeline.get("a").get("missing").increment("counter")
+        results = pipeline.execute()
+
+        assert results == ["value", error, 3]
+        packets = mock_send_requests.call_args[0][0]
+        assert [packet.operation for packet in packets] == [Operation.GET, Operation.GET, Operation.INCREMENT]
+        assert [packet.key for packet in packets] == ["a", "missing", "counter"]
+        assert len(pipeline) == 0
+
+    def test_execute_raise_on_error(self, pipeline, mock_send_requests):
+        mock_send_requests.return_value = [ValkyrieServerError("Key not found")]
+        pipeline.get("missing")
+
+        with pytest.raises(ValkyrieServerError):
+            pipeline.execute(raise_on_error=True)
+
+    def test_execute_empty(self, pipeline, mock_send_requests):
+        assert pipeline.execute() == []
+        mock_send_requests.assert_not_called()
+
+    def test_context_manager_resets(self, pipeline):
+        with pipeline as pipe:
+            pipe.get("a")
+
+        assert len(pipeline) == 0
+
+
+class TestClientSendRequests:
+
+    def test_single_write_and_ordered_reads(self):
+        ok_int = bytes([Status.OK, DataType.INT]) + struct.pack('<q', 7)
+        not_found = bytes([Status.NOT_FOUND])
+        client, connection = make_client([ok_int, not_found])
+        packets = [
+            RequestPacket(0, DataType.STRING, Operation.GET, "a"),
+            RequestPacket(0, DataType.STRING, Operation.GET, "b"),
+        ]
+
+        results = client._send_requests(packets)
+
+        connection.send_buffers.assert_called_once()
+        sent = b''.join(connection.send_buffers.call_args[0][0])
+        assert sent == packets[0].to_bytes() + packets[1].to_bytes()
+        assert connection.receive_response.call_count == 2
+        assert results[0].data == 7
+        assert isinstance(results[1], ValkyrieServerError)
+
+    def test_client_pipeline(self):
+        ok = bytes([Status.OK])
+        client, connection = make_client([ok, ok])
+        client.primitives = Mock()
+
+        with client.pipeline() as pipe:
+            pipe.append("a", "suffix")
+            pipe.remove("b")
+            assert pipe.execute() == [None, None]
+
+        connection.send_buffers.assert_called_once()
@@ -0,0 +1,187 @@
+import asyncio
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.async_sharded_client import AsyncShardedValkyrieClient
+from src.client import NOT_FOUND, ValkyrieClient
+from src.exceptions.errors import ValkyrieConnectionError, ValkyrieServerError
+from src.connection.nodes import parse_node
+from src.operations.batch import DEFAULT_WINDOW
+from src.sharded_client import ShardedValkyrieClient
+from tests.fake_server import FakeServer
+
+
+NODES = ["10.0.0.1:8080", "10.0.0.2:8080", ("10.0.0.3", 8080)]
+
+
+def fake_client(host, port, password, **kwargs):
+    store = {}
+    client = Mock(spec=ValkyrieClient, host=host, port=port, store=store, threads=set())
+    client.is_connected = False
+    client.primitives, client.maps, client.arrays = Mock(), Mock(), Mock()
+
+    def connect():
+        client.is_connected = True
+
+    def mget(keys, window):
+        client.threads.add(threading.current_thread().name)
+        return {key: store.get(key, NOT_FOUND) for key in keys}
+
+    client.connect.side_effect = connect
+    client.set.side_effect = store.__setitem__
+    client.get.side_effect = lambda key: store[key]
+    client.mget.side_effect = mget
+    client.mset.side_effect = lambda mapping, window: store.update(mapping)
+    return client
+
+
+@pytest.fixture
+def sharded():
+    with patch('src.sharded_client.ValkyrieClient', side_effect=fake_client):
+        client = ShardedValkyrieClient(NODES, password='secret')
+        client.connect()
+        yield client
+        client.disconnect()
+
+
+class TestShardedValkyrieClient:
+
+    def test_parse_node(self):
+        assert parse_node("localhost:9000") == ("localhost", 9000)
+        assert parse_node(("::1", "9000")) == ("::1", 9000)
+        with pytest.raises(ValueError):
+            parse_node("localhost")
+
+    def test_requires_nodes(self):
+        with pytest.raises(ValueError):
+            ShardedValkyrieClient([])
+
+    def test_keys_routed_to_owning_node(self, sharded):
+        for i in range(50):
+            sharded.set(f"key:{i}", i)
+
+        for name, client in sharded.clients.items():
+            assert all(sharded.ring.node_for(key) == name for key in client.store)
+        assert sum(len(client.store) for client in sharded.clients.values()) == 50
+        assert sharded.get("key:7") == 7
+
+    def test_hash_tag_colocates(self, sharded):
+        for field in ("name", "email", "age"):
+            sharded.set(f"user:{{1}}:{field}", field)
+
+        assert len({id(sharded.client_for(f"user:{{1}}:{field}")) for field in ("name", "email", "age")}) == 1
+
+    def test_operations_routed_by_key(self, sharded):
+        sharded.maps.get("user:1", "name")
+        sharded.arrays.slice("log", 0, 10)
+
+        sharded.client_for("user:1").maps.get.assert_called_once_with("user:1", "name")
+        sharded.client_for("log").arrays.slice.assert_called_once_with("log", 0, 10)
+
+    def test_mget_splits_by_node_and_preserves_order(self, sharded):
+        keys = [f"key:{i}" for i in range(30)]
+        sharded.mset({key: key.upper() for key in keys if key != "key:3"})
+
+        result = sharded.mget(keys)
+
+        assert list(result) == keys
+        assert result["key:3"] is NOT_FOUND
+        assert result["key:4"] == "KEY:4"
+        for client in sharded.clients.values():
+            assert client.mget.call_count == 1
+            assert all(name.startswith('ValkyrieShard') for name in client.threads)
+
+    def test_primitives_many_split_by_node(self, sharded):
+        keys = [f"key:{i}" for i in range(30)]
+        for client in sharded.clients.values():
+            client.primitives.get_many.side_effect = lambda group, **kwargs: {key: key.upper() for key in group}
+            client.primitives.set_many.side_effect = lambda mapping, **kwargs: {key: None for key in mapping}
+
+        result = sharded.primitives.get_many(keys, raise_on_error=True)
+        assert result == {key: key.upper() for key in keys}
+        assert list(sharded.primitives.set_many({key: 1 for key in keys})) == keys
+
+        for name, client in sharded.clients.items():
+            group = [key for key in keys if sharded.ring.node_for(key) == name]
+            client.primitives.get_many.assert_called_once_with(group, raise_on_error=True, window=DEFAULT_WINDOW)
+            assert list(client.primitives.set_many.call_args.args[0]) == group
+
+    def test_single_node_batch_runs_inline(self, sharded):
+        sharded.mget(["{tag}a", "{tag}b"])
+
+        client = sharded.client_for("{tag}a")
+        assert client.threads == {threading.current_thread().name}
+
+    def test_shard_error_is_raised(self, sharded):
+        failing = next(iter(sharded.clients.values()))
+        failing.mget.side_effect = ValkyrieConnectionError("down")
+
+        with pytest.raises(ValkyrieConnectionError, match="down"):
+            sharded.mget([f"key:{i}" for i in range(30)])
+
+    def test_add_and_remove_node(self, sharded):
+        keys = [f"key:{i}" for i in range(3000)]
+        before = {key: sharded.ring.node_for(key) for key in keys}
+
+        with patch('src.sharded_client.ValkyrieClient', side_effect=fake_client):
+            name = sharded.add_node("10.0.0.4:8080")
+        assert sharded.clients[name].is_connected
+
+        moved = [key for key in keys if sharded.ring.node_for(key) != before[key]]
+        assert 0.1 < len(moved) / len(keys) < 0.4
+        assert all(sharded.ring.node_for(key) == name for key in moved)
+
+        sharded.remove_node(name)
+        assert name not in sharded.clients
+        assert {key: sharded.ring.node_for(key) for key in keys} == before
+
+    def test_failed_connect_disconnects_all(self):
+        def failing_client(host, port, password, **kwargs):
+            client = fake_client(host, port, password)
+            if host == "10.0.0.2":
+                client.connect.side_effect = ValkyrieConnectionError("refused")
+            return client
+
+        with patch('src.sharded_client.ValkyrieClient', side_effect=failing_client):
+            client = ShardedValkyrieClient(NODES)
+            with pytest.raises(ValkyrieConnectionError):
+                client.connect()
+
+        for shard in client.clients.values():
+            shard.disconnect.assert_called()
+
+
+class TestAsyncShardedValkyrieClient:
+
+    def test_keys_spread_over_servers(self):
+        async def main():
+            servers = [FakeServer() for _ in range(3)]
+            ports = [await server.start() for server in servers]
+            try:
+                nodes = [("127.0.0.1", port) for port in ports]
+                async with AsyncShardedValkyrieClient(nodes, 'secret') as client:
+                    keys = [f"key:{i}" for i in range(60)]
+                    await client.mset({key: i for i, key in enumerate(keys)})
+
+                    assert all(server.store for server in servers)
+                    assert sum(len(server.store) for server in servers) == 60
+
+                    result = await client.mget(keys + ["missing"])
+                    assert list(result.values()) == list(range(60)) + [NOT_FOUND]
+
+                    await client.set("user:{1}:name", "Ada")
+                    assert await client.get("user:{1}:name") == "Ada"
+                    removed = await client.primitives.remove_many(keys[:10] + ["missing"])
+                    assert list(removed) == keys[:10] + ["missing"]
+                    assert isinstance(removed["missing"], ValkyrieServerError)
+                    assert sum(len(server.store) for server in servers) == 51
+
+                    await client.maps.set("user:{1}", "email", "ada@example.com")
+                    assert await client.maps.get("user:{1}", "email") == "ada@example.com"
+            finally:
+                for server in servers:
+                    await server.stop()
+
+        asyncio.run(main())
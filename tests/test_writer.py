@@ -0,0 +1,222 @@
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+from src.writer import ArrayWriter
+from src.protocol.types import Status
+from src.exceptions.errors import ValkyrieConnectionError, ValkyrieError, ValkyrieServerError, ValkyrieTimeoutError, error_for_status
+
+
+def make_client(length=0):
+    client = Mock()
+    state = {'length': length}
+    inserts = []
+
+    def insert(key, index, values):
+        inserts.append((index, list(values)))
+        state['length'] += len(values)
+
+    client.arrays.length.side_effect = lambda key: state['length']
+    client.arrays.insert.side_effect = insert
+    return client, inserts
+
+
+def fail_first(client, error):
+    insert = client.arrays.insert.side_effect
+    errors = [error]
+
+    def flaky(*args):
+        if errors:
+            raise errors.pop()
+        insert(*args)
+
+    client.arrays.insert.side_effect = flaky
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+class TestArrayWriter:
+
+    def test_flushes_at_max_batch(self):
+        client, inserts = make_client(length=5)
+        writer = ArrayWriter(client, "events", max_batch=3, max_delay_ms=None)
+
+        for i in range(7):
+            writer.append(i)
+
+        wait_until(lambda: len(inserts) == 2)
+        assert inserts == [(5, [0, 1, 2]), (8, [3, 4, 5])]
+        assert writer.pending == 1
+
+        writer.close()
+        assert inserts[-1] == (11, [6])
+        assert writer.flush_count == 3
+
+    def test_flushes_after_max_delay(self):
+        client, inserts = make_client()
+        writer = ArrayWriter(client, "events", max_batch=100, max_delay_ms=20)
+
+        writer.append("a")
+        writer.append("b")
+
+        wait_until(lambda: inserts == [(0, ["a", "b"])])
+        writer.close()
+
+    def test_context_manager_flushes_on_exit(self):
+        client, inserts = make_client()
+
+        with ArrayWriter(client, "events", max_batch=100, max_delay_ms=None) as writer:
+            writer.append(1)
+            writer.append(2)
+            assert inserts == []
+
+        assert inserts == [(0, [1, 2])]
+        assert writer.closed
+
+    def test_explicit_flush(self):
+        client, inserts = make_client()
+        writer = ArrayWriter(client, "events", max_batch=2, max_delay_ms=None, max_pending=10)
+        writer.flush()
+        for i in range(5):
+            writer.append(i)
+
+        writer.flush()
+
+        assert [value for _, values in inserts for value in values] == [0, 1, 2, 3, 4]
+        assert all(len(values) <= 2 for _, values in inserts)
+        writer.close()
+
+    def test_missing_array_starts_at_zero(self):
+        client, inserts = make_client()
+        client.arrays.length.side_effect = error_for_status(Status.NOT_FOUND)
+
+        with ArrayWriter(client, "events", max_delay_ms=None) as writer:
+            writer.append("first")
+
+        assert inserts == [(0, ["first"])]
+
+    def test_back_pressure_when_buffer_full(self):
+        client, inserts = make_client()
+        release = threading.Event()
+        insert = client.arrays.insert.side_effect
+        client.arrays.insert.side_effect = lambda *args: (release.wait(), insert(*args))
+        writer = ArrayWriter(client, "events", max_batch=2, max_delay_ms=None, max_pending=2)
+
+        writer.append(1)
+        writer.append(2)
+        wait_until(lambda: writer.pending == 0)
+        writer.append(3)
+        writer.append(4)
+
+        with pytest.raises(ValkyrieTimeoutError, match="buffer is full"):
+            writer.append(5, timeout=0.05)
+
+        release.set()
+        writer.append(5, timeout=2)
+        writer.close()
+        assert [value for _, values in inserts for value in values] == [1, 2, 3, 4, 5]
+
+    def test_failed_flush_raises_and_keeps_values(self):
+        client, inserts = make_client()
+        client.arrays.insert.side_effect = error_for_status(Status.WRONG_TYPE)
+        writer = ArrayWriter(client, "events", max_batch=1, max_delay_ms=None)
+
+        writer.append("x")
+        wait_until(lambda: writer._error is not None)
+        assert writer.pending == 1
+
+        with pytest.raises(ValkyrieServerError, match="Wrong data type"):
+            writer.append("y")
+        with pytest.raises(ValkyrieServerError):
+            writer.close()
+        assert writer.pending == 1
+
+    def test_recovers_after_transient_failure(self):
+        client, inserts = make_client()
+        fail_first(client, ValkyrieConnectionError("Connection closed by server"))
+        writer = ArrayWriter(client, "events", max_batch=2, max_delay_ms=None)
+
+        writer.append(1)
+        writer.append(2)
+        wait_until(lambda: writer._error is not None)
+
+        with pytest.raises(ValkyrieConnectionError):
+            writer.append(3)
+        # The flusher is still running and sends the kept values.
+        wait_until(lambda: inserts)
+        writer.append(3)
+        writer.close()
+
+        assert writer._thread.is_alive() is False
+        assert [value for _, values in inserts for value in values] == [1, 2, 3]
+        assert writer.pending == 0
+
+    def test_close_drains_after_unreported_failure(self):
+        client, inserts = make_client()
+        fail_first(client, ValkyrieConnectionError("Connection closed by server"))
+        writer = ArrayWriter(client, "events", max_batch=2, max_delay_ms=None)
+
+        writer.append(1)
+        writer.append(2)
+        wait_until(lambda: writer._error is not None)
+        writer.close()
+
+        assert inserts == [(0, [1, 2])]
+
+    def test_batch_applied_before_hang_up_is_not_repeated(self):
+        client, inserts = make_client()
+        insert = client.arrays.insert.side_effect
+        hang_ups = [ValkyrieConnectionError("Connection closed by server")]
+
+        def applied_then_hang_up(*args):
+            insert(*args)
+            if hang_ups:
+                raise hang_ups.pop()
+
+        client.arrays.insert.side_effect = applied_then_hang_up
+        writer = ArrayWriter(client, "events", max_batch=2, max_delay_ms=None)
+
+        writer.append(1)
+        writer.append(2)
+        wait_until(lambda: writer._error is not None)
+        with pytest.raises(ValkyrieConnectionError):
+            writer.append(3)
+        writer.append(3)
+        writer.append(4)
+        writer.close()
+
+        assert inserts == [(0, [1, 2]), (2, [3, 4])]
+
+    def test_retry_resends_the_failed_batch_only(self):
+        client, inserts = make_client()
+        fail_first(client, ValkyrieTimeoutError("Timed out waiting for a pooled connection"))
+        writer = ArrayWriter(client, "events", max_batch=3, max_delay_ms=None)
+
+        writer.append(1)
+        with pytest.raises(ValkyrieTimeoutError):
+            writer.flush()
+        writer.append(2)
+        writer.close()
+
+        assert inserts == [(0, [1]), (1, [2])]
+
+    def test_append_after_close_raises(self):
+        client, _ = make_client()
+        writer = ArrayWriter(client, "events")
+        writer.close()
+        writer.close()
+
+        with pytest.raises(ValkyrieError, match="closed"):
+            writer.append(1)
+
+    def test_invalid_arguments(self):
+        client, _ = make_client()
+        with pytest.raises(ValueError):
+            ArrayWriter(client, "events", max_batch=0)
+        with pytest.raises(ValueError):
+            ArrayWriter(client, "events", max_batch=10, max_pending=5)